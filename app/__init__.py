@@ -1,17 +1,39 @@
-from flask import Flask
+from flask import Flask, jsonify
 from .config import Config
 from .extensions import db, migrate, jwt, mail, ma, cors
+from .middleware.ratelimit import rate_limiter
+from .pagination import PaginationError
+from . import caching, commands, conditional, database, instrumentation, routing, search, stats, threads  # noqa: F401 (conditional/search/stats/threads register session events)
+from .response_cache import response_cache
+from .services.audit import audit_log
+from .services.events import event_bus
+from .services.notifications import notifications
+from .services.sms import sms_gateway
+from .tokens import token_denylist
 
 def create_app(config_class=Config):
     app = Flask(__name__, instance_relative_config=False)
     app.config.from_object(config_class)
 
+    database.configure(app)
     db.init_app(app)
+    database.init_app(app)
+    routing.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    token_denylist.init_app(app)
+    rate_limiter.init_app(app)
     mail.init_app(app)
     ma.init_app(app)
     cors.init_app(app)
+    caching.init_app(app)
+    response_cache.init_app(app)
+    notifications.init_app(app)
+    sms_gateway.init_app(app)
+    event_bus.init_app(app)
+    audit_log.init_app(app)
+    commands.init_app(app)
+    instrumentation.init_app(app)
 
     # register blueprints
     from .auth.routes import auth_bp
@@ -19,12 +41,18 @@ def create_app(config_class=Config):
     from .customer.routes import customer_bp
     from .support.routes import support_bp
     from .engineer.routes import engineer_bp
+    from .events.routes import events_bp
 
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(customer_bp, url_prefix='/customers')
     app.register_blueprint(support_bp, url_prefix='/support')
     app.register_blueprint(engineer_bp, url_prefix='/engineer')
+    app.register_blueprint(events_bp, url_prefix='/events')
+
+    @app.errorhandler(PaginationError)
+    def pagination_error(e):
+        return jsonify({'msg': str(e)}), 400
 
     @app.route('/')
     def index():
@@ -1,9 +1,21 @@
-from flask import Blueprint, jsonify, request
-from ..models import Ticket, User
+from flask import Blueprint, current_app, jsonify, request
+from ..models import Audit, Ticket, User
 from ..extensions import db
 from ..middleware.decorators import role_required
-from ..schemas import UserSchema, TicketSchema
+from ..schemas import AuditSchema, UserSchema, TicketSchema, eager_load_options, ticket_list_schema
+from ..pagination import PaginationError, datetime_arg, int_arg, keyset_paginate, paginated_response
+from ..bulk import BulkError, bulk_assign, bulk_close, bulk_create
+from ..caching import user_info
+from ..routing import read_only
+from ..conditional import TICKET_COLLECTIONS, USER_COLLECTIONS, conditional
+from ..serializers import json_response, serialize
+from ..exporting import ExportError, stream_export
+from ..services.audit import audit_log
+from ..services.events import publish_ticket_event
+from ..stats import summary as ticket_stats_summary
+from ..tokens import revoke_user_tokens
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func, select
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -11,7 +23,23 @@ admin_bp = Blueprint("admin", __name__)
 user_schema = UserSchema()
 users_schema = UserSchema(many=True)
 ticket_schema = TicketSchema()
-tickets_schema = TicketSchema(many=True)
+audits_schema = AuditSchema(many=True)
+
+# Loader options so that dumping N rows costs a constant number of queries
+user_load_options = eager_load_options(users_schema)
+ticket_load_options = eager_load_options(ticket_schema)
+
+
+# Ticket columns captured in audit old/new values
+AUDITED_TICKET_FIELDS = ("title", "description", "status", "created_by", "assigned_to")
+
+
+def ticket_updated_at(ticket_id):
+    """Cheap freshness probe for conditional GETs of a single ticket."""
+    return db.session.scalar(
+        select(func.coalesce(Ticket.updated_at, Ticket.created_at)).where(Ticket.id == ticket_id)
+    )
+
 
 # ============================
 # USER CRUD
@@ -19,16 +47,20 @@ tickets_schema = TicketSchema(many=True)
 @admin_bp.route("/users", methods=["GET"])
 @jwt_required()
 @role_required("Admin")
+@read_only
+@conditional(USER_COLLECTIONS)
 def list_users():
-    users = User.query.all()
-    return jsonify({"users": users_schema.dump(users)}), 200
+    users = User.query.options(*user_load_options).all()
+    return json_response({"users": serialize(users_schema, users)})
 
 
 @admin_bp.route("/users/<int:user_id>", methods=["GET"])
 @jwt_required()
 @role_required("Admin")
+@read_only
+@conditional(USER_COLLECTIONS)
 def get_user(user_id):
-    user = User.query.get_or_404(user_id)
+    user = User.query.options(*user_load_options).get_or_404(user_id)
     return jsonify({"user": user_schema.dump(user)}), 200
 
 
@@ -72,6 +104,7 @@ def update_user(user_id):
         user.role_id = data["role_id"]
     if "password" in data:
         user.set_password(data["password"])
+        revoke_user_tokens(user)
 
     db.session.commit()
     return jsonify({"msg": "User updated", "user": user_schema.dump(user)}), 200
@@ -93,16 +126,21 @@ def delete_user(user_id):
 @admin_bp.route("/tickets", methods=["GET"])
 @jwt_required()
 @role_required("Admin")
+@read_only
+@conditional(TICKET_COLLECTIONS)
 def list_all_tickets():
-    tickets = Ticket.query.order_by(Ticket.created_at.desc()).all()
-    return jsonify({"tickets": tickets_schema.dump(tickets)}), 200
+    schema, load_options = ticket_list_schema()
+    tickets, next_cursor = keyset_paginate(Ticket.query.options(*load_options), Ticket)
+    return paginated_response({"tickets": serialize(schema, tickets)}, next_cursor)
 
 
 @admin_bp.route("/tickets/<int:ticket_id>", methods=["GET"])
 @jwt_required()
 @role_required("Admin")
+@read_only
+@conditional(("users",), resource=ticket_updated_at)
 def get_ticket(ticket_id):
-    ticket = Ticket.query.get_or_404(ticket_id)
+    ticket = Ticket.query.options(*ticket_load_options).get_or_404(ticket_id)
     return jsonify({"ticket": ticket_schema.dump(ticket)}), 200
 
 
@@ -119,7 +157,7 @@ def create_ticket_admin():
     assigned_to = data.get("assigned_to")
 
     # Validate assigned_to exists
-    if assigned_to and not User.query.get(assigned_to):
+    if assigned_to and not user_info(assigned_to):
         return jsonify({"msg": "assigned_to user not found"}), 404
 
     ticket = Ticket(
@@ -130,7 +168,13 @@ def create_ticket_admin():
         assigned_to=assigned_to,
     )
     db.session.add(ticket)
+    db.session.flush()
+    audit_log.record(
+        "create", int(get_jwt_identity()), "ticket", ticket.id,
+        new_values={f: getattr(ticket, f) for f in AUDITED_TICKET_FIELDS},
+    )
     db.session.commit()
+    publish_ticket_event("ticket.created", ticket)
     return jsonify({"msg": "Ticket created", "ticket": ticket_schema.dump(ticket)}), 201
 
 
@@ -140,6 +184,8 @@ def create_ticket_admin():
 def update_ticket(ticket_id):
     ticket = Ticket.query.get_or_404(ticket_id)
     data = request.get_json() or {}
+    previous_assignee = ticket.assigned_to
+    before = {f: getattr(ticket, f) for f in AUDITED_TICKET_FIELDS}
 
     if "title" in data:
         ticket.title = data["title"]
@@ -149,11 +195,19 @@ def update_ticket(ticket_id):
         ticket.status = data["status"]
     if "assigned_to" in data:
         assigned_to = data["assigned_to"]
-        if assigned_to and not User.query.get(assigned_to):
+        if assigned_to and not user_info(assigned_to):
             return jsonify({"msg": "assigned_to user not found"}), 404
         ticket.assigned_to = assigned_to
 
+    changed = [f for f in AUDITED_TICKET_FIELDS if getattr(ticket, f) != before[f]]
+    if changed:
+        audit_log.record(
+            "update", int(get_jwt_identity()), "ticket", ticket.id,
+            old_values={f: before[f] for f in changed},
+            new_values={f: getattr(ticket, f) for f in changed},
+        )
     db.session.commit()
+    publish_ticket_event("ticket.updated", ticket, previous_assignee)
     return jsonify({"msg": "Ticket updated", "ticket": ticket_schema.dump(ticket)}), 200
 
 
@@ -162,6 +216,142 @@ def update_ticket(ticket_id):
 @role_required("Admin")
 def delete_ticket(ticket_id):
     ticket = Ticket.query.get_or_404(ticket_id)
+    audit_log.record(
+        "delete", int(get_jwt_identity()), "ticket", ticket.id,
+        old_values={f: getattr(ticket, f) for f in AUDITED_TICKET_FIELDS},
+    )
     db.session.delete(ticket)
     db.session.commit()
+    publish_ticket_event("ticket.deleted", ticket)
     return jsonify({"msg": f"Ticket '{ticket.title}' deleted"}), 200
+
+
+# ============================
+# BULK OPERATIONS
+# ============================
+def _bulk(operation):
+    data = request.get_json(silent=True) or {}
+    try:
+        results = operation(
+            data.get("items"), int(get_jwt_identity()), current_app.config.get("BULK_MAX_ITEMS", 500)
+        )
+    except BulkError as e:
+        return jsonify({"msg": str(e)}), 400
+    succeeded = sum(1 for r in results if r["ok"])
+    return jsonify({"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}), 200
+
+
+@admin_bp.route("/tickets/bulk/create", methods=["POST"])
+@jwt_required()
+@role_required("Admin")
+def bulk_create_tickets():
+    """Create up to BULK_MAX_ITEMS tickets in one transaction."""
+    return _bulk(bulk_create)
+
+
+@admin_bp.route("/tickets/bulk/assign", methods=["POST"])
+@jwt_required()
+@role_required("Admin")
+def bulk_assign_tickets():
+    """Assign tickets to engineers: items are {ticket_id, assignee_id}."""
+    return _bulk(bulk_assign)
+
+
+@admin_bp.route("/tickets/bulk/close", methods=["POST"])
+@jwt_required()
+@role_required("Admin")
+def bulk_close_tickets():
+    """Close tickets: items are {ticket_id}."""
+    return _bulk(bulk_close)
+
+
+# ============================
+# STATISTICS
+# ============================
+@admin_bp.route("/stats", methods=["GET"])
+@jwt_required()
+@role_required("Admin")
+@read_only
+@conditional(("tickets", "users"))
+def ticket_stats():
+    """Status histogram, per-engineer counts, mean time to resolve and daily volume."""
+    try:
+        days = min(max(int(request.args.get("days", 30)), 1), 366)
+    except ValueError:
+        return jsonify({"msg": "days must be an integer"}), 400
+    return jsonify(ticket_stats_summary(days)), 200
+
+
+# ============================
+# AUDIT LOG
+# ============================
+@admin_bp.route("/audits", methods=["GET"])
+@jwt_required()
+@role_required("Admin")
+@read_only
+def list_audits():
+    """Page through audit rows, newest first.
+
+    Filters: `entity_type` + `entity_id` (one record's history), `user_id`,
+    `action`, `since` / `until` (ISO 8601). Each filter combination is
+    served by an index ending in (created_at, id), so deep pages stay cheap.
+    """
+    query = Audit.query
+    entity_type = request.args.get("entity_type")
+    entity_id = int_arg("entity_id", None)
+    if entity_id is not None and not entity_type:
+        raise PaginationError("entity_id requires entity_type")
+    if entity_type:
+        query = query.filter(Audit.entity_type == entity_type)
+    if entity_id is not None:
+        query = query.filter(Audit.entity_id == entity_id)
+    user_id = int_arg("user_id", None)
+    if user_id is not None:
+        query = query.filter(Audit.user_id == user_id)
+    if request.args.get("action"):
+        query = query.filter(Audit.action == request.args["action"])
+    since = datetime_arg("since")
+    if since is not None:
+        query = query.filter(Audit.created_at >= since)
+    until = datetime_arg("until")
+    if until is not None:
+        query = query.filter(Audit.created_at < until)
+
+    audits, next_cursor = keyset_paginate(query, Audit)
+    return paginated_response({"audits": serialize(audits_schema, audits)}, next_cursor)
+
+
+# ============================
+# STREAMING EXPORTS
+# ============================
+def _export(name, statement):
+    fmt = request.args.get("format", "ndjson")
+    gzip = request.args.get("gzip", "").lower() in ("1", "true", "yes")
+    try:
+        return stream_export(name, statement, fmt=fmt, gzip=gzip)
+    except ExportError as e:
+        return jsonify({"msg": str(e)}), 400
+
+
+@admin_bp.route("/export/tickets", methods=["GET"])
+@jwt_required()
+@role_required("Admin")
+def export_tickets():
+    """Stream every ticket as NDJSON or CSV (?format=csv, ?gzip=1)."""
+    statement = select(
+        Ticket.id, Ticket.title, Ticket.description, Ticket.status,
+        Ticket.created_by, Ticket.assigned_to, Ticket.created_at, Ticket.updated_at,
+    ).order_by(Ticket.id)
+    return _export("tickets", statement)
+
+
+@admin_bp.route("/export/audits", methods=["GET"])
+@jwt_required()
+@role_required("Admin")
+def export_audits():
+    """Stream every audit row as NDJSON or CSV (?format=csv, ?gzip=1)."""
+    statement = select(
+        Audit.id, Audit.action, Audit.user_id, Audit.entity_type, Audit.entity_id,
+        Audit.old_values, Audit.new_values, Audit.details, Audit.created_at,
+    ).order_by(Audit.id)
+    return _export("audits", statement)
@@ -0,0 +1,116 @@
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+
+from .extensions import db
+from .models import Audit
+
+# One gzip NDJSON file per calendar month of created_at
+FILE_PATTERN = re.compile(r"^audits-(\d{4})-(\d{2})\.ndjson\.gz$")
+COLUMNS = tuple(c.name for c in Audit.__table__.columns)
+
+
+def _partition(created_at):
+    return f"audits-{created_at:%Y-%m}.ndjson.gz"
+
+
+def _encode(row):
+    data = dict(zip(COLUMNS, row))
+    data["created_at"] = data["created_at"].isoformat()
+    return (json.dumps(data, separators=(",", ":")) + "\n").encode()
+
+
+def _append(path, lines):
+    # Each call adds one gzip member; readers see the concatenation as one
+    # stream. fsync before the rows are deleted from the database.
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as fh:
+            fh.writelines(lines)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+# ============================
+# ARCHIVING
+# ============================
+def archive_audits(before, directory, chunk_size=5000, dry_run=False, echo=print):
+    """Move audits created before `before` into monthly files; returns the count.
+
+    Each chunk is appended to its files and fsynced, then deleted in its
+    own short transaction, so the table is never locked for long and an
+    interrupted run loses nothing: rows are only deleted once on disk. A
+    chunk that was written but not deleted is archived again by the next
+    run; `read_archive` drops the duplicates.
+    """
+    if dry_run:
+        return db.session.scalar(select(func.count()).select_from(Audit).where(Audit.created_at < before))
+
+    os.makedirs(directory, exist_ok=True)
+    # Served by ix_audits_created_at_id; archived rows are gone by the next chunk
+    statement = (
+        select(*Audit.__table__.columns)
+        .where(Audit.created_at < before)
+        .order_by(Audit.created_at, Audit.id)
+        .limit(chunk_size)
+    )
+    total = 0
+    while True:
+        with db.engine.begin() as conn:
+            rows = conn.execute(statement).all()
+            if not rows:
+                break
+            partitions = {}
+            for row in rows:
+                partitions.setdefault(_partition(row.created_at), []).append(_encode(row))
+            for name, lines in sorted(partitions.items()):
+                _append(os.path.join(directory, name), lines)
+            conn.execute(delete(Audit.__table__).where(Audit.id.in_([row.id for row in rows])))
+        total += len(rows)
+        echo(f"  archived {total:,} audits")
+    return total
+
+
+# ============================
+# QUERYING
+# ============================
+def archive_files(directory, since=None, until=None):
+    """Return the archive files whose month overlaps [since, until), oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    first = (since.year, since.month) if since else None
+    last = (until.year, until.month) if until else None
+    found = []
+    for name in os.listdir(directory):
+        match = FILE_PATTERN.match(name)
+        if not match:
+            continue
+        month = (int(match.group(1)), int(match.group(2)))
+        if (first and month < first) or (last and month > last):
+            continue
+        found.append((month, os.path.join(directory, name)))
+    return [path for _, path in sorted(found)]
+
+
+def read_archive(directory, since=None, until=None, **filters):
+    """Yield archived audit dicts created in [since, until), oldest first per file.
+
+    `filters` match columns exactly, e.g. entity_type="ticket", entity_id=7.
+    """
+    for path in archive_files(directory, since, until):
+        seen = set()
+        with gzip.open(path, "rb") as fh:
+            for line in fh:
+                data = json.loads(line)
+                if data["id"] in seen:
+                    continue
+                seen.add(data["id"])
+                created_at = datetime.fromisoformat(data["created_at"])
+                if (since and created_at < since) or (until and created_at >= until):
+                    continue
+                if any(data.get(column) != value for column, value in filters.items()):
+                    continue
+                yield data
@@ -1,8 +1,14 @@
 from flask import Blueprint, request, jsonify
 from ..extensions import db
-from ..models import User, Role
-from flask_jwt_extended import create_access_token
+from ..models import User
+from ..caching import role_by_name
+from flask_jwt_extended import decode_token, get_jwt, get_jwt_identity, jwt_required
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from ..middleware.ratelimit import json_field, rate_limiter, route_only, with_client_ip
 from ..schemas import UserSchema
+from ..passwords import PasswordVerifyTimeout, needs_rehash, verify_password_offloaded
+from ..tokens import issue_tokens, revoke_token
 
 auth_bp = Blueprint('auth', __name__)
 user_schema = UserSchema()
@@ -11,6 +17,7 @@ user_schema = UserSchema()
 # REGISTER
 # ============================
 @auth_bp.route('/register', methods=['POST'])
+@rate_limiter.limit('RATELIMIT_REGISTER_PER_IP')
 def register():
     data = request.get_json() or {}
     username = data.get('username')
@@ -24,8 +31,8 @@ def register():
     if User.query.filter((User.username == username) | (User.email == email)).first():
         return jsonify({'msg': 'user already exists'}), 400
 
-    # Get the Role object
-    role_obj = Role.query.filter_by(name=role_name).first()
+    # Get the role (served from the in-process role cache)
+    role_obj = role_by_name(role_name)
     if not role_obj:
         return jsonify({'msg': f"Role '{role_name}' not found"}), 400
 
@@ -42,6 +49,10 @@ def register():
 # LOGIN
 # ============================
 @auth_bp.route('/login', methods=['POST'])
+@rate_limiter.limit('RATELIMIT_LOGIN_PER_IP')
+@rate_limiter.limit('RATELIMIT_LOGIN_PER_USERNAME', key=with_client_ip(json_field('username')),
+                    algorithm='token_bucket')
+@rate_limiter.limit('RATELIMIT_LOGIN_TOTAL', key=route_only, algorithm='token_bucket')
 def login():
     data = request.get_json() or {}
     username = data.get('username')
@@ -52,17 +63,54 @@ def login():
 
     # Fetch user by username
     user = User.query.filter_by(username=username).first()
-    if not user or not user.check_password(password):
+    try:
+        valid = bool(user) and verify_password_offloaded(user.password_hash, password)
+    except PasswordVerifyTimeout:
+        return jsonify({'msg': 'Login is busy, try again later'}), 503
+    if not valid:
         return jsonify({'msg': 'invalid credentials'}), 401
 
-    # Include only the role name in JWT claims
-    additional_claims = {'role': user.role.name}
+    # Upgrade hashes made with outdated parameters while we have the password
+    if needs_rehash(user.password_hash):
+        user.set_password(password)
+        db.session.commit()
 
-    # Create access token
-    access_token = create_access_token(identity=str(user.id), additional_claims=additional_claims)
+    # Short-lived access token with the role and token version, plus a refresh token
+    tokens = issue_tokens(user)
 
-    # Return token and user info
-    return jsonify({
-        'access_token': access_token,
-        'user': user_schema.dump(user)
-    }), 200
+    # Return tokens and user info
+    return jsonify({**tokens, 'user': user_schema.dump(user)}), 200
+
+
+# ============================
+# REFRESH
+# ============================
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    # The one place a token is checked against the users table: picks up
+    # the current role and catches revocations not yet synced to this worker
+    user = db.session.get(User, int(get_jwt_identity()))
+    if not user or get_jwt().get('ver', 0) != user.token_version:
+        return jsonify({'msg': 'Token has been revoked'}), 401
+    return jsonify(issue_tokens(user, refresh=False)), 200
+
+
+# ============================
+# LOGOUT
+# ============================
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """Revoke the presented token, and the `refresh_token` in the body if given."""
+    revoke_token(get_jwt())
+    refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+    if refresh_token:
+        try:
+            payload = decode_token(refresh_token)
+        except (JWTExtendedException, PyJWTError):
+            payload = None  # expired or already revoked: nothing left to deny
+        if payload and payload.get('sub') == get_jwt_identity():
+            revoke_token(payload)
+    db.session.commit()
+    return jsonify({'msg': 'logged out'}), 200
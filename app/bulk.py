@@ -0,0 +1,283 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, insert, select, update
+
+from .conditional import bump_versions_on_commit
+from .extensions import db
+from .models import Role, Ticket, User
+from .response_cache import invalidate_tickets_on_commit
+from .search import index_available, ticket_document, upsert_documents
+from .services.audit import audit_log
+from .services.email import send_email
+from .services.events import publish_ticket_event
+from .services.sms import send_sms
+from .stats import RESOLVED_STATUSES, TICKET_STATUSES, apply_ticket_changes
+
+tickets = Ticket.__table__
+
+# Ticket columns the bulk operations read and write
+STATE_COLUMNS = ("title", "description", "status", "created_by", "assigned_to", "created_at", "resolved_at")
+
+
+class BulkError(ValueError):
+    """Raised when a bulk request body is malformed as a whole."""
+
+
+def _items(items, max_items):
+    if not isinstance(items, list) or not items:
+        raise BulkError("items must be a non-empty list")
+    if len(items) > max_items:
+        raise BulkError(f"at most {max_items} items per request")
+    return items
+
+
+def _int(item, key):
+    value = item.get(key) if isinstance(item, dict) else None
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _create_error(item, actor_id, users):
+    """Why a bulk-create item cannot be inserted, or None."""
+    if not isinstance(item, dict) or not isinstance(item.get("title"), str) or not item["title"].strip():
+        return "title is required"
+    if item.get("description") is not None and not isinstance(item["description"], str):
+        return "description must be a string"
+    status = item.get("status")
+    if status is not None and (not isinstance(status, str) or status not in TICKET_STATUSES):
+        return f"status must be one of {', '.join(TICKET_STATUSES)}"
+    for key in ("created_by", "assigned_to"):
+        if item.get(key) is not None and _int(item, key) is None:
+            return f"{key} must be a user id"
+    creator = item.get("created_by")
+    if creator and creator != actor_id and creator not in users:
+        return "created_by user not found"
+    assignee = item.get("assigned_to")
+    if assignee and assignee not in users:
+        return "assigned_to user not found"
+    return None
+
+
+def _load_tickets(ids):
+    """One IN query for every ticket the batch touches."""
+    if not ids:
+        return {}
+    rows = db.session.execute(
+        select(Ticket.id, *(getattr(Ticket, c) for c in STATE_COLUMNS)).where(Ticket.id.in_(ids))
+    )
+    return {row.id: dict(zip(STATE_COLUMNS, row[1:])) for row in rows}
+
+
+def _load_users(ids):
+    """One IN query for every user the batch references: {id: (role, email)}."""
+    if not ids:
+        return {}
+    rows = db.session.execute(
+        select(User.id, Role.name, User.email).join(Role, User.role_id == Role.id).where(User.id.in_(ids))
+    )
+    return {user_id: (role, email) for user_id, role, email in rows}
+
+
+def _stats_key(state):
+    return (state["status"], state["assigned_to"], state["created_at"], state["resolved_at"])
+
+
+def _cache_key(state):
+    return (state["created_by"], state["assigned_to"], state["status"])
+
+
+def _ok(index, ticket_id):
+    return {"index": index, "ok": True, "ticket_id": ticket_id}
+
+
+def _failed(index, error):
+    return {"index": index, "ok": False, "error": error}
+
+
+# ============================
+# SHARED WRITE PATH
+# ============================
+def _finish(action, actor_id, changes, event_kind):
+    """Maintain every derived structure the ORM hooks would, then commit.
+
+    `changes` is a list of (ticket_id, before, after) state dicts; before is
+    None for created tickets. Core writes skip the flush hooks, so the
+    rollup, search index and audit rows are updated here in the same
+    transaction, and the version counters and response-cache tags queued
+    for after the commit.
+    """
+    if not changes:
+        return
+    session = db.session
+    connection = session.connection()
+
+    apply_ticket_changes(connection, [
+        (_stats_key(before) if before else None, _stats_key(after)) for _, before, after in changes
+    ])
+    documents = [
+        ticket_document(ticket_id, after["title"], after["description"])
+        for ticket_id, before, after in changes if before is None
+    ]
+    if documents and index_available(connection):
+        upsert_documents(connection, documents)
+    bump_versions_on_commit(session, {"tickets"})
+    invalidate_tickets_on_commit(session, [
+        _cache_key(state) for _, before, after in changes for state in (before, after) if state
+    ])
+
+    for ticket_id, before, after in changes:
+        changed = [c for c in ("status", "assigned_to") if not before or before[c] != after[c]]
+        audit_log.record(
+            action, actor_id, "ticket", ticket_id,
+            old_values={c: before[c] for c in changed} if before else None,
+            new_values={c: after[c] for c in changed} if before else {
+                c: after[c] for c in ("title", "description", "status", "created_by", "assigned_to")
+            },
+        )
+    session.commit()
+
+    # One query for the committed rows, then one event per ticket
+    previous = {}
+    for ticket_id, before, _ in changes:
+        if before:
+            previous.setdefault(ticket_id, before["assigned_to"])
+    for ticket in Ticket.query.filter(Ticket.id.in_({ticket_id for ticket_id, _, _ in changes})):
+        publish_ticket_event(event_kind, ticket, previous.get(ticket.id))
+
+
+def _update(changes, now):
+    # executemany keeps the batch order, so repeated ids end in their last state
+    db.session.execute(
+        update(tickets)
+        .where(tickets.c.id == bindparam("b_id"))
+        .values(
+            status=bindparam("b_status"),
+            assigned_to=bindparam("b_assigned_to"),
+            resolved_at=bindparam("b_resolved_at"),
+            updated_at=now,
+        ),
+        [
+            {"b_id": ticket_id, "b_status": after["status"], "b_assigned_to": after["assigned_to"],
+             "b_resolved_at": after["resolved_at"]}
+            for ticket_id, _, after in changes
+        ],
+    )
+
+
+def _insert_returning_ids(rows):
+    """INSERT `rows` in one round trip where possible; their ids, in order."""
+    session = db.session
+    if session.get_bind().dialect.name != "sqlite":
+        return session.scalars(
+            insert(tickets).returning(tickets.c.id, sort_by_parameter_order=True), rows
+        ).all()
+    # SQLite cannot order a multi-row INSERT's RETURNING, and the ordered
+    # form falls back to a statement per row; its DATETIME text keeps the
+    # microseconds, so the distinct created_at values identify the rows
+    ids = dict(session.execute(insert(tickets).returning(tickets.c.created_at, tickets.c.id), rows).all())
+    return [ids[row["created_at"]] for row in rows]
+
+
+# ============================
+# OPERATIONS
+# ============================
+def bulk_create(items, actor_id, max_items):
+    """Insert every valid {title, description?, status?, created_by?, assigned_to?}."""
+    items = _items(items, max_items)
+    users = _load_users({
+        value for item in items for value in (_int(item, "created_by"), _int(item, "assigned_to")) if value
+    })
+
+    results, rows = [None] * len(items), []
+    now = datetime.utcnow()
+    for index, item in enumerate(items):
+        error = _create_error(item, actor_id, users)
+        if error:
+            results[index] = _failed(index, error)
+            continue
+        creator = item.get("created_by") or actor_id
+        assignee = item.get("assigned_to")
+        status = item.get("status") or "open"
+        rows.append((index, {
+            "title": item["title"][:200],
+            "description": item.get("description") or "",
+            "status": status,
+            "created_by": creator,
+            "assigned_to": assignee or None,
+            # Distinct per row, keeping the batch order in (created_at, id)
+            # listings where the database stores microseconds
+            "created_at": now + timedelta(microseconds=index),
+            "updated_at": now,
+            "resolved_at": now if status in RESOLVED_STATUSES else None,
+        }))
+
+    changes = []
+    if rows:
+        for (index, row), ticket_id in zip(rows, _insert_returning_ids([row for _, row in rows])):
+            results[index] = _ok(index, ticket_id)
+            changes.append((ticket_id, None, {c: row[c] for c in STATE_COLUMNS}))
+    _finish("create", actor_id, changes, "ticket.created")
+    return results
+
+
+def bulk_assign(items, actor_id, max_items):
+    """Assign every valid {ticket_id, assignee_id} to an engineer and mark it in progress."""
+    items = _items(items, max_items)
+    states = _load_tickets({_int(item, "ticket_id") for item in items} - {None})
+    users = _load_users({_int(item, "assignee_id") for item in items} - {None})
+
+    results, changes, assigned = [], [], {}
+    for index, item in enumerate(items):
+        ticket_id, assignee_id = _int(item, "ticket_id"), _int(item, "assignee_id")
+        if ticket_id not in states:
+            results.append(_failed(index, "ticket not found"))
+            continue
+        if users.get(assignee_id, (None,))[0] != "Engineer":
+            results.append(_failed(index, "assignee must be an Engineer"))
+            continue
+        before = states[ticket_id]
+        after = {**before, "assigned_to": assignee_id, "status": "in_progress", "resolved_at": None}
+        states[ticket_id] = after
+        changes.append((ticket_id, before, after))
+        assigned.setdefault(assignee_id, []).append(after["title"])
+        results.append(_ok(index, ticket_id))
+
+    if changes:
+        _update(changes, datetime.utcnow())
+        # One email and one SMS per engineer, listing all of their new tickets
+        for assignee_id, titles in assigned.items():
+            email = users[assignee_id][1]
+            if email:
+                send_email(email, "Tickets Assigned",
+                           "You have been assigned tickets:\n" + "\n".join(f"- {t}" for t in titles))
+    _finish("assign", actor_id, changes, "ticket.assigned")
+    for assignee_id, titles in assigned.items():
+        send_sms(None, f"You have been assigned {len(titles)} ticket(s)")
+    return results
+
+
+def bulk_close(items, actor_id, max_items):
+    """Close every valid {ticket_id} that is not closed yet."""
+    items = _items(items, max_items)
+    states = _load_tickets({_int(item, "ticket_id") for item in items} - {None})
+
+    results, changes = [], []
+    now = datetime.utcnow()
+    for index, item in enumerate(items):
+        ticket_id = _int(item, "ticket_id")
+        if ticket_id not in states:
+            results.append(_failed(index, "ticket not found"))
+            continue
+        before = states[ticket_id]
+        if before["status"] == "closed":
+            results.append(_failed(index, "ticket is already closed"))
+            continue
+        resolved_at = before["resolved_at"] if before["status"] in RESOLVED_STATUSES else now
+        after = {**before, "status": "closed", "resolved_at": resolved_at}
+        states[ticket_id] = after
+        changes.append((ticket_id, before, after))
+        results.append(_ok(index, ticket_id))
+
+    if changes:
+        _update(changes, now)
+    _finish("close", actor_id, changes, "ticket.updated")
+    return results
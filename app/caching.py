@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import event
+
+from .extensions import db
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize=1024, ttl=300, name=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires = entry
+                if expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def configure(self, maxsize=None, ttl=None):
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if ttl is not None:
+            self.ttl = ttl
+        self.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ============================
+# ROLE / USER LOOKUPS
+# ============================
+RoleInfo = namedtuple("RoleInfo", "id name")
+UserInfo = namedtuple("UserInfo", "id username email role")
+
+# The roles table is tiny, so it is cached whole under a single key
+role_cache = TTLCache(maxsize=1, ttl=300, name="roles")
+user_cache = TTLCache(maxsize=10000, ttl=300, name="users")
+
+
+def _load_roles():
+    from .models import Role
+
+    roles = [RoleInfo(r.id, r.name) for r in db.session.query(Role.id, Role.name)]
+    return {"by_id": {r.id: r for r in roles}, "by_name": {r.name: r for r in roles}}
+
+
+def role_by_name(name):
+    """Return the `RoleInfo` named `name`, or None."""
+    return role_cache.get_or_load("roles", _load_roles)["by_name"].get(name)
+
+
+def role_by_id(role_id):
+    return role_cache.get_or_load("roles", _load_roles)["by_id"].get(role_id)
+
+
+def user_info(user_id):
+    """Return a cached `UserInfo` for `user_id`, or None if it does not exist.
+
+    Ids that are not integers (e.g. "abc" from a request body) also give None.
+    """
+    if user_id is None or isinstance(user_id, bool):
+        return None
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    info = user_cache.get(user_id)
+    if info is None:
+        from .models import User
+
+        row = (
+            db.session.query(User.id, User.username, User.email, User.role_id)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if row is None:
+            return None
+        role = role_by_id(row.role_id)
+        info = UserInfo(row.id, row.username, row.email, role.name if role else None)
+        user_cache.set(user_id, info)
+    return info
+
+
+def invalidate_user(user_id):
+    user_cache.pop(int(user_id))
+
+
+def invalidate_roles():
+    role_cache.clear()
+    # cached users carry their role name
+    user_cache.clear()
+
+
+def cache_stats():
+    return {cache.name: cache.stats() for cache in (role_cache, user_cache)}
+
+
+def init_app(app):
+    role_cache.configure(ttl=app.config.get("LOOKUP_CACHE_TTL", 300))
+    user_cache.configure(
+        maxsize=app.config.get("LOOKUP_CACHE_SIZE", 10000),
+        ttl=app.config.get("LOOKUP_CACHE_TTL", 300),
+    )
+
+
+# ============================
+# INVALIDATION
+# ============================
+@event.listens_for(db.session, "after_flush")
+def _collect_changes(session, flush_context):
+    from .models import Role, User
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault("stale_users", set()).add(obj.id)
+        elif isinstance(obj, Role):
+            session.info["stale_roles"] = True
+
+
+@event.listens_for(db.session, "after_commit")
+def _evict_committed(session):
+    if session.info.pop("stale_roles", False):
+        invalidate_roles()
+    for user_id in session.info.pop("stale_users", ()):
+        if user_id is not None:
+            invalidate_user(user_id)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop("stale_roles", None)
+    session.info.pop("stale_users", None)
@@ -0,0 +1,191 @@
+import json
+import re
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import event
+
+from .extensions import db
+from .models import Role, Ticket, TicketMessage, User
+from .pagination import encode_cursor, keyset_paginate
+
+# A bare "SCAN <table>" step means SQLite walks the whole table without an index
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def _route_queries(user_id):
+    """Build the listing queries exactly as the blueprints issue them."""
+    from .schemas import eager_load_options, tickets_with_messages_schema
+
+    # ?include=messages issues a superset of the default list queries
+    query = Ticket.query.options(*eager_load_options(tickets_with_messages_schema))
+    return {
+        "admin.list_all_tickets": query,
+        "support.open_tickets": query.filter_by(status="open"),
+        "engineer.my_assigned": query.filter_by(assigned_to=user_id),
+        "customer.list_tickets": query.filter_by(created_by=user_id),
+    }
+
+
+def _capture_statements(fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+@click.command("explain-queries")
+@with_appcontext
+def explain_queries():
+    """Fail if any listing query falls back to a full table scan (SQLite)."""
+
+    if db.engine.dialect.name != "sqlite":
+        raise click.ClickException("explain-queries only supports SQLite")
+
+    # Placeholder rows so the eager-load queries for related rows run too;
+    # everything is rolled back once the plans have been checked.
+    role = Role(name="__explain__")
+    user = User(username="__explain__", email="__explain__", password_hash="", role=role)
+    ticket = Ticket(title="__explain__", status="open", creator=user, assignee=user)
+    db.session.add(TicketMessage(ticket=ticket, sender=user, message=""))
+    db.session.flush()
+
+    cursor = encode_cursor(datetime.utcnow() + timedelta(days=1), 2**31)
+    failures = 0
+
+    for name, query in _route_queries(user.id).items():
+        for args in ({}, {"cursor": cursor}):
+            with current_app.test_request_context(query_string=args):
+                statements = _capture_statements(lambda: keyset_paginate(query, Ticket))
+
+            for statement, parameters in statements:
+                plan = db.session.connection().exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters
+                )
+                details = [row[-1] for row in plan]
+                scans = [d for d in details if FULL_SCAN.match(d)]
+                label = f"{name}{' (cursor)' if args else ''}"
+                if scans:
+                    failures += 1
+                    click.echo(f"FAIL {label}: {'; '.join(scans)}")
+                else:
+                    click.echo(f"ok   {label}: {'; '.join(details)}")
+
+    db.session.rollback()
+    if failures:
+        raise click.ClickException(f"{failures} route queries scan a table")
+
+
+@click.command("notifications-drain")
+@with_appcontext
+def notifications_drain():
+    """Deliver every due notification in the outbox, then exit."""
+    from .services.notifications import notifications
+
+    processed = notifications.drain()
+    click.echo(f"Processed {processed} notification(s)")
+
+
+@click.command("seed-data")
+@click.option("--users", default=1000, show_default=True, help="Users to generate.")
+@click.option("--tickets", default=10000, show_default=True, help="Tickets to generate.")
+@click.option("--messages-per-ticket", default=2, show_default=True, help="Average messages per ticket.")
+@click.option("--days", default=365, show_default=True, help="Spread created_at over this many days.")
+@click.option("--chunk-size", default=5000, show_default=True, help="Rows per insert transaction.")
+@click.option("--seed", default=42, show_default=True, help="Random seed for reproducible data.")
+@click.option("--reset", is_flag=True, help="Delete existing users, tickets, messages and audits first.")
+@with_appcontext
+def seed_data(users, tickets, messages_per_ticket, days, chunk_size, seed, reset):
+    """Bulk-generate a synthetic dataset for load testing."""
+    from .seeding import generate_dataset
+
+    started = time.perf_counter()
+    summary = generate_dataset(
+        users=users, tickets=tickets, messages_per_ticket=messages_per_ticket,
+        days=days, chunk_size=chunk_size, seed=seed, reset=reset, echo=click.echo,
+    )
+    click.echo(
+        f"Seeded {summary['users']:,} users, {summary['tickets']:,} tickets, "
+        f"{summary['messages']:,} messages and {summary['audits']:,} audits "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+@click.command("search-reindex")
+@click.option("--chunk-size", default=5000, show_default=True, help="Documents per insert transaction.")
+@with_appcontext
+def search_reindex(chunk_size):
+    """Create the full-text index if needed and backfill it from existing data."""
+    from .search import reindex
+
+    total = reindex(chunk_size=chunk_size, echo=click.echo)
+    click.echo(f"Indexed {total:,} documents")
+
+
+@click.command("stats-rebuild")
+@with_appcontext
+def stats_rebuild():
+    """Recompute the ticket statistics rollup from the tickets table."""
+    from .stats import rebuild
+
+    with db.engine.begin() as conn:
+        total = rebuild(conn)
+    click.echo(f"Rebuilt statistics from {total:,} tickets")
+
+
+@click.command("audits-archive")
+@click.option("--older-than-days", type=int, help="Archive audits older than this (default AUDIT_RETENTION_DAYS).")
+@click.option("--directory", help="Archive directory (default AUDIT_ARCHIVE_DIR).")
+@click.option("--chunk-size", default=5000, show_default=True, help="Audits per delete transaction.")
+@click.option("--dry-run", is_flag=True, help="Only report how many audits would be archived.")
+@with_appcontext
+def audits_archive(older_than_days, directory, chunk_size, dry_run):
+    """Move old audits into monthly gzip NDJSON files and delete them."""
+    from .archive import archive_audits
+
+    days = older_than_days if older_than_days is not None else current_app.config["AUDIT_RETENTION_DAYS"]
+    directory = directory or current_app.config["AUDIT_ARCHIVE_DIR"]
+    before = datetime.utcnow() - timedelta(days=days)
+    total = archive_audits(before, directory, chunk_size=chunk_size, dry_run=dry_run, echo=click.echo)
+    verb = "Would archive" if dry_run else "Archived"
+    click.echo(f"{verb} {total:,} audits created before {before:%Y-%m-%d %H:%M} into {directory}")
+
+
+@click.command("audits-query")
+@click.option("--since", type=click.DateTime(), help="Earliest created_at (inclusive).")
+@click.option("--until", type=click.DateTime(), help="Latest created_at (exclusive).")
+@click.option("--entity-type")
+@click.option("--entity-id", type=int)
+@click.option("--user-id", type=int)
+@click.option("--action")
+@click.option("--directory", help="Archive directory (default AUDIT_ARCHIVE_DIR).")
+@with_appcontext
+def audits_query(since, until, entity_type, entity_id, user_id, action, directory):
+    """Print archived audits matching the filters as NDJSON."""
+    from .archive import read_archive
+
+    filters = {"entity_type": entity_type, "entity_id": entity_id, "user_id": user_id, "action": action}
+    filters = {column: value for column, value in filters.items() if value is not None}
+    directory = directory or current_app.config["AUDIT_ARCHIVE_DIR"]
+    for row in read_archive(directory, since, until, **filters):
+        click.echo(json.dumps(row))
+
+
+def init_app(app):
+    app.cli.add_command(explain_queries)
+    app.cli.add_command(notifications_drain)
+    app.cli.add_command(seed_data)
+    app.cli.add_command(search_reindex)
+    app.cli.add_command(stats_rebuild)
+    app.cli.add_command(audits_archive)
+    app.cli.add_command(audits_query)
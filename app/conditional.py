@@ -0,0 +1,142 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import event, insert, select, update
+
+from .extensions import db
+from .models import CollectionVersion
+
+# Tables whose changes are visible through the API
+TRACKED = {"tickets", "users", "ticket_messages", "roles"}
+
+# What a ticket list dump depends on (nested creator/assignee and messages)
+TICKET_COLLECTIONS = ("tickets", "users", "ticket_messages")
+USER_COLLECTIONS = ("users", "roles")
+
+
+# ============================
+# VERSION COUNTERS
+# ============================
+def bump_versions(connection, names, now=None):
+    """Increment the counters for `names` on `connection` (caller's transaction).
+
+    Used by the commit hook below and by the bulk seeder, which writes
+    through Core and bypasses the ORM.
+    """
+    now = now or datetime.utcnow()
+    table = CollectionVersion.__table__
+    for name in sorted(names):
+        result = connection.execute(
+            update(table).where(table.c.name == name)
+            .values(version=table.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            # Databases built with create_all() rather than the migration
+            connection.execute(insert(table).values(name=name, version=1, updated_at=now))
+
+
+def current_versions(names):
+    """Return {name: (version, updated_at)} for `names`; missing ones are (0, None)."""
+    rows = db.session.execute(
+        select(CollectionVersion.name, CollectionVersion.version, CollectionVersion.updated_at)
+        .where(CollectionVersion.name.in_(names))
+    )
+    found = {name: (version, updated_at) for name, version, updated_at in rows}
+    return {name: found.get(name, (0, None)) for name in names}
+
+
+def bump_versions_on_commit(session, names):
+    """Queue a bump of `names` for when `session` commits (Core writes)."""
+    session.info.setdefault("changed_collections", set()).update(names)
+
+
+# Every write touches the same few counter rows, so they are bumped after
+# the commit in a transaction of their own rather than holding those row
+# locks until the writer commits, which would serialize all writers
+@event.listens_for(db.session, "after_flush")
+def _collect_changed(session, flush_context):
+    changed = {
+        obj.__tablename__
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if getattr(obj, "__tablename__", None) in TRACKED
+        and (obj not in session.dirty or session.is_modified(obj, include_collections=False))
+    }
+    if changed:
+        bump_versions_on_commit(session, changed)
+
+
+@event.listens_for(db.session, "after_commit")
+def _bump_committed(session):
+    names = session.info.pop("changed_collections", None)
+    if not names:
+        return
+    try:
+        with db.engine.begin() as connection:
+            bump_versions(connection, names)
+    except Exception:
+        # The write itself is committed; until the next bump clients may
+        # revalidate against the previous versions
+        current_app.logger.exception("Could not bump collection versions %s", sorted(names))
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_changed(session):
+    session.info.pop("changed_collections", None)
+
+
+# ============================
+# CONDITIONAL GET
+# ============================
+def _etag(*parts):
+    return hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def conditional(collections, resource=None):
+    """Answer `If-None-Match` with 304 before the view queries or serializes.
+
+    The weak ETag combines the caller's identity, the URL with its query
+    string and the version counters of `collections`. With `resource`, a
+    fn(**view_args) -> datetime | None giving the row's own `updated_at`,
+    that timestamp is folded in too; None (row missing) skips the check so
+    the view can 404. `Last-Modified` is the newest timestamp involved.
+    """
+    collections = tuple(collections)
+
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            versions = current_versions(collections)
+            stamps = [updated_at for _, updated_at in versions.values() if updated_at]
+            parts = [get_jwt_identity(), get_jwt().get("role"), request.full_path, sorted(versions.items())]
+
+            if resource is not None:
+                row_updated_at = resource(**kwargs)
+                if row_updated_at is None:
+                    return fn(*args, **kwargs)
+                stamps.append(row_updated_at)
+                parts.append(row_updated_at)
+
+            etag = _etag(*parts)
+            last_modified = max(stamps) if stamps else None
+            if request.if_none_match.contains_weak(etag):
+                return _not_modified(etag, last_modified)
+
+            response = current_app.make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+                if last_modified is not None:
+                    response.last_modified = last_modified
+            return response
+        return decorator
+    return wrapper
@@ -8,10 +8,93 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URI', 'sqlite:///data.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Optional read replica for @read_only GET endpoints. After a write the
+    # client reads from the primary for REPLICA_STICKY_SECONDS.
+    DATABASE_REPLICA_URI = os.getenv('DATABASE_REPLICA_URI', '')
+    REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS') or 5)
+
+    # SQLite connection PRAGMAs (empty / 0 leaves the SQLite default). WAL
+    # lets readers run alongside the single writer; the busy timeout makes
+    # concurrent writers wait for the lock instead of failing.
+    DB_SQLITE_JOURNAL_MODE = os.getenv('DB_SQLITE_JOURNAL_MODE', 'wal')
+    DB_SQLITE_SYNCHRONOUS = os.getenv('DB_SQLITE_SYNCHRONOUS', 'normal')
+    DB_SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('DB_SQLITE_BUSY_TIMEOUT_MS', '15000') or 0)
+    DB_SQLITE_CACHE_SIZE_KB = int(os.getenv('DB_SQLITE_CACHE_SIZE_KB', '65536') or 0)
+    DB_SQLITE_MMAP_SIZE = int(os.getenv('DB_SQLITE_MMAP_SIZE', '268435456') or 0)
+    # Connection pool for server databases (PostgreSQL, MySQL)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT') or 30)
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE') or 1800)
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+    # Password hashing. Any werkzeug method string ("scrypt:32768:8:1",
+    # "pbkdf2:sha256:600000") or "argon2" (needs argon2-cffi). Hashes made
+    # with other parameters are upgraded on the next successful login.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_SALT_LENGTH = int(os.getenv('PASSWORD_SALT_LENGTH') or 16)
+    PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST') or 2)
+    PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST') or 19456)
+    PASSWORD_ARGON2_PARALLELISM = int(os.getenv('PASSWORD_ARGON2_PARALLELISM') or 1)
+    # Processes used to verify logins off the request worker (0 = inline)
+    PASSWORD_VERIFY_WORKERS = int(os.getenv('PASSWORD_VERIFY_WORKERS') or 0)
+    # Seconds a login waits for the pool before answering 503
+    PASSWORD_VERIFY_TIMEOUT = float(os.getenv('PASSWORD_VERIFY_TIMEOUT') or 10)
+
+    # In-process role/user lookup caches
+    LOOKUP_CACHE_TTL = int(os.getenv('LOOKUP_CACHE_TTL') or 300)
+    LOOKUP_CACHE_SIZE = int(os.getenv('LOOKUP_CACHE_SIZE') or 10000)
+
+    # Per-request SQL/serialization timing, Server-Timing headers and /metrics
+    INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    METRICS_PATH = os.getenv('METRICS_PATH', '/metrics')
+
+    # Blueprints whose list endpoints use the compiled serializer and orjson
+    # (comma-separated blueprint names, or "*" for all)
+    FAST_SERIALIZATION_BLUEPRINTS = tuple(
+        b.strip() for b in os.getenv('FAST_SERIALIZATION_BLUEPRINTS', '').split(',') if b.strip()
+    )
+
+    # Items accepted per /admin/tickets/bulk/* request
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS') or 500)
+
+    # Streaming exports: rows fetched per server-side cursor batch, bytes per write
+    EXPORT_YIELD_PER = int(os.getenv('EXPORT_YIELD_PER') or 1000)
+    EXPORT_BUFFER_BYTES = int(os.getenv('EXPORT_BUFFER_BYTES') or 65536)
+
+    # Cached list responses: "memory" (per process), "sqlite" (shared by the
+    # workers on one host via RESPONSE_CACHE_SQLITE_PATH) or empty to disable
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', '')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL') or 60)
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE') or 1000)
+    RESPONSE_CACHE_SQLITE_PATH = os.getenv('RESPONSE_CACHE_SQLITE_PATH', 'response_cache.db')
+
+    # Pagination (keyset cursors on list endpoints)
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT') or 50)
+    PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT') or 200)
 
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret')
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=1)
+    # Short-lived access tokens; /auth/refresh trades a refresh token for a new one
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_MINUTES') or 15))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv('JWT_REFRESH_TOKEN_DAYS') or 30))
+    # Seconds between reads of new token_revocations rows into each
+    # worker's in-memory denylist (revocations by other workers lag this much)
+    TOKEN_DENYLIST_SYNC_SECONDS = float(os.getenv('TOKEN_DENYLIST_SYNC_SECONDS') or 5)
+
+    # Rate limits checked before the auth views touch the database or hash
+    # a password: "<count>/<n><second|minute|hour|day>", empty disables a
+    # rule. Counters live in each process ("memory", at most
+    # RATELIMIT_MEMORY_SIZE keys) or are shared by the workers on one host
+    # ("sqlite", RATELIMIT_SQLITE_PATH).
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    RATELIMIT_BACKEND = os.getenv('RATELIMIT_BACKEND', 'memory')
+    RATELIMIT_MEMORY_SIZE = int(os.getenv('RATELIMIT_MEMORY_SIZE') or 100000)
+    RATELIMIT_SQLITE_PATH = os.getenv('RATELIMIT_SQLITE_PATH', 'ratelimit.db')
+    RATELIMIT_LOGIN_PER_IP = os.getenv('RATELIMIT_LOGIN_PER_IP', '30/minute')
+    RATELIMIT_LOGIN_PER_USERNAME = os.getenv('RATELIMIT_LOGIN_PER_USERNAME', '10/5minutes')
+    RATELIMIT_LOGIN_TOTAL = os.getenv('RATELIMIT_LOGIN_TOTAL', '')
+    RATELIMIT_REGISTER_PER_IP = os.getenv('RATELIMIT_REGISTER_PER_IP', '5/hour')
 
     # Mail
     MAIL_SERVER = os.getenv('MAIL_SERVER')
@@ -21,5 +104,45 @@ class Config:
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_USERNAME')
 
-    # Async mail sending (True/False)
-    MAIL_ASYNC = os.getenv('MAIL_ASYNC', 'false').lower() in ('1', 'true', 'yes')
+    # Notification outbox workers (0 = no background delivery; drain via CLI)
+    NOTIFY_WORKERS = int(os.getenv('NOTIFY_WORKERS') or 2)
+    NOTIFY_BATCH_SIZE = int(os.getenv('NOTIFY_BATCH_SIZE') or 50)
+    NOTIFY_POLL_INTERVAL = float(os.getenv('NOTIFY_POLL_INTERVAL') or 5)
+    NOTIFY_MAX_ATTEMPTS = int(os.getenv('NOTIFY_MAX_ATTEMPTS') or 5)
+    NOTIFY_RETRY_BASE_SECONDS = int(os.getenv('NOTIFY_RETRY_BASE_SECONDS') or 30)
+    NOTIFY_RETRY_MAX_SECONDS = int(os.getenv('NOTIFY_RETRY_MAX_SECONDS') or 3600)
+    NOTIFY_CLAIM_TIMEOUT = int(os.getenv('NOTIFY_CLAIM_TIMEOUT') or 300)
+
+    # Server-sent ticket events. Backend is "memory" (single process) or
+    # "sqlite" (shared by every worker on the host through EVENTS_SQLITE_PATH)
+    EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'memory')
+    EVENTS_SQLITE_PATH = os.getenv('EVENTS_SQLITE_PATH', 'events.db')
+    EVENTS_BUFFER_SIZE = int(os.getenv('EVENTS_BUFFER_SIZE') or 1000)
+    EVENTS_POLL_INTERVAL = float(os.getenv('EVENTS_POLL_INTERVAL') or 0.5)
+    EVENTS_RETENTION_SECONDS = int(os.getenv('EVENTS_RETENTION_SECONDS') or 3600)
+    EVENTS_KEEPALIVE_SECONDS = float(os.getenv('EVENTS_KEEPALIVE_SECONDS') or 15)
+    EVENTS_RETRY_MS = int(os.getenv('EVENTS_RETRY_MS') or 3000)
+
+    # Audit rows are written after commit by a background batch writer;
+    # AUDIT_ASYNC=false inserts them in the request transaction instead
+    AUDIT_ASYNC = os.getenv('AUDIT_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+    AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE') or 500)
+    AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL') or 1)
+    AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE') or 10000)
+    # Failed batch inserts are retried with doubling delays, then kept in
+    # AUDIT_SPILL_PATH until a later write succeeds
+    AUDIT_WRITE_RETRIES = int(os.getenv('AUDIT_WRITE_RETRIES') or 3)
+    AUDIT_RETRY_BACKOFF = float(os.getenv('AUDIT_RETRY_BACKOFF') or 0.5)
+    AUDIT_SPILL_PATH = os.getenv('AUDIT_SPILL_PATH', 'audit-spill.ndjson')
+    # `flask audits-archive` moves older audits into monthly files here
+    AUDIT_RETENTION_DAYS = int(os.getenv('AUDIT_RETENTION_DAYS') or 90)
+    AUDIT_ARCHIVE_DIR = os.getenv('AUDIT_ARCHIVE_DIR', 'archive/audits')
+
+    # SMS (Twilio optional; transport is one of twilio/console/memory)
+    TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID')
+    TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
+    TWILIO_FROM_NUMBER = os.getenv('TWILIO_FROM_NUMBER')
+    SMS_TRANSPORT = os.getenv('SMS_TRANSPORT', 'twilio')
+    SMS_ASYNC = os.getenv('SMS_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+    SMS_RATE_PER_SECOND = float(os.getenv('SMS_RATE_PER_SECOND') or 1)
+    SMS_QUEUE_SIZE = int(os.getenv('SMS_QUEUE_SIZE') or 10000)
@@ -1,13 +1,21 @@
 from flask import Blueprint, request, jsonify
-from ..models import Ticket
+from ..models import Ticket, TicketMessage
 from ..extensions import db
 from flask_jwt_extended import get_jwt_identity, jwt_required, get_jwt
-from ..schemas import TicketSchema
+from ..schemas import TicketSchema, TicketMessageSchema, eager_load_options, ticket_list_schema
+from ..pagination import datetime_arg, get_limit, int_arg, keyset_paginate, paginated_response
+from ..serializers import serialize
+from ..conditional import TICKET_COLLECTIONS, conditional
+from ..response_cache import response_cache
+from ..routing import read_only
+from ..services.events import publish_ticket_event
 
 customer_bp = Blueprint("customer", __name__)
 
 ticket_schema = TicketSchema()
-tickets_schema = TicketSchema(many=True)
+message_schema = TicketMessageSchema()
+messages_schema = TicketMessageSchema(many=True)
+message_load_options = eager_load_options(messages_schema)
 
 
 # ============================
@@ -41,33 +49,119 @@ def create_ticket():
     )
     db.session.add(ticket)
     db.session.commit()
+    publish_ticket_event("ticket.created", ticket)
     return jsonify(ticket_schema.dump(ticket)), 201
 
 
 # ============================
 # LIST TICKETS
 # ============================
+def _listing_tags(role, user_id):
+    # Mirrors the role filter in list_tickets
+    if role == "Engineer":
+        return (f"tickets:assigned_to:{user_id}", "users")
+    if role == "Admin":
+        return ("tickets:all", "users")
+    return (f"tickets:created_by:{user_id}", "users")
+
+
 @customer_bp.route("/tickets", methods=["GET"])
 @jwt_required()
+@read_only
+@conditional(TICKET_COLLECTIONS)
+@response_cache.cached(_listing_tags)
 def list_tickets():
     """List tickets visible to the logged-in user based on role."""
     claims = get_jwt()
     role = claims.get("role")
     user_id = int(get_jwt_identity())
 
-    if role == "Admin":
-        tickets = Ticket.query.order_by(Ticket.created_at.desc()).all()
-    elif role == "Engineer":
-        tickets = (
-            Ticket.query.filter_by(assigned_to=user_id)
-            .order_by(Ticket.created_at.desc())
-            .all()
-        )
-    else:  # User -> only tickets they created
-        tickets = (
-            Ticket.query.filter_by(created_by=user_id)
-            .order_by(Ticket.created_at.desc())
-            .all()
-        )
-
-    return jsonify(tickets_schema.dump(tickets)), 200
+    schema, load_options = ticket_list_schema()
+    query = Ticket.query.options(*load_options)
+    if role == "Engineer":
+        query = query.filter_by(assigned_to=user_id)
+    elif role != "Admin":  # User -> only tickets they created
+        query = query.filter_by(created_by=user_id)
+
+    tickets, next_cursor = keyset_paginate(query, Ticket)
+    return paginated_response(serialize(schema, tickets), next_cursor)
+
+
+# ============================
+# TICKET MESSAGES
+# ============================
+def _thread_ticket(ticket_id):
+    """Return (ticket, None) if the caller may use its thread, else (None, error)."""
+    ticket = db.session.get(Ticket, ticket_id)
+    if ticket is None:
+        return None, (jsonify({"msg": "Ticket not found"}), 404)
+
+    role = get_jwt().get("role")
+    user_id = int(get_jwt_identity())
+    allowed = (
+        role in ("Admin", "Support Agent")
+        or (role == "Engineer" and ticket.assigned_to == user_id)
+        or (role == "User" and ticket.created_by == user_id)
+    )
+    if not allowed:
+        return None, (jsonify({"msg": "Forbidden - not your ticket"}), 403)
+    return ticket, None
+
+
+@customer_bp.route("/tickets/<int:ticket_id>/messages", methods=["GET"])
+@jwt_required()
+@read_only
+def list_messages(ticket_id):
+    """Return a ticket's messages oldest first, newer than `?after_id=` / `?since=`.
+
+    Clients poll with the id of the last message they hold. When a page is
+    full, `X-Next-Cursor` carries the `after_id` for the next one.
+    """
+    ticket, error = _thread_ticket(ticket_id)
+    if error:
+        return error
+
+    limit = get_limit()
+    after_id = int_arg("after_id")
+    since = datetime_arg("since")
+
+    # The ticket row already says whether anything newer exists
+    if ticket.last_message_id is None or ticket.last_message_id <= after_id:
+        return paginated_response([], None)
+    if since is not None and ticket.last_message_at <= since:
+        return paginated_response([], None)
+
+    query = TicketMessage.query.options(*message_load_options).filter(
+        TicketMessage.ticket_id == ticket.id, TicketMessage.id > after_id
+    )
+    if since is not None:
+        query = query.filter(TicketMessage.created_at > since)
+    messages = query.order_by(TicketMessage.id).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = str(messages[-1].id)
+    return paginated_response(serialize(messages_schema, messages), next_cursor)
+
+
+@customer_bp.route("/tickets/<int:ticket_id>/messages", methods=["POST"])
+@jwt_required()
+def post_message(ticket_id):
+    """Add a message to a ticket's thread."""
+    ticket, error = _thread_ticket(ticket_id)
+    if error:
+        return error
+
+    data = request.get_json() or {}
+    text = (data.get("message") or "").strip()
+    if not text:
+        return jsonify({"msg": "message required"}), 400
+
+    sender_id = int(get_jwt_identity())
+    message = TicketMessage(ticket_id=ticket.id, sender_id=sender_id, message=text)
+    db.session.add(message)
+    # message_count / last_message_* are updated by the flush hook in app/threads.py
+    db.session.commit()
+    publish_ticket_event("ticket.message", ticket)
+    return jsonify(message_schema.dump(message)), 201
@@ -0,0 +1,93 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from .extensions import db
+from .routing import REPLICA_BIND
+
+
+# ============================
+# ENGINE OPTIONS
+# ============================
+def engine_options(config, uri=None):
+    """Return create_engine() options for `uri` (default: the main database).
+
+    SQLite gets a driver-level busy timeout; server databases get the
+    pool settings.
+    """
+    url = make_url(uri or config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() == "sqlite":
+        options = {}
+        if config.get("DB_SQLITE_BUSY_TIMEOUT_MS"):
+            options["connect_args"] = {"timeout": config["DB_SQLITE_BUSY_TIMEOUT_MS"] / 1000}
+    else:
+        options = {
+            "pool_size": config.get("DB_POOL_SIZE", 10),
+            "max_overflow": config.get("DB_MAX_OVERFLOW", 20),
+            "pool_timeout": config.get("DB_POOL_TIMEOUT", 30),
+            "pool_recycle": config.get("DB_POOL_RECYCLE", 1800),
+            "pool_pre_ping": config.get("DB_POOL_PRE_PING", True),
+        }
+    return options
+
+
+# ============================
+# SQLITE PRAGMAS
+# ============================
+def sqlite_pragmas(config):
+    """PRAGMA statements run on every new SQLite connection (empty = driver default)."""
+    pragmas = []
+    if config.get("DB_SQLITE_JOURNAL_MODE"):
+        pragmas.append(f"PRAGMA journal_mode={config['DB_SQLITE_JOURNAL_MODE']}")
+    if config.get("DB_SQLITE_SYNCHRONOUS"):
+        pragmas.append(f"PRAGMA synchronous={config['DB_SQLITE_SYNCHRONOUS']}")
+    if config.get("DB_SQLITE_BUSY_TIMEOUT_MS"):
+        pragmas.append(f"PRAGMA busy_timeout={int(config['DB_SQLITE_BUSY_TIMEOUT_MS'])}")
+    if config.get("DB_SQLITE_CACHE_SIZE_KB"):
+        # Negative values are KiB rather than pages
+        pragmas.append(f"PRAGMA cache_size=-{int(config['DB_SQLITE_CACHE_SIZE_KB'])}")
+    if config.get("DB_SQLITE_MMAP_SIZE"):
+        pragmas.append(f"PRAGMA mmap_size={int(config['DB_SQLITE_MMAP_SIZE'])}")
+    return pragmas
+
+
+def _install_pragmas(engine, pragmas):
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def configure(app):
+    """Fill in engine options; must run before `db.init_app` creates the engines.
+
+    Options set explicitly in SQLALCHEMY_ENGINE_OPTIONS or a bind's dict win.
+    """
+    config = app.config
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(config), **(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    }
+    configured = dict(config.get("SQLALCHEMY_BINDS") or {})
+    if config.get("DATABASE_REPLICA_URI"):
+        configured.setdefault(REPLICA_BIND, config["DATABASE_REPLICA_URI"])
+    binds = {}
+    for key, value in configured.items():
+        if isinstance(value, dict):
+            binds[key] = {**engine_options(config, value["url"]), **value}
+        else:
+            binds[key] = {"url": value, **engine_options(config, value)}
+    config["SQLALCHEMY_BINDS"] = binds
+
+
+def init_app(app):
+    """Run the configured PRAGMAs on every new connection of each SQLite engine."""
+    pragmas = sqlite_pragmas(app.config)
+    if not pragmas:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                _install_pragmas(engine, pragmas)
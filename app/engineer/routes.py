@@ -1,16 +1,22 @@
 from flask import Blueprint, jsonify
-from ..models import Ticket, Audit
+from ..models import Ticket
 from ..extensions import db
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..schemas import TicketSchema
+from ..schemas import TicketSchema, ticket_list_schema
 from ..middleware.decorators import role_required
+from ..pagination import keyset_paginate, paginated_response
+from ..serializers import serialize
+from ..conditional import TICKET_COLLECTIONS, conditional
+from ..response_cache import response_cache
+from ..routing import read_only
+from ..services.audit import audit_log
+from ..services.events import publish_ticket_event
 
 # Blueprint
 engineer_bp = Blueprint("engineer", __name__)
 
 # Schemas
 ticket_schema = TicketSchema()
-tickets_schema = TicketSchema(many=True)
 
 # ============================
 # List tickets assigned to engineer
@@ -18,15 +24,17 @@ tickets_schema = TicketSchema(many=True)
 @engineer_bp.route("/my-assigned", methods=["GET"])
 @jwt_required()
 @role_required("Engineer")
+@read_only
+@conditional(TICKET_COLLECTIONS)
+@response_cache.cached(lambda role, user_id: (f"tickets:assigned_to:{user_id}", "users"))
 def my_assigned():
     """List all tickets assigned to the logged-in engineer."""
     user_id = int(get_jwt_identity())
-    tickets = (
-        Ticket.query.filter_by(assigned_to=user_id)
-        .order_by(Ticket.created_at.desc())
-        .all()
+    schema, load_options = ticket_list_schema()
+    tickets, next_cursor = keyset_paginate(
+        Ticket.query.options(*load_options).filter_by(assigned_to=user_id), Ticket
     )
-    return jsonify(tickets_schema.dump(tickets)), 200
+    return paginated_response(serialize(schema, tickets), next_cursor)
 
 
 # ============================
@@ -46,16 +54,21 @@ def resolve_ticket(ticket_id):
     if ticket.status == "resolved":
         return jsonify({"msg": "Ticket is already resolved"}), 400
 
+    previous_status = ticket.status
     ticket.status = "resolved"
     db.session.add(ticket)
 
     # Add audit log
-    audit = Audit(
-        action="resolve",
-        user_id=user_id,
-        details=f"Ticket {ticket.id} resolved by engineer {user_id}"
+    audit_log.record(
+        "resolve",
+        user_id,
+        "ticket",
+        ticket.id,
+        old_values={"status": previous_status},
+        new_values={"status": ticket.status},
+        details=f"Ticket {ticket.id} resolved by engineer {user_id}",
     )
-    db.session.add(audit)
     db.session.commit()
+    publish_ticket_event("ticket.resolved", ticket)
 
     return jsonify(ticket_schema.dump(ticket)), 200
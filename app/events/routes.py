@@ -0,0 +1,56 @@
+import json
+
+from flask import Blueprint, Response, current_app, request, stream_with_context
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+
+from ..extensions import db
+from ..services.events import event_bus
+
+events_bp = Blueprint("events", __name__)
+
+
+def _format(event_id, event):
+    lines = [f"event: {event['type']}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(event.get('ticket'), separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+# ============================
+# Ticket change stream (Server-Sent Events)
+# ============================
+@events_bp.route("/tickets", methods=["GET"])
+# EventSource cannot send headers, so the token may also come as ?jwt=
+@jwt_required(locations=["headers", "query_string"])
+def ticket_events():
+    """Stream ticket.created/assigned/resolved/... deltas visible to the caller.
+
+    Staff see every ticket; engineers and customers only tickets they are
+    assigned to or created. Reconnecting clients resume from `Last-Event-ID`;
+    a `reset` event means some were missed and lists should be refetched.
+    """
+    role = get_jwt().get("role")
+    user_id = int(get_jwt_identity())
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        after_id = int(last_id) if last_id else None
+    except ValueError:
+        after_id = None
+    keepalive = current_app.config.get("EVENTS_KEEPALIVE_SECONDS", 15)
+
+    # Streams stay open for minutes; don't hold a pooled connection meanwhile
+    db.session.remove()
+
+    def stream():
+        yield f"retry: {current_app.config.get('EVENTS_RETRY_MS', 3000)}\n\n"
+        for item in event_bus.subscribe(role, user_id, after_id, keepalive):
+            if item is None:
+                yield ": keepalive\n\n"
+            else:
+                yield _format(*item)
+
+    response = Response(stream_with_context(stream()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
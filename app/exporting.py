@@ -0,0 +1,146 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from flask import Response, current_app, stream_with_context
+
+from .extensions import db
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead
+    orjson = None
+
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+class ExportError(ValueError):
+    """Raised for an unsupported export format."""
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _ndjson_lines(columns, rows):
+    if orjson is not None:
+        for row in rows:
+            yield orjson.dumps(dict(zip(columns, row)), default=_json_default) + b"\n"
+    else:
+        for row in rows:
+            yield (json.dumps(dict(zip(columns, row)), default=_json_default) + "\n").encode()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        # JSON columns (audit old/new values) stay machine-readable in a cell
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def _csv_lines(columns, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def take():
+        data = buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+        return data
+
+    writer.writerow(columns)
+    yield take()
+    for row in rows:
+        writer.writerow([_csv_value(v) for v in row])
+        yield take()
+
+
+def _buffered(chunks, size):
+    """Coalesce small chunks so each write to the socket carries ~`size` bytes."""
+    pending, length = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b"".join(pending)
+            pending, length = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def _gzipped(chunks):
+    # wbits=31 writes a gzip header/trailer; sync flushes keep data flowing
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    yield compressor.compress(b"") + compressor.flush(zlib.Z_SYNC_FLUSH)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(name, statement, fmt="ndjson", gzip=False):
+    """Stream the rows of `statement` as an NDJSON or CSV download.
+
+    Rows are fetched `EXPORT_YIELD_PER` at a time through a server-side
+    cursor, encoded one by one and flushed in small buffers, so memory use
+    does not depend on table size. The first chunk (CSV header or gzip
+    header) is sent before the query runs to keep proxies from timing out,
+    and the first NDJSON line as soon as it is fetched.
+    """
+    if fmt not in FORMATS:
+        raise ExportError(f"format must be one of: {', '.join(FORMATS)}")
+    mimetype, extension = FORMATS[fmt]
+    yield_per = current_app.config.get("EXPORT_YIELD_PER", 1000)
+    buffer_size = current_app.config.get("EXPORT_BUFFER_BYTES", 64 * 1024)
+    columns = [c.name for c in statement.selected_columns]
+
+    def rows():
+        result = db.session.execute(statement.execution_options(yield_per=yield_per))
+        try:
+            for partition in result.partitions():
+                yield from partition
+        finally:
+            result.close()
+
+    if fmt == "csv":
+        lines = _csv_lines(columns, rows())
+        # the header line goes out on its own, ahead of the first fetch
+        body = _chain_first(next(lines), _buffered(lines, buffer_size))
+    else:
+        # the first row goes out as soon as it is fetched, not once a
+        # whole buffer has filled
+        body = _first_unbuffered(_ndjson_lines(columns, rows()), buffer_size)
+
+    filename = f"{name}.{extension}"
+    if gzip:
+        body = _gzipped(body)
+        mimetype, filename = "application/gzip", filename + ".gz"
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _chain_first(first, rest):
+    yield first
+    yield from rest
+
+
+def _first_unbuffered(chunks, size):
+    for first in chunks:
+        yield first
+        break
+    yield from _buffered(chunks, size)
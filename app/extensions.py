@@ -5,7 +5,9 @@ from flask_mail import Mail
 from flask_marshmallow import Marshmallow
 from flask_cors import CORS
 
-db = SQLAlchemy()
+from .routing import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 mail = Mail()
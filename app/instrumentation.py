@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db
+
+METRIC_HELP = {
+    "requests_total": ("counter", "HTTP requests handled"),
+    "request_seconds_total": ("counter", "Wall time spent handling requests"),
+    "db_queries_total": ("counter", "SQL statements executed while handling requests"),
+    "db_seconds_total": ("counter", "Time spent executing SQL statements"),
+    "serialize_seconds_total": ("counter", "Time spent in schema dump()"),
+    "response_bytes_total": ("counter", "Response body bytes sent"),
+}
+
+
+class MetricsRegistry:
+    """Per-endpoint counters rendered in Prometheus text format."""
+
+    def __init__(self, prefix="crm"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        # extra sources called at scrape time: fn() -> iterable of (name, type, help, labels, value)
+        self.collectors = []
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+    def render(self):
+        samples = defaultdict(list)
+        types = dict(METRIC_HELP)
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                samples[name].append((labels, value))
+        for collector in self.collectors:
+            for name, kind, help_text, labels, value in collector():
+                types.setdefault(name, (kind, help_text))
+                samples[name].append((tuple(sorted(labels.items())), value))
+
+        lines = []
+        for name in sorted(samples):
+            kind, help_text = types[name]
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            for labels, value in sorted(samples[name]):
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{full}{{{label_text}}} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+metrics = MetricsRegistry()
+
+
+# ============================
+# SERIALIZATION TIMING
+# ============================
+class TimedDumpMixin:
+    """Attribute top-level schema dump() time to the current request."""
+
+    def dump(self, obj, *args, **kwargs):
+        stats = g.get("_instrumentation") if has_request_context() else None
+        if stats is None or stats["dump_depth"]:
+            return super().dump(obj, *args, **kwargs)
+
+        stats["dump_depth"] += 1
+        start = time.perf_counter()
+        try:
+            return super().dump(obj, *args, **kwargs)
+        finally:
+            stats["serialize_seconds"] += time.perf_counter() - start
+            stats["dump_depth"] -= 1
+
+
+# ============================
+# HOOKS
+# ============================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    if has_request_context():
+        stats = g.get("_instrumentation")
+        if stats is not None:
+            stats["db_queries"] += 1
+            stats["db_seconds"] += elapsed
+
+
+def _handle_error(context):
+    # after_cursor_execute is skipped for failed statements
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def _start_request():
+    g._instrumentation = {
+        "start": time.perf_counter(),
+        "db_queries": 0,
+        "db_seconds": 0.0,
+        "serialize_seconds": 0.0,
+        "dump_depth": 0,
+    }
+
+
+def _finish_request(response):
+    stats = g.pop("_instrumentation", None)
+    if stats is None:
+        return response
+
+    total = time.perf_counter() - stats["start"]
+    endpoint = request.endpoint or "unmatched"
+    labels = {"endpoint": endpoint, "method": request.method}
+
+    metrics.inc("requests_total", {**labels, "status": str(response.status_code)})
+    metrics.inc("request_seconds_total", labels, total)
+    metrics.inc("db_queries_total", labels, stats["db_queries"])
+    metrics.inc("db_seconds_total", labels, stats["db_seconds"])
+    metrics.inc("serialize_seconds_total", labels, stats["serialize_seconds"])
+    if not response.is_streamed:
+        metrics.inc("response_bytes_total", labels, response.calculate_content_length() or 0)
+
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={stats["db_seconds"] * 1000:.2f};desc="{stats["db_queries"]} queries", '
+        f'serialize;dur={stats["serialize_seconds"] * 1000:.2f}, '
+        f'total;dur={total * 1000:.2f}',
+    )
+    return response
+
+
+def _lookup_cache_samples():
+    from .caching import cache_stats
+
+    for cache, stats in cache_stats().items():
+        yield "cache_hits_total", "counter", "Lookup cache hits", {"cache": cache}, stats["hits"]
+        yield "cache_misses_total", "counter", "Lookup cache misses", {"cache": cache}, stats["misses"]
+        yield "cache_entries", "gauge", "Entries held by a lookup cache", {"cache": cache}, stats["size"]
+
+
+def _response_cache_samples():
+    from .response_cache import response_cache
+
+    if response_cache.backend is None:
+        return
+    for endpoint, stats in response_cache.stats().items():
+        labels = {"endpoint": endpoint}
+        lookups = stats["hits"] + stats["misses"]
+        yield "response_cache_hits_total", "counter", "Response cache hits", labels, stats["hits"]
+        yield "response_cache_misses_total", "counter", "Response cache misses", labels, stats["misses"]
+        yield ("response_cache_hit_ratio", "gauge", "Share of cacheable requests served from cache",
+               labels, stats["hits"] / lookups if lookups else 0)
+
+
+def _rate_limit_samples():
+    from .middleware.ratelimit import rate_limiter
+
+    for rule, stats in rate_limiter.stats().items():
+        labels = {"rule": rule}
+        yield "rate_limit_allowed_total", "counter", "Requests within a rate limit", labels, stats["allowed"]
+        yield "rate_limit_rejected_total", "counter", "Requests rejected by a rate limit", labels, stats["rejected"]
+
+
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    """Enable per-request instrumentation when `INSTRUMENTATION_ENABLED` is set."""
+    if not app.config.get("INSTRUMENTATION_ENABLED"):
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+                event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+                event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+                event.listen(engine, "handle_error", _handle_error)
+
+    for collector in (_lookup_cache_samples, _response_cache_samples, _rate_limit_samples):
+        if collector not in metrics.collectors:
+            metrics.collectors.append(collector)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule(app.config.get("METRICS_PATH", "/metrics"), "metrics", metrics_endpoint)
@@ -0,0 +1,289 @@
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache, wraps
+
+from flask import current_app, jsonify, request
+
+UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+# RATELIMIT_* settings that configure the limiter rather than hold a rule
+OPTIONS = {"RATELIMIT_ENABLED", "RATELIMIT_BACKEND", "RATELIMIT_MEMORY_SIZE", "RATELIMIT_SQLITE_PATH"}
+LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@lru_cache(maxsize=64)
+def parse_limit(value):
+    """"20/minute", "5/15minutes" -> (20, 60.0); empty -> None (no limit)."""
+    if not value:
+        return None
+    match = LIMIT_PATTERN.match(str(value).lower())
+    if not match:
+        raise ValueError(f"invalid rate limit {value!r}; expected e.g. '20/minute'")
+    count, multiplier, unit = match.groups()
+    if not int(count):
+        raise ValueError(f"invalid rate limit {value!r}; leave it empty to disable")
+    return int(count), float(int(multiplier or 1) * UNITS[unit])
+
+
+# ============================
+# ALGORITHMS
+# ============================
+# Each takes the stored state (None for a new key), the current time and the
+# limit, and returns (new state, allowed, retry after seconds). A state is a
+# tuple of three floats so every store can keep it in fixed-size columns;
+# rejected hits are not counted.
+def token_bucket(state, now, limit, period):
+    """`limit` tokens refilled evenly over `period`: allows bursts up to `limit`."""
+    tokens, updated, _ = state or (float(limit), now, 0.0)
+    tokens = min(float(limit), tokens + (now - updated) * limit / period)
+    if tokens >= 1:
+        return (tokens - 1, now, 0.0), True, 0.0
+    return (tokens, now, 0.0), False, (1 - tokens) * period / limit
+
+
+def sliding_window(state, now, limit, period):
+    """At most `limit` hits in any `period`, estimated from two fixed windows.
+
+    The previous window's count is weighted by how much of it still overlaps
+    the sliding window, which needs two counters instead of a timestamp per hit.
+    """
+    start, previous, current = state or (now - now % period, 0.0, 0.0)
+    elapsed = now - start
+    if elapsed >= 2 * period:
+        start, previous, current = now - now % period, 0.0, 0.0
+    elif elapsed >= period:
+        start, previous, current = start + period, current, 0.0
+    into = now - start
+
+    if previous * (1 - into / period) + current + 1 <= limit:
+        return (start, previous, current + 1), True, 0.0
+    if current + 1 <= limit:
+        # Wait until enough of the previous window has slid out
+        wait = period * (1 - (limit - 1 - current) / previous) - into
+    else:
+        # Wait into the next window, until this one's weight is low enough
+        wait = period - into + period * (1 - (limit - 1) / current)
+    return (start, previous, current), False, max(wait, 0.0)
+
+
+ALGORITHMS = {"token_bucket": token_bucket, "sliding_window": sliding_window}
+
+
+# ============================
+# STORES
+# ============================
+class MemoryStore:
+    """Per-process store holding at most `maxsize` keys, least recently used evicted first.
+
+    Evicting a key forgets its history, so size the store above the number
+    of clients expected within one limit period.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, algorithm, limit, period, now):
+        with self._lock:
+            state, allowed, retry_after = algorithm(self._states.get(key), now, limit, period)
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.maxsize:
+                self._states.popitem(last=False)
+        return allowed, retry_after
+
+    def size(self):
+        return len(self._states)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+
+class SQLiteStore:
+    """Store shared by every worker on one host, kept in a SQLite file.
+
+    A local stand-in for a networked store such as Redis, which can be
+    plugged in with `register_backend`. Each hit is one short write
+    transaction; keys idle for two periods are pruned.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path, maxsize=100000):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._writes = 0
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits "
+            "(key TEXT PRIMARY KEY, a REAL NOT NULL, b REAL NOT NULL, c REAL NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, algorithm, limit, period, now):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT a, b, c FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            state, allowed, retry_after = algorithm(tuple(row) if row else None, now, limit, period)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, a, b, c, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, *state, now + 2 * period),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM rate_limits WHERE key NOT IN "
+                    "(SELECT key FROM rate_limits ORDER BY expires_at DESC LIMIT ?)",
+                    (self.maxsize,),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, retry_after
+
+    def size(self):
+        return self._conn().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def clear(self):
+        self._conn().execute("DELETE FROM rate_limits")
+
+
+BACKENDS = {
+    "memory": lambda config: MemoryStore(config.get("RATELIMIT_MEMORY_SIZE", 100000)),
+    "sqlite": lambda config: SQLiteStore(
+        config.get("RATELIMIT_SQLITE_PATH", "ratelimit.db"),
+        config.get("RATELIMIT_MEMORY_SIZE", 100000),
+    ),
+}
+
+
+def register_backend(name, factory):
+    """Make `factory(config) -> store` selectable via `RATELIMIT_BACKEND`."""
+    BACKENDS[name] = factory
+
+
+# ============================
+# KEYS
+# ============================
+def client_ip():
+    # Behind a reverse proxy, wrap the app in werkzeug's ProxyFix so this is
+    # the client's address rather than the proxy's
+    return request.remote_addr or "unknown"
+
+
+def json_field(name):
+    """Key function reading a (case-folded) field of the JSON body."""
+    def key():
+        body = request.get_json(silent=True)
+        value = body.get(name) if isinstance(body, dict) else None
+        return value.strip().lower() if isinstance(value, str) and value.strip() else None
+    return key
+
+
+def with_client_ip(key_func):
+    """Key function scoping `key_func`'s key to the client address.
+
+    Used for per-account limits: a client can only use up its own budget
+    for an account, not lock the account's owner out.
+    """
+    def key():
+        value = key_func()
+        return None if value is None else f"{value}@{client_ip()}"
+    return key
+
+
+def route_only():
+    return "*"
+
+
+# ============================
+# LIMITER
+# ============================
+class RateLimiter:
+    """Reject requests over a configured rate before the view runs.
+
+    Each `limit` rule names a config setting holding the rate ("20/minute",
+    empty to disable), a key function (client IP, a body field, or the route
+    as a whole) and an algorithm. Rules are checked in the order listed and
+    the first one exceeded answers 429 with a Retry-After header, so no
+    query or password hash runs for a rejected request.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._settings = set()
+        self.allowed = defaultdict(int)
+        self.rejected = defaultdict(int)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # A malformed rule fails here, once, rather than on every request
+        for setting in sorted(self._settings | {k for k in app.config if k.startswith("RATELIMIT_")} - OPTIONS):
+            try:
+                parse_limit(app.config.get(setting))
+            except ValueError as e:
+                raise ValueError(f"{setting}: {e}") from None
+        self.enabled = app.config.get("RATELIMIT_ENABLED", True)
+        self.store = BACKENDS[app.config.get("RATELIMIT_BACKEND", "memory")](app.config)
+        app.extensions["rate_limiter"] = self
+
+    def check(self, setting, key_func, algorithm):
+        """Count one hit; return the seconds to wait if over the limit, else None."""
+        rule = parse_limit(current_app.config.get(setting))
+        key = key_func()
+        if rule is None or key is None:
+            return None
+        limit, period = rule
+        allowed, retry_after = self.store.hit(
+            f"{setting}:{request.endpoint}:{key}", ALGORITHMS[algorithm], limit, period, time.time()
+        )
+        with self._lock:
+            (self.allowed if allowed else self.rejected)[setting] += 1
+        return None if allowed else retry_after
+
+    def limit(self, setting, key=client_ip, algorithm="sliding_window"):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown rate limit algorithm {algorithm!r}")
+        self._settings.add(setting)
+
+        def wrapper(fn):
+            @wraps(fn)
+            def decorator(*args, **kwargs):
+                if self.enabled:
+                    retry_after = self.check(setting, key, algorithm)
+                    if retry_after is not None:
+                        response = jsonify({"msg": "Too many requests, try again later"})
+                        response.status_code = 429
+                        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                        return response
+                return fn(*args, **kwargs)
+            return decorator
+        return wrapper
+
+    def stats(self):
+        with self._lock:
+            rules = set(self.allowed) | set(self.rejected)
+            return {r: {"allowed": self.allowed[r], "rejected": self.rejected[r]} for r in rules}
+
+
+rate_limiter = RateLimiter()
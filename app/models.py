@@ -1,6 +1,6 @@
 from datetime import datetime
 from .extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from .passwords import hash_password, verify_password
 
 
 class Role(db.Model):
@@ -21,8 +21,10 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     role_id = db.Column(db.Integer, db.ForeignKey("roles.id"), nullable=False)
+    # Carried in the JWT `ver` claim; bumping it revokes every older token
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
@@ -37,10 +39,10 @@ class User(db.Model):
 
     # Password helpers
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -48,17 +50,36 @@ class User(db.Model):
 
 class Ticket(db.Model):
     __tablename__ = "tickets"
+    # Every listing filters on one of these columns and pages newest first
+    # on (created_at, id), so each index ends with the keyset columns.
+    __table_args__ = (
+        db.Index("ix_tickets_created_at_id", "created_at", "id"),
+        db.Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        db.Index("ix_tickets_created_by_created_at_id", "created_by", "created_at", "id"),
+        db.Index("ix_tickets_assigned_to_created_at_id", "assigned_to", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
     status = db.Column(db.String(50), default="open")
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    assigned_to = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # active_history: the stats flush hook needs the old value of these even
+    # when an expired attribute is overwritten
+    assigned_to = db.mapped_column(db.Integer, db.ForeignKey("users.id"), nullable=True, active_history=True)
+    created_at = db.mapped_column(db.DateTime, default=datetime.utcnow, active_history=True)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Set when the ticket enters a resolved status, cleared if it is reopened
+    resolved_at = db.mapped_column(db.DateTime, nullable=True, active_history=True)
+
+    # Thread summary, kept in step by the flush hook in app/threads.py so
+    # lists and pollers never need to touch ticket_messages
+    message_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    last_message_id = db.Column(db.Integer, nullable=True)
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    last_message_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
 
     # Relationships
     messages = db.relationship("TicketMessage", backref="ticket", lazy=True)
@@ -69,6 +90,9 @@ class Ticket(db.Model):
 
 class TicketMessage(db.Model):
     __tablename__ = "ticket_messages"
+    __table_args__ = (
+        db.Index("ix_ticket_messages_ticket_id_id", "ticket_id", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     ticket_id = db.Column(db.Integer, db.ForeignKey("tickets.id"), nullable=False)
@@ -81,13 +105,107 @@ class TicketMessage(db.Model):
 
 
 class Audit(db.Model):
+    """Append-only record of who changed what; written by `services.audit`."""
+
     __tablename__ = "audits"
+    __table_args__ = (
+        db.Index("ix_audits_created_at_id", "created_at", "id"),
+        db.Index("ix_audits_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_audits_entity_created_at", "entity_type", "entity_id", "created_at", "id"),
+        db.Index("ix_audits_action_created_at", "action", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     action = db.Column(db.String(100), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    entity_type = db.Column(db.String(30), nullable=True)
+    entity_id = db.Column(db.Integer, nullable=True)
+    # Only the fields the action changed, before and after
+    old_values = db.Column(db.JSON, nullable=True)
+    new_values = db.Column(db.JSON, nullable=True)
     details = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __repr__(self):
         return f"<Audit {self.action} by User {self.user_id}>"
+
+
+class Notification(db.Model):
+    """Outbox row for an email waiting to be delivered by the worker pool."""
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        db.Index("ix_notification_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+        db.Index("ix_notification_outbox_claimed_by", "claimed_by"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    claimed_by = db.Column(db.String(32), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Notification {self.id} to {self.recipient} ({self.status})>"
+
+
+class CollectionVersion(db.Model):
+    """Change counter per table, bumped in the transaction that modifies it."""
+
+    __tablename__ = "collection_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CollectionVersion {self.name}={self.version}>"
+
+
+class TicketStat(db.Model):
+    """One counter of the ticket statistics rollup (see app/stats.py)."""
+
+    __tablename__ = "ticket_stats"
+
+    dimension = db.Column(db.String(30), primary_key=True)
+    key = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.BigInteger, nullable=False, default=0)
+    # Sum of a measure over the counted tickets (seconds to resolve)
+    total = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TicketStat {self.dimension}:{self.key}={self.count}>"
+
+
+class TokenRevocation(db.Model):
+    """Denylist entry for JWTs, mirrored in memory by `app.tokens`.
+
+    An entry revokes one token (`jti`), every token of the user with a
+    lower `ver` claim (`min_version`), or, with neither set, every token of
+    a deleted user issued before `created_at`. Entries are kept until
+    `expires_at`, after which the tokens they cover have expired anyway.
+    """
+
+    __tablename__ = "token_revocations"
+    __table_args__ = (
+        db.Index("ix_token_revocations_created_at", "created_at"),
+        db.Index("ix_token_revocations_expires_at", "expires_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # No foreign key: entries for deleted users must outlive the user row
+    user_id = db.Column(db.Integer, nullable=False)
+    jti = db.Column(db.String(64), nullable=True)
+    min_version = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<TokenRevocation user={self.user_id} jti={self.jti} min_version={self.min_version}>"
@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+from flask import current_app, request
+from sqlalchemy import or_
+
+from .serializers import json_response
+
+
+class PaginationError(ValueError):
+    """Raised when `limit` or `cursor` query args are malformed."""
+
+
+def encode_cursor(created_at, row_id):
+    """Build the opaque cursor pointing just after (created_at, id)."""
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (ValueError, TypeError):
+        raise PaginationError("invalid cursor")
+
+
+def get_limit():
+    default = current_app.config.get("PAGINATION_DEFAULT_LIMIT", 50)
+    maximum = current_app.config.get("PAGINATION_MAX_LIMIT", 200)
+    try:
+        limit = int(request.args.get("limit", default))
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be positive")
+    return min(limit, maximum)
+
+
+def int_arg(name, default=0):
+    """Read an integer query arg, raising PaginationError when malformed."""
+    value = request.args.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise PaginationError(f"{name} must be an integer")
+
+
+def datetime_arg(name):
+    """Read an ISO 8601 query arg as a naive UTC datetime (or None)."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise PaginationError(f"{name} must be an ISO 8601 timestamp")
+    # Stored timestamps are naive UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def keyset_paginate(query, model):
+    """Return (items, next_cursor) for `query` ordered newest first.
+
+    Pages are seeked on the (created_at, id) pair instead of OFFSET, so
+    fetching page 1000 costs the same as fetching page 1. `next_cursor` is
+    None once the last page has been reached.
+    """
+    limit = get_limit()
+    cursor = request.args.get("cursor")
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # The leading `<=` is redundant but sargable, so the index range
+        # starts at the cursor instead of scanning from the newest row.
+        query = query.filter(
+            model.created_at <= created_at,
+            or_(model.created_at < created_at, model.id < row_id),
+        )
+
+    rows = (
+        query.order_by(None)
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def paginated_response(payload, next_cursor):
+    """Encode `payload` as JSON and expose the next-page cursor as a header.
+
+    The cursor travels in `X-Next-Cursor` so that existing response bodies
+    keep their shape; clients pass it back as `?cursor=` to fetch the next
+    page and stop when the header is absent.
+    """
+    resp, status = json_response(payload)
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+    return resp, status
@@ -0,0 +1,118 @@
+import atexit
+import multiprocessing
+import threading
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # argon2-cffi is optional
+    PasswordHasher = None
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+ARGON2_PREFIX = "$argon2"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class PasswordVerifyTimeout(RuntimeError):
+    """Raised when the verification pool does not answer in time."""
+
+
+def _setting(key, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def _argon2_hasher():
+    if PasswordHasher is None:
+        raise RuntimeError("PASSWORD_HASH_METHOD=argon2 requires the argon2-cffi package")
+    return PasswordHasher(
+        time_cost=_setting("PASSWORD_ARGON2_TIME_COST", 2),
+        memory_cost=_setting("PASSWORD_ARGON2_MEMORY_COST", 19456),
+        parallelism=_setting("PASSWORD_ARGON2_PARALLELISM", 1),
+    )
+
+
+def hash_password(password, method=None):
+    """Hash `password` with the configured (or given) method."""
+    method = method or _setting("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+    if method == "argon2":
+        return _argon2_hasher().hash(password)
+    return generate_password_hash(
+        password, method=method, salt_length=_setting("PASSWORD_SALT_LENGTH", 16)
+    )
+
+
+def verify_password(pwhash, password):
+    """Check `password` against a werkzeug or argon2 hash."""
+    if not pwhash:
+        return False
+    if pwhash.startswith(ARGON2_PREFIX):
+        if PasswordHasher is None:
+            return False
+        try:
+            return PasswordHasher().verify(pwhash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(pwhash, password)
+
+
+def needs_rehash(pwhash):
+    """True when `pwhash` was produced with other than the current parameters."""
+    method = _setting("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+    if method == "argon2":
+        if not pwhash.startswith(ARGON2_PREFIX):
+            return True
+        return _argon2_hasher().check_needs_rehash(pwhash)
+    if pwhash.startswith(ARGON2_PREFIX):
+        return True
+    return pwhash.split("$", 1)[0] != _canonical_method(method)
+
+
+@lru_cache(maxsize=8)
+def _canonical_method(method):
+    # werkzeug expands e.g. "scrypt" to "scrypt:32768:8:1" in the stored hash
+    return generate_password_hash("", method=method, salt_length=1).split("$", 1)[0]
+
+
+# ============================
+# OFF-WORKER VERIFICATION
+# ============================
+def _get_pool(workers):
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Forking copies the locks held by this process's other
+                # threads (mail dispatcher, audit writer, DB pool) and can
+                # deadlock the child; spawned workers start clean
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+    return _pool
+
+
+def verify_password_offloaded(pwhash, password):
+    """Verify in the dedicated process pool when one is configured.
+
+    Hashing is CPU bound and holds the GIL, so running it in separate
+    processes keeps a burst of logins from stalling every other request
+    served by this worker. `PASSWORD_VERIFY_WORKERS=0` verifies inline.
+    Raises `PasswordVerifyTimeout` when the pool is too busy to answer
+    within `PASSWORD_VERIFY_TIMEOUT` seconds.
+    """
+    workers = _setting("PASSWORD_VERIFY_WORKERS", 0)
+    if workers <= 0:
+        return verify_password(pwhash, password)
+    future = _get_pool(workers).submit(verify_password, pwhash, password)
+    try:
+        return future.result(timeout=_setting("PASSWORD_VERIFY_TIMEOUT", 10))
+    except TimeoutError:
+        future.cancel()
+        raise PasswordVerifyTimeout("password verification timed out") from None
@@ -0,0 +1,341 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import event, inspect
+
+from .caching import TTLCache
+from .extensions import db
+from .routing import REPLICA_READ
+
+# Bumped by invalidate_all(); part of every key
+GLOBAL_TAG = "*"
+
+
+# ============================
+# BACKENDS
+# ============================
+class MemoryBackend:
+    """Per-process LRU/TTL store; invalidations only reach this process."""
+
+    def __init__(self, maxsize=1000, ttl=60):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl, name="responses")
+        self._generations = defaultdict(int)
+        self._bumped_at = {}
+        self._lock = threading.Lock()
+
+    def generations(self, tags):
+        with self._lock:
+            return [self._generations[tag] for tag in tags]
+
+    def bumped_at(self, tags):
+        with self._lock:
+            return max((self._bumped_at.get(tag, 0.0) for tag in tags), default=0.0)
+
+    def bump(self, tags):
+        now = time.time()
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] += 1
+                self._bumped_at[tag] = now
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries.set(key, value)
+
+    def size(self):
+        return len(self.entries)
+
+
+class SQLiteBackend:
+    """Store shared by every worker on one host, kept in a SQLite file.
+
+    A local stand-in for a networked store such as Redis or memcached,
+    which can be plugged in with `register_backend`. Entries expire after
+    `ttl`; past `maxsize` the oldest are evicted first.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path, maxsize=1000, ttl=60):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache "
+            "(key TEXT PRIMARY KEY, body BLOB NOT NULL, headers TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache_generations "
+            "(tag TEXT PRIMARY KEY, generation INTEGER NOT NULL, bumped_at REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(response_cache_generations)")}
+        if "bumped_at" not in columns:
+            # Store files created before bump times were kept
+            conn.execute("ALTER TABLE response_cache_generations ADD COLUMN bumped_at REAL NOT NULL DEFAULT 0")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def generations(self, tags):
+        placeholders = ",".join("?" * len(tags))
+        found = dict(self._conn().execute(
+            f"SELECT tag, generation FROM response_cache_generations WHERE tag IN ({placeholders})",
+            list(tags),
+        ).fetchall())
+        return [found.get(tag, 0) for tag in tags]
+
+    def bumped_at(self, tags):
+        placeholders = ",".join("?" * len(tags))
+        row = self._conn().execute(
+            f"SELECT MAX(bumped_at) FROM response_cache_generations WHERE tag IN ({placeholders})",
+            list(tags),
+        ).fetchone()
+        return row[0] or 0.0
+
+    def bump(self, tags):
+        now = time.time()
+        self._conn().executemany(
+            "INSERT INTO response_cache_generations (tag, generation, bumped_at) VALUES (?, 1, ?) "
+            "ON CONFLICT (tag) DO UPDATE SET generation = generation + 1, bumped_at = excluded.bumped_at",
+            [(tag, now) for tag in tags],
+        )
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT body, headers FROM response_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key, value):
+        body, headers = value
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, body, headers, stored_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, body, json.dumps(headers), now, now + self.ttl),
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM response_cache WHERE key NOT IN "
+                "(SELECT key FROM response_cache ORDER BY stored_at DESC LIMIT ?)",
+                (self.maxsize,),
+            )
+
+    def size(self):
+        return self._conn().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+
+BACKENDS = {
+    "memory": lambda config: MemoryBackend(
+        config.get("RESPONSE_CACHE_SIZE", 1000), config.get("RESPONSE_CACHE_TTL", 60)
+    ),
+    "sqlite": lambda config: SQLiteBackend(
+        config.get("RESPONSE_CACHE_SQLITE_PATH", "response_cache.db"),
+        config.get("RESPONSE_CACHE_SIZE", 1000),
+        config.get("RESPONSE_CACHE_TTL", 60),
+    ),
+}
+
+
+def register_backend(name, factory):
+    """Make `factory(config) -> backend` selectable via `RESPONSE_CACHE_BACKEND`."""
+    BACKENDS[name] = factory
+
+
+# ============================
+# RESPONSE CACHE
+# ============================
+class ResponseCache:
+    """Cache serialized list responses per (endpoint, role, user, page).
+
+    Every entry depends on a few tags such as "tickets:assigned_to:7". Each
+    tag has a generation counter that is part of the cache key, so a write
+    invalidates exactly the listings it can affect by bumping those
+    counters; stale entries are never read again and age out of the store.
+
+    A response read from the replica within `REPLICA_STICKY_SECONDS` of a
+    bump of one of its tags is not stored: the replica may not have the
+    write yet, and the stale rows would be cached under the new generation.
+    """
+
+    # Response headers worth replaying on a hit
+    KEEP_HEADERS = ("Content-Type", "X-Next-Cursor")
+
+    def __init__(self, app=None):
+        self.backend = None
+        self._lock = threading.Lock()
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        name = app.config.get("RESPONSE_CACHE_BACKEND")
+        self.backend = BACKENDS[name](app.config) if name else None
+        app.extensions["response_cache"] = self
+
+    def invalidate(self, tags):
+        if self.backend is not None and tags:
+            self.backend.bump(sorted(tags))
+
+    def invalidate_all(self):
+        self.invalidate([GLOBAL_TAG])
+
+    def stats(self):
+        with self._lock:
+            endpoints = set(self.hits) | set(self.misses)
+            return {e: {"hits": self.hits[e], "misses": self.misses[e]} for e in endpoints}
+
+    def _record(self, counter, endpoint):
+        with self._lock:
+            counter[endpoint] += 1
+
+    def _maybe_lagging(self, tags):
+        """True if the response came from a replica that may predate a bump of `tags`."""
+        if not db.session.info.get(REPLICA_READ):
+            return False
+        window = current_app.config.get("REPLICA_STICKY_SECONDS", 5)
+        return time.time() - self.backend.bumped_at(tags) < window
+
+    def cached(self, tags_for):
+        """Cache a JSON view's 200 responses.
+
+        `tags_for(role, user_id)` returns the tags the response depends on.
+        """
+        def wrapper(fn):
+            @wraps(fn)
+            def decorator(*args, **kwargs):
+                if self.backend is None:
+                    return fn(*args, **kwargs)
+
+                role = get_jwt().get("role")
+                user_id = get_jwt_identity()
+                tags = [GLOBAL_TAG, *tags_for(role, int(user_id))]
+                generations = self.backend.generations(tags)
+                key = hashlib.blake2b(
+                    repr((request.endpoint, role, user_id, request.full_path, tags, generations)).encode(),
+                    digest_size=16,
+                ).hexdigest()
+
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self._record(self.hits, request.endpoint)
+                    body, headers = entry
+                    response = current_app.response_class(body, headers=headers)
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                self._record(self.misses, request.endpoint)
+                db.session.info.pop(REPLICA_READ, None)
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed and not self._maybe_lagging(tags):
+                    headers = {h: response.headers[h] for h in self.KEEP_HEADERS if h in response.headers}
+                    self.backend.set(key, (response.get_data(), headers))
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return decorator
+        return wrapper
+
+
+response_cache = ResponseCache()
+
+
+# ============================
+# INVALIDATION
+# ============================
+def _ticket_tags(values):
+    """Tags for a ticket given every (created_by, assigned_to, status) it had."""
+    tags = {"tickets:all"}
+    for created_by, assigned_to, status in values:
+        if created_by is not None:
+            tags.add(f"tickets:created_by:{created_by}")
+        if assigned_to is not None:
+            tags.add(f"tickets:assigned_to:{assigned_to}")
+        if status is not None:
+            tags.add(f"tickets:status:{status}")
+    return tags
+
+
+def _old_and_new(obj, attrs):
+    # Both the old and the new value of a changed column can appear in a listing
+    state = inspect(obj)
+    values = []
+    for attr in attrs:
+        history = state.attrs[attr].history
+        values.append(
+            set(history.added or ()) | set(history.deleted or ()) | set(history.unchanged or ())
+            or {getattr(obj, attr)}
+        )
+    return values
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_tags(session, flush_context):
+    from .models import Ticket, TicketMessage, User
+
+    if response_cache.backend is None:
+        return
+    tags = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Ticket):
+            created, assigned, status = _old_and_new(obj, ("created_by", "assigned_to", "status"))
+            tags |= _ticket_tags(
+                [(c, None, None) for c in created]
+                + [(None, a, None) for a in assigned]
+                + [(None, None, s) for s in status]
+            )
+        elif isinstance(obj, TicketMessage):
+            ticket = session.get(Ticket, obj.ticket_id)
+            if ticket is not None:
+                tags |= _ticket_tags([(ticket.created_by, ticket.assigned_to, ticket.status)])
+        elif isinstance(obj, User):
+            # listings embed creator/assignee usernames and emails
+            tags.add("users")
+    if tags:
+        session.info.setdefault("stale_response_tags", set()).update(tags)
+
+
+def invalidate_tickets_on_commit(session, values):
+    """Queue invalidation for tickets written through Core, bypassing the flush hook.
+
+    `values` holds every (created_by, assigned_to, status) the tickets had
+    before and after the write; the tags are bumped once `session` commits.
+    """
+    if response_cache.backend is not None:
+        session.info.setdefault("stale_response_tags", set()).update(_ticket_tags(values))
+
+
+@event.listens_for(db.session, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop("stale_response_tags", None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_tags(session):
+    session.info.pop("stale_response_tags", None)
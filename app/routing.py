@@ -0,0 +1,119 @@
+import math
+import time
+from functools import wraps
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = "replica"
+STICKY_COOKIE = "crm_primary_until"
+
+# session.info flags
+READ_ONLY = "read_only"
+WROTE = "wrote"
+REPLICA_READ = "replica_read"
+
+# user id -> monotonic deadline; lets cookie-less API clients read their
+# own writes when the same worker serves them
+_sticky_users = {}
+_STICKY_USERS_MAX = 10000
+
+
+class RoutingSession(Session):
+    """Send reads of `@read_only` requests to the replica bind, the rest to the primary.
+
+    Flushes, DML statements and everything after the first write in the
+    request go to the primary, so a request never reads around its own
+    changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if getattr(clause, "is_dml", False):
+            # Core writes through the session count as writes too
+            self.info[WROTE] = True
+        if (
+            bind is None
+            and self.info.get(READ_ONLY)
+            and not self.info.get(WROTE)
+            and not self._flushing
+        ):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                self.info[REPLICA_READ] = True
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _mark_written(session, flush_context, instances):
+    session.info[WROTE] = True
+
+
+# ============================
+# READ-YOUR-WRITES
+# ============================
+def _identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:  # no JWT verified in this request
+        return None
+
+
+def _sticky():
+    """True while this client must read from the primary after a write."""
+    try:
+        if float(request.cookies.get(STICKY_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    user_id = _identity()
+    return user_id is not None and _sticky_users.get(str(user_id), 0) > time.monotonic()
+
+
+def _remember_write(response):
+    sqlalchemy = current_app.extensions["sqlalchemy"]
+    if REPLICA_BIND not in sqlalchemy.engines or not sqlalchemy.session.info.get(WROTE):
+        return response
+    window = current_app.config.get("REPLICA_STICKY_SECONDS", 5)
+    response.set_cookie(STICKY_COOKIE, str(time.time() + window), max_age=math.ceil(window), httponly=True)
+    user_id = _identity()
+    if user_id is not None:
+        if len(_sticky_users) >= _STICKY_USERS_MAX:
+            now = time.monotonic()
+            for key in [k for k, deadline in _sticky_users.items() if deadline <= now]:
+                _sticky_users.pop(key, None)
+        _sticky_users[str(user_id)] = time.monotonic() + window
+    return response
+
+
+def read_only(fn):
+    """Serve the view from the replica bind unless the client recently wrote.
+
+    Place below `@jwt_required()` so the caller is known. Without a
+    configured replica this is a no-op.
+    """
+    @wraps(fn)
+    def decorator(*args, **kwargs):
+        sqlalchemy = current_app.extensions["sqlalchemy"]
+        if REPLICA_BIND not in sqlalchemy.engines or _sticky():
+            return fn(*args, **kwargs)
+        session = sqlalchemy.session
+        session.info[READ_ONLY] = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            session.info.pop(READ_ONLY, None)
+    return decorator
+
+
+def init_app(app):
+    app.after_request(_remember_write)
+    with app.app_context():
+        engine = app.extensions["sqlalchemy"].engines.get(REPLICA_BIND)
+    if engine is not None and engine.dialect.name == "sqlite":
+        # A file standing in for a replica must never be written to
+        @event.listens_for(engine, "connect")
+        def query_only(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA query_only=ON")
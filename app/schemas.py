@@ -1,10 +1,14 @@
 # app/schemas.py
 from .extensions import ma
-from .models import User, Role, Ticket, TicketMessage
+from .models import Audit, User, Role, Ticket, TicketMessage
+from .instrumentation import TimedDumpMixin
+from flask import request
 from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
 
 
-class RoleSchema(ma.SQLAlchemySchema):
+class RoleSchema(TimedDumpMixin, ma.SQLAlchemySchema):
     class Meta:
         model = Role
         load_instance = True
@@ -13,7 +17,7 @@ class RoleSchema(ma.SQLAlchemySchema):
     name = ma.auto_field()
 
 
-class UserSchema(ma.SQLAlchemySchema):
+class UserSchema(TimedDumpMixin, ma.SQLAlchemySchema):
     class Meta:
         model = User
         load_instance = True
@@ -29,7 +33,7 @@ class UserSchema(ma.SQLAlchemySchema):
     role = fields.Nested(RoleSchema, only=("id", "name"))
 
 
-class TicketMessageSchema(ma.SQLAlchemySchema):
+class TicketMessageSchema(TimedDumpMixin, ma.SQLAlchemySchema):
     class Meta:
         model = TicketMessage
         load_instance = True
@@ -45,7 +49,7 @@ class TicketMessageSchema(ma.SQLAlchemySchema):
     sender = fields.Nested(UserSchema, only=("id", "username", "email"))
 
 
-class TicketSchema(ma.SQLAlchemySchema):
+class TicketSchema(TimedDumpMixin, ma.SQLAlchemySchema):
     class Meta:
         model = Ticket
         load_instance = True
@@ -59,6 +63,11 @@ class TicketSchema(ma.SQLAlchemySchema):
     assigned_to = ma.auto_field()
     created_at = ma.auto_field()
     updated_at = ma.auto_field()
+    resolved_at = ma.auto_field(dump_only=True)
+    message_count = ma.auto_field(dump_only=True)
+    last_message_id = ma.auto_field(dump_only=True)
+    last_message_at = ma.auto_field(dump_only=True)
+    last_message_by = ma.auto_field(dump_only=True)
 
     # Nested creator & assignee
     creator = fields.Nested(UserSchema, only=("id", "username", "email"))
@@ -66,3 +75,83 @@ class TicketSchema(ma.SQLAlchemySchema):
 
     # Include related messages
     messages = fields.List(fields.Nested(TicketMessageSchema))
+
+
+class AuditSchema(TimedDumpMixin, ma.SQLAlchemySchema):
+    class Meta:
+        model = Audit
+        load_instance = True
+        include_fk = True
+
+    id = ma.auto_field()
+    action = ma.auto_field()
+    user_id = ma.auto_field()
+    entity_type = ma.auto_field()
+    entity_id = ma.auto_field()
+    old_values = ma.auto_field()
+    new_values = ma.auto_field()
+    details = ma.auto_field()
+    created_at = ma.auto_field()
+
+
+# ============================
+# EAGER LOADING
+# ============================
+def _nested_schema(field):
+    if isinstance(field, fields.List):
+        field = field.inner
+    if isinstance(field, fields.Nested):
+        return field.schema
+    return None
+
+
+def eager_load_options(schema, model=None, _parent=None):
+    """Derive loader options covering every relationship `schema` dumps.
+
+    Many-to-one relationships are joined into the main query and
+    collections are fetched with one SELECT ... IN per level, so dumping
+    N rows costs a constant number of queries instead of one per row.
+    """
+    model = model or schema.opts.model
+    relationships = inspect(model).relationships
+    options = []
+
+    for name, field in schema.fields.items():
+        nested = _nested_schema(field)
+        attr = field.attribute or name
+        if nested is None or attr not in relationships:
+            continue
+
+        rel = relationships[attr]
+        target = getattr(model, attr)
+        if _parent is None:
+            option = selectinload(target) if rel.uselist else joinedload(target)
+        else:
+            option = _parent.selectinload(target) if rel.uselist else _parent.joinedload(target)
+
+        options.append(option)
+        options.extend(eager_load_options(nested, rel.mapper.class_, option))
+
+    return options
+
+
+# ============================
+# TICKET LISTS
+# ============================
+# Lists carry message_count / last_message_* instead of whole threads;
+# `?include=messages` restores the embedded arrays.
+ticket_summaries_schema = TicketSchema(many=True, exclude=("messages",))
+tickets_with_messages_schema = TicketSchema(many=True)
+_ticket_list_options = {
+    schema: eager_load_options(schema)
+    for schema in (ticket_summaries_schema, tickets_with_messages_schema)
+}
+
+
+def ticket_list_schema():
+    """Return (schema, loader options) for the ticket list being requested."""
+    if "messages" in request.args.get("include", "").split(","):
+        schema = tickets_with_messages_schema
+    else:
+        schema = ticket_summaries_schema
+    return schema, _ticket_list_options[schema]
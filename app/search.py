@@ -0,0 +1,221 @@
+import re
+
+from sqlalchemy import event, inspect, select, text
+
+from .extensions import db
+from .models import Ticket, TicketMessage
+
+INDEX_TABLE = "search_index"
+
+# Tickets and messages share one index; the document id encodes both kinds
+TICKET_DOC, MESSAGE_DOC = 0, 1
+
+
+def _doc_id(kind, row_id):
+    return row_id * 2 + kind
+
+
+# ============================
+# DIALECT SUPPORT
+# ============================
+SQLITE_DDL = [
+    # No porter stemmer: it would also stem the prefix token of a query
+    # ("flaming*" -> "flame*") and break search-as-you-type
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} USING fts5("
+    "title, body, ticket_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')",
+]
+
+POSTGRES_DDL = [
+    f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ("
+    "id BIGINT PRIMARY KEY, ticket_id INTEGER NOT NULL, document TSVECTOR NOT NULL)",
+    f"CREATE INDEX IF NOT EXISTS ix_{INDEX_TABLE}_document ON {INDEX_TABLE} USING GIN (document)",
+    f"CREATE INDEX IF NOT EXISTS ix_{INDEX_TABLE}_ticket_id ON {INDEX_TABLE} (ticket_id)",
+]
+
+UPSERT = {
+    "sqlite": (
+        f"INSERT OR REPLACE INTO {INDEX_TABLE} (rowid, title, body, ticket_id) "
+        "VALUES (:id, :title, :body, :ticket_id)"
+    ),
+    "postgresql": (
+        f"INSERT INTO {INDEX_TABLE} (id, ticket_id, document) VALUES (:id, :ticket_id, "
+        "setweight(to_tsvector('english', coalesce(:title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(:body, '')), 'B')) "
+        "ON CONFLICT (id) DO UPDATE SET ticket_id = EXCLUDED.ticket_id, document = EXCLUDED.document"
+    ),
+}
+
+DELETE = {
+    "sqlite": f"DELETE FROM {INDEX_TABLE} WHERE rowid = :id",
+    "postgresql": f"DELETE FROM {INDEX_TABLE} WHERE id = :id",
+}
+
+# Best match per ticket, ranked; bm25 is lower-is-better, ts_rank higher-is-better
+SEARCH = {
+    "sqlite": (
+        # bm25() cannot run inside an aggregate; the LIMIT stops SQLite from
+        # flattening the subquery into the GROUP BY
+        "SELECT ticket_id, MIN(score) AS score FROM ("
+        f"SELECT ticket_id, bm25({INDEX_TABLE}, 4.0, 1.0) AS score FROM {INDEX_TABLE} "
+        f"WHERE {INDEX_TABLE} MATCH :query LIMIT -1) "
+        "GROUP BY ticket_id ORDER BY score, ticket_id DESC LIMIT :limit OFFSET :offset"
+    ),
+    "postgresql": (
+        "SELECT ticket_id, MAX(ts_rank(document, q)) AS score "
+        f"FROM {INDEX_TABLE}, websearch_to_tsquery('english', :query) AS q "
+        "WHERE document @@ q GROUP BY ticket_id ORDER BY score DESC, ticket_id DESC "
+        "LIMIT :limit OFFSET :offset"
+    ),
+}
+
+
+def create_index(connection):
+    ddl = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(connection.dialect.name)
+    if ddl is None:
+        raise RuntimeError(f"full-text search is not supported on {connection.dialect.name}")
+    for statement in ddl:
+        connection.execute(text(statement))
+
+
+def drop_index(connection):
+    connection.execute(text(f"DROP TABLE IF EXISTS {INDEX_TABLE}"))
+
+
+_available = {}
+
+
+def index_available(connection):
+    """True when the index table exists (checked once per engine)."""
+    key = connection.engine.url
+    if key not in _available:
+        _available[key] = (
+            connection.dialect.name in UPSERT
+            and inspect(connection).has_table(INDEX_TABLE)
+        )
+    return _available[key]
+
+
+def clear_index(connection):
+    """Delete every document, for bulk deletes that bypass the flush hook."""
+    if index_available(connection):
+        connection.execute(text(f"DELETE FROM {INDEX_TABLE}"))
+
+
+# ============================
+# INDEXING
+# ============================
+def ticket_document(ticket_id, title, description):
+    return {"id": _doc_id(TICKET_DOC, ticket_id), "ticket_id": ticket_id,
+            "title": title or "", "body": description or ""}
+
+
+def message_document(message_id, ticket_id, message):
+    return {"id": _doc_id(MESSAGE_DOC, message_id), "ticket_id": ticket_id,
+            "title": "", "body": message or ""}
+
+
+def upsert_documents(connection, documents):
+    if documents:
+        connection.execute(text(UPSERT[connection.dialect.name]), documents)
+
+
+def delete_documents(connection, doc_ids):
+    if doc_ids:
+        connection.execute(text(DELETE[connection.dialect.name]), [{"id": i} for i in doc_ids])
+
+
+@event.listens_for(db.session, "after_flush")
+def _sync_index(session, flush_context):
+    """Keep the index in step with ticket/message writes, in the same transaction."""
+    documents, removed = [], []
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Ticket):
+            state = inspect(obj)
+            if obj in session.new or any(
+                state.attrs[attr].history.has_changes() for attr in ("title", "description")
+            ):
+                documents.append(ticket_document(obj.id, obj.title, obj.description))
+        elif isinstance(obj, TicketMessage):
+            documents.append(message_document(obj.id, obj.ticket_id, obj.message))
+
+    deleted_tickets = []
+    for obj in session.deleted:
+        if isinstance(obj, Ticket):
+            removed.append(_doc_id(TICKET_DOC, obj.id))
+            deleted_tickets.append(obj.id)
+        elif isinstance(obj, TicketMessage):
+            removed.append(_doc_id(MESSAGE_DOC, obj.id))
+
+    if not (documents or removed):
+        return
+    connection = session.connection()
+    if not index_available(connection):
+        return
+
+    if deleted_tickets:
+        message_ids = connection.execute(
+            select(TicketMessage.id).where(TicketMessage.ticket_id.in_(deleted_tickets))
+        ).scalars()
+        removed.extend(_doc_id(MESSAGE_DOC, i) for i in message_ids)
+    delete_documents(connection, removed)
+    upsert_documents(connection, documents)
+
+
+def reindex(chunk_size=5000, echo=print):
+    """Rebuild the whole index from tickets and messages; returns the doc count."""
+    total = 0
+    with db.engine.begin() as conn:
+        create_index(conn)
+        conn.execute(text(f"DELETE FROM {INDEX_TABLE}"))
+    _available.clear()
+
+    sources = (
+        (select(Ticket.id, Ticket.title, Ticket.description), Ticket.id, ticket_document),
+        (select(TicketMessage.id, TicketMessage.ticket_id, TicketMessage.message),
+         TicketMessage.id, message_document),
+    )
+    for statement, id_column, to_document in sources:
+        # Walk by id, one short transaction per chunk: an open read cursor
+        # would keep SQLite from committing the writes
+        last_id = 0
+        while True:
+            with db.engine.begin() as conn:
+                rows = conn.execute(
+                    statement.where(id_column > last_id).order_by(id_column).limit(chunk_size)
+                ).all()
+                if not rows:
+                    break
+                upsert_documents(conn, [to_document(*row) for row in rows])
+            last_id = rows[-1][0]
+            total += len(rows)
+            echo(f"  indexed {total:,} documents")
+    return total
+
+
+# ============================
+# QUERYING
+# ============================
+def _fts5_query(terms):
+    # Quote every token so user input can never be parsed as FTS5 syntax;
+    # the last token is a prefix match for search-as-you-type.
+    tokens = re.findall(r"\w+", terms)
+    if not tokens:
+        return None
+    quoted = [f'"{t}"' for t in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_ticket_ids(terms, limit, offset=0):
+    """Return [(ticket_id, score)] ranked best first."""
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    if dialect not in SEARCH:
+        raise RuntimeError(f"full-text search is not supported on {dialect}")
+    query = _fts5_query(terms) if dialect == "sqlite" else terms.strip()
+    if not query:
+        return []
+    rows = connection.execute(
+        text(SEARCH[dialect]), {"query": query, "limit": limit, "offset": offset}
+    )
+    return [(row.ticket_id, row.score) for row in rows]
@@ -0,0 +1,258 @@
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, text
+
+from .conditional import TRACKED, bump_versions
+from .extensions import db
+from . import search, stats
+from .models import Audit, Role, Ticket, TicketMessage, TicketStat, User
+from .passwords import hash_password
+from .response_cache import response_cache
+
+ROLE_NAMES = ["Admin", "Support Agent", "Engineer", "User"]
+
+# Share of generated users per role (the remainder are customers)
+ROLE_SHARES = {"Admin": 0.005, "Support Agent": 0.03, "Engineer": 0.07}
+
+ROLE_PASSWORDS = {
+    "Admin": "admin123",
+    "Support Agent": "support123",
+    "Engineer": "engineer123",
+    "User": "user123",
+}
+
+STATUS_WEIGHTS = {"open": 0.2, "in_progress": 0.25, "resolved": 0.45, "closed": 0.1}
+
+TITLES = [
+    "Login issue", "Payment failed", "Feature request", "Password reset not received",
+    "App crashes on startup", "Invoice is incorrect", "Cannot upload attachment",
+    "Slow dashboard", "Account locked", "Refund request", "Email notifications missing",
+    "Two-factor code rejected", "Data export incomplete", "Wrong timezone on reports",
+]
+PHRASES = [
+    "I tried again but it still does not work.", "This started happening yesterday.",
+    "We are checking your account, please wait.", "Could you share a screenshot?",
+    "We have escalated this to the responsible team.", "A fix has been deployed, please retry.",
+    "It happens on both mobile and desktop.", "Thanks, that solved it.",
+]
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk_insert(table, rows, chunk_size, label, echo):
+    """Insert `rows` (any iterable) in chunked transactions; returns the count."""
+    total = 0
+    started = time.perf_counter()
+    for chunk in _chunks(rows, chunk_size):
+        with db.engine.begin() as conn:
+            conn.execute(insert(table), chunk)
+        total += len(chunk)
+        echo(f"  {label}: {total:,} ({total / (time.perf_counter() - started):,.0f} rows/s)")
+    return total
+
+
+def _next_id(model):
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _skewed(rng, items):
+    # A few customers and engineers account for most tickets, as in production
+    return items[int(len(items) * rng.random() ** 2)]
+
+
+def reset_data():
+    with db.engine.begin() as conn:
+        for model in (Audit, TicketMessage, Ticket, User):
+            conn.execute(delete(model.__table__))
+        conn.execute(delete(TicketStat.__table__))
+        # Seeded ids start again from 1, so old documents would match new tickets
+        search.clear_index(conn)
+        bump_versions(conn, TRACKED)
+    response_cache.invalidate_all()
+
+
+def ensure_roles():
+    existing = {r.name: r.id for r in Role.query.all()}
+    missing = [{"name": name} for name in ROLE_NAMES if name not in existing]
+    if missing:
+        with db.engine.begin() as conn:
+            conn.execute(insert(Role.__table__), missing)
+        existing = {r.name: r.id for r in Role.query.all()}
+    return existing
+
+
+def generate_dataset(users=1000, tickets=10000, messages_per_ticket=2, days=365,
+                     chunk_size=5000, seed=42, reset=False, echo=print):
+    """Stream a synthetic dataset into the database with Core bulk inserts.
+
+    Rows are generated lazily and written `chunk_size` at a time, each
+    chunk in its own transaction, so memory stays flat for millions of
+    rows. Returns a summary dict including the generated user ids per role.
+    """
+    rng = random.Random(seed)
+    if reset:
+        reset_data()
+    roles = ensure_roles()
+    now = datetime.utcnow()
+    start = now - timedelta(days=days)
+
+    # Hash each distinct password once; salts are per-hash, not per-user
+    hashes = {role: hash_password(pwd) for role, pwd in ROLE_PASSWORDS.items()}
+
+    # ===========================
+    # USERS
+    # ===========================
+    first_user = _next_id(User)
+    role_for = []
+    for role, share in ROLE_SHARES.items():
+        role_for += [role] * max(1, int(users * share))
+    role_for += ["User"] * max(1, users - len(role_for))
+
+    by_role = {role: [] for role in ROLE_NAMES}
+    for offset, role in enumerate(role_for):
+        by_role[role].append(first_user + offset)
+
+    def user_rows():
+        for offset, role in enumerate(role_for):
+            uid = first_user + offset
+            name = f"{role.split()[0].lower()}{uid}"
+            yield {
+                "id": uid,
+                "username": name,
+                "email": f"{name}@example.com",
+                "password_hash": hashes[role],
+                "role_id": roles[role],
+                "created_at": start + timedelta(seconds=rng.uniform(0, days * 86400 * 0.1)),
+            }
+
+    echo("Seeding users")
+    _bulk_insert(User.__table__, user_rows(), chunk_size, "users", echo)
+
+    # ===========================
+    # TICKETS, MESSAGES, AUDITS
+    # ===========================
+    customers, engineers = by_role["User"], by_role["Engineer"]
+    admins = by_role["Admin"] + by_role["Support Agent"]
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+    first_ticket = _next_id(Ticket)
+    message_ids = itertools.count(_next_id(TicketMessage))
+    counts = {"messages": 0, "audits": 0}
+    pending_messages, pending_audits = [], []
+
+    def ticket_rows():
+        for offset in range(tickets):
+            tid = first_ticket + offset
+            created_at = start + timedelta(seconds=rng.uniform(days * 86400 * 0.1, days * 86400))
+            status = rng.choices(statuses, weights)[0]
+            creator = _skewed(rng, customers)
+            assignee = _skewed(rng, engineers) if status != "open" or rng.random() < 0.1 else None
+            updated_at = min(created_at + timedelta(hours=rng.expovariate(1 / 36)), now)
+
+            last = created_at
+            thread = {"message_count": 0, "last_message_id": None,
+                      "last_message_at": None, "last_message_by": None}
+            for _ in range(rng.randint(0, messages_per_ticket * 2)):
+                last = min(last + timedelta(minutes=rng.expovariate(1 / 240)), now)
+                sender = assignee if assignee and rng.random() < 0.5 else creator
+                mid = next(message_ids)
+                pending_messages.append({
+                    "id": mid, "ticket_id": tid, "sender_id": sender,
+                    "message": rng.choice(PHRASES), "created_at": last,
+                })
+                thread = {"message_count": thread["message_count"] + 1, "last_message_id": mid,
+                          "last_message_at": last, "last_message_by": sender}
+
+            if assignee:
+                pending_audits.append({
+                    "action": "assign", "user_id": rng.choice(admins),
+                    "entity_type": "ticket", "entity_id": tid,
+                    "old_values": {"assigned_to": None, "status": "open"},
+                    "new_values": {"assigned_to": assignee, "status": "in_progress"},
+                    "details": f"Ticket {tid} assigned to user {assignee}",
+                    "created_at": created_at + (updated_at - created_at) / 2,
+                })
+            if status in ("resolved", "closed") and assignee:
+                pending_audits.append({
+                    "action": "resolve", "user_id": assignee,
+                    "entity_type": "ticket", "entity_id": tid,
+                    "old_values": {"status": "in_progress"},
+                    "new_values": {"status": "resolved"},
+                    "details": f"Ticket {tid} marked as resolved",
+                    "created_at": updated_at,
+                })
+
+            yield {
+                "id": tid,
+                "title": rng.choice(TITLES),
+                "description": " ".join(rng.sample(PHRASES, 2)),
+                "status": status,
+                "created_by": creator,
+                "assigned_to": assignee,
+                "created_at": created_at,
+                "updated_at": updated_at,
+                "resolved_at": updated_at if status in ("resolved", "closed") else None,
+                **thread,
+            }
+
+    def flush_children():
+        # Children are written after the chunk of tickets they belong to
+        for rows, model, key in ((pending_messages, TicketMessage, "messages"),
+                                 (pending_audits, Audit, "audits")):
+            if rows:
+                with db.engine.begin() as conn:
+                    conn.execute(insert(model.__table__), rows)
+                counts[key] += len(rows)
+                rows.clear()
+
+    echo("Seeding tickets, messages and audits")
+    started = time.perf_counter()
+    ticket_count = 0
+    for chunk in _chunks(ticket_rows(), chunk_size):
+        with db.engine.begin() as conn:
+            conn.execute(insert(Ticket.__table__), chunk)
+        ticket_count += len(chunk)
+        flush_children()
+        echo(f"  tickets: {ticket_count:,} ({ticket_count / (time.perf_counter() - started):,.0f} rows/s)")
+
+    _sync_sequences()
+    # Core inserts skip the flush hook that invalidates cached ETags
+    with db.engine.begin() as conn:
+        bump_versions(conn, TRACKED)
+        echo("Rebuilding ticket statistics")
+        stats.rebuild(conn)
+    if db.engine.dialect.name in search.UPSERT:
+        echo("Rebuilding the search index")
+        search.reindex(chunk_size=chunk_size, echo=echo)
+    response_cache.invalidate_all()
+    return {
+        "users": len(role_for),
+        "tickets": ticket_count,
+        "messages": counts["messages"],
+        "audits": counts["audits"],
+        "user_ids": by_role,
+        "passwords": ROLE_PASSWORDS,
+    }
+
+
+def _sync_sequences():
+    # Explicit ids bypass Postgres sequences; move them past the new rows
+    if db.engine.dialect.name != "postgresql":
+        return
+    with db.engine.begin() as conn:
+        for table in ("users", "tickets", "ticket_messages"):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            ))
@@ -0,0 +1,145 @@
+import re
+import time
+
+from flask import current_app, g, has_request_context, request
+from marshmallow import fields
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead
+    orjson = None
+
+
+# ============================
+# COMPILED SERIALIZERS
+# ============================
+def _attribute_getter(name, field):
+    attr = field.attribute or name
+    if "." in attr:
+        return None
+    return lambda obj: getattr(obj, attr, None)
+
+
+def _compile_field(name, field):
+    """Return a fn(obj) -> value equivalent to `field.serialize(name, obj)`."""
+    get = _attribute_getter(name, field)
+    if get is None:
+        return lambda obj: field.serialize(name, obj)
+
+    if isinstance(field, fields.Nested):
+        nested = compile_serializer(field.schema)
+        if field.many:
+            return lambda obj: None if (v := get(obj)) is None else [nested(i) for i in v]
+        return lambda obj: None if (v := get(obj)) is None else nested(v)
+
+    if isinstance(field, fields.List) and isinstance(field.inner, fields.Nested):
+        nested = compile_serializer(field.inner.schema)
+        return lambda obj: None if (v := get(obj)) is None else [nested(i) for i in v]
+
+    if type(field) is fields.DateTime or isinstance(field, fields.NaiveDateTime):
+        fmt = fields.DateTime.SERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+        if fmt is not None and not isinstance(field, fields.AwareDateTime):
+            return lambda obj: None if (v := get(obj)) is None else fmt(v)
+
+    if type(field) in (fields.Integer, fields.String, fields.Boolean) and not getattr(field, "as_string", False):
+        # Values coming from the ORM already have the column's Python type
+        return get
+
+    return lambda obj: field.serialize(name, obj)
+
+
+def compile_serializer(schema):
+    """Compile `schema` into a plain function producing the same dict as dump().
+
+    The field tree is walked once up front; each row then costs one dict
+    comprehension over attribute getters instead of Marshmallow's per-field
+    dispatch, hooks and error handling. Field types without a fast path fall
+    back to the field's own `serialize`, so output always matches `dump()`.
+    """
+    compiled = getattr(schema, "_compiled_serializer", None)
+    if compiled is not None:
+        return compiled
+
+    getters = [
+        (field.data_key or name, _compile_field(name, field))
+        for name, field in schema.dump_fields.items()
+    ]
+
+    def serialize_one(obj):
+        return {key: get(obj) for key, get in getters}
+
+    if schema.many:
+        def compiled(objs):
+            return [serialize_one(obj) for obj in objs]
+    else:
+        compiled = serialize_one
+
+    schema._compiled_serializer = compiled
+    return compiled
+
+
+def fast_serialization_enabled():
+    if not has_request_context():
+        return False
+    enabled = current_app.config.get("FAST_SERIALIZATION_BLUEPRINTS", ())
+    return "*" in enabled or request.blueprint in enabled
+
+
+def serialize(schema, obj):
+    """`schema.dump(obj)`, via the compiled serializer where enabled."""
+    if not fast_serialization_enabled():
+        return schema.dump(obj)
+
+    stats = g.get("_instrumentation")
+    start = time.perf_counter()
+    try:
+        return compile_serializer(schema)(obj)
+    finally:
+        if stats is not None:
+            stats["serialize_seconds"] += time.perf_counter() - start
+
+
+# ============================
+# JSON ENCODING
+# ============================
+# Floats below 1e-4 or from 1e16 up, which orjson spells differently from
+# repr() ("1e16" / "1e+16", "0.00001" / "1e-05"). Strings that merely look
+# like this only cost a fallback.
+_FLOAT_SPELLING = re.compile(rb"\de-?\d|(?<![\d.])0\.0000")
+
+
+def _fast_dumps(payload):
+    """Encode exactly as Flask's default provider does in compact mode.
+
+    Returns None when the fast path cannot guarantee identical bytes
+    (orjson missing, non-ASCII or escaped control characters, unsupported
+    types such as big ints, floats orjson spells differently), in which
+    case the caller falls back. NaN and infinities, which the stdlib writes
+    as non-standard JSON, come out as null.
+    """
+    if orjson is None:
+        return None
+    try:
+        data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None
+    # the stdlib escapes non-ASCII (ensure_ascii) and uses its own \\u spelling
+    if not data.isascii() or b"\\u" in data or _FLOAT_SPELLING.search(data):
+        return None
+    return data
+
+
+def json_response(payload, status=200):
+    """Drop-in for `jsonify(payload), status` with an optional fast encoder."""
+    provider = current_app.json
+    compact = provider.compact if provider.compact is not None else not current_app.debug
+    # Only mirror the default provider's settings; anything else uses it directly
+    matches_default = getattr(provider, "sort_keys", False) and getattr(provider, "ensure_ascii", False)
+    body = None
+    if compact and matches_default and fast_serialization_enabled():
+        body = _fast_dumps(payload)
+    if body is None:
+        return provider.response(payload), status
+
+    response = current_app.response_class(body + b"\n", mimetype=provider.mimetype)
+    return response, status
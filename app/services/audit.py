@@ -0,0 +1,227 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event, insert
+
+from ..extensions import db
+from ..models import Audit
+
+
+class AuditLog:
+    """Append-only audit writer that batches rows off the request path.
+
+    `record` stages a row on the current session. Once that transaction
+    commits the row is handed to the app's background writer, which
+    inserts queued rows in batches of `AUDIT_BATCH_SIZE` (or every
+    `AUDIT_FLUSH_INTERVAL` seconds) with one multi-row INSERT. Rows for a
+    rolled-back transaction are dropped, so nothing is audited that did not
+    happen. Pending rows are flushed at interpreter exit; if the queue is
+    full the committing request writes its rows itself rather than lose
+    them. With `AUDIT_ASYNC` disabled rows are inserted in the request
+    transaction, as before.
+
+    A failed INSERT is retried `AUDIT_WRITE_RETRIES` times with exponential
+    backoff. Rows that still fail are appended to the NDJSON file at
+    `AUDIT_SPILL_PATH` and re-inserted after the next successful write.
+
+    Each app gets its own `AuditWriter` in `app.extensions["audit_log"]`,
+    and staged rows remember the app they were recorded in, so several apps
+    in one process never write into each other's database.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["audit_log"] = AuditWriter(app)
+
+    # ============================
+    # PRODUCER SIDE
+    # ============================
+    def record(self, action, user_id, entity_type=None, entity_id=None,
+               old_values=None, new_values=None, details=None):
+        """Audit `action` by `user_id` on an entity, with its changed fields."""
+        row = {
+            "action": action,
+            "user_id": user_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "old_values": old_values,
+            "new_values": new_values,
+            "details": details,
+            "created_at": datetime.utcnow(),
+        }
+        if not current_app.config.get("AUDIT_ASYNC", True):
+            db.session.add(Audit(**row))
+            return
+        db.session.info.setdefault("audit_rows", []).append(row)
+        db.session.info["audit_app"] = current_app._get_current_object()
+
+    def flush(self, timeout=None, app=None):
+        """Block until every row queued by `app` (default: the current one) is written."""
+        (app or current_app).extensions["audit_log"].flush(timeout)
+
+
+class AuditWriter:
+    """Queue and background writer of one app's audit rows."""
+
+    def __init__(self, app):
+        self.app = app
+        self._queue = queue.Queue(maxsize=app.config.get("AUDIT_QUEUE_SIZE", 10000))
+        self._worker = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._spill_lock = threading.Lock()
+
+    def submit(self, rows):
+        overflow = []
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+                with self._idle:
+                    self._pending += 1
+            except queue.Full:
+                overflow.append(row)
+        if overflow:
+            with self.app.app_context():
+                current_app.logger.warning("Audit queue full, writing %d row(s) inline", len(overflow))
+            self._write(overflow)
+        self._ensure_started()
+
+    # ============================
+    # CONSUMER SIDE
+    # ============================
+    def flush(self, timeout=None):
+        """Block until every queued row has been written."""
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def _ensure_started(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._worker.start()
+                atexit.register(self.flush, timeout=10)
+
+    def _run(self):
+        batch_size = self.app.config.get("AUDIT_BATCH_SIZE", 500)
+        interval = self.app.config.get("AUDIT_FLUSH_INTERVAL", 1.0)
+        while True:
+            batch = [self._queue.get()]
+            # Gather whatever else arrives within the interval, up to a batch
+            try:
+                while len(batch) < batch_size:
+                    batch.append(self._queue.get(timeout=interval))
+            except queue.Empty:
+                pass
+            try:
+                self._write(batch)
+            finally:
+                with self._idle:
+                    self._pending -= len(batch)
+                    self._idle.notify_all()
+
+    def _write(self, rows):
+        with self.app.app_context():
+            if self._insert(rows):
+                self._replay_spill()
+            else:
+                self._spill(rows)
+
+    def _insert(self, rows):
+        """INSERT `rows`, retrying with exponential backoff; True once written."""
+        retries = current_app.config.get("AUDIT_WRITE_RETRIES", 3)
+        delay = current_app.config.get("AUDIT_RETRY_BACKOFF", 0.5)
+        for attempt in range(retries + 1):
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(insert(Audit.__table__), rows)
+                return True
+            except Exception:
+                if attempt == retries:
+                    current_app.logger.exception("Audit write of %d row(s) failed", len(rows))
+                    return False
+                current_app.logger.warning(
+                    "Audit write of %d row(s) failed, retrying in %.1fs", len(rows), delay, exc_info=True
+                )
+                time.sleep(delay)
+                delay *= 2
+
+    # ============================
+    # SPILL FILE
+    # ============================
+    def _spill(self, rows):
+        path = current_app.config.get("AUDIT_SPILL_PATH", "audit-spill.ndjson")
+        try:
+            with self._spill_lock, open(path, "a", encoding="utf-8") as fh:
+                fh.writelines(
+                    json.dumps({**row, "created_at": row["created_at"].isoformat()}) + "\n" for row in rows
+                )
+                fh.flush()
+                os.fsync(fh.fileno())
+        except (OSError, TypeError, ValueError):
+            current_app.logger.exception("Could not spill %d audit row(s) to %s, requeueing", len(rows), path)
+            self._requeue(rows)
+            return
+        current_app.logger.error("Spilled %d audit row(s) to %s", len(rows), path)
+
+    def _requeue(self, rows):
+        for index, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                # Last resort: keep the rows in the log so they can be restored by hand
+                current_app.logger.critical("Audit queue full, unsaved audit rows: %r", rows[index:])
+                return
+            with self._idle:
+                self._pending += 1
+        self._ensure_started()
+
+    def _replay_spill(self):
+        """Insert rows left in the spill file by earlier failed writes."""
+        path = current_app.config.get("AUDIT_SPILL_PATH", "audit-spill.ndjson")
+        replaying = f"{path}.replaying"
+        if not (os.path.exists(path) or os.path.exists(replaying)):
+            return
+        with self._spill_lock:
+            # Claim the file so rows spilled meanwhile go to a fresh one
+            if not os.path.exists(replaying):
+                try:
+                    os.replace(path, replaying)
+                except FileNotFoundError:
+                    return
+            with open(replaying, encoding="utf-8") as fh:
+                rows = [json.loads(line) for line in fh if line.strip()]
+            for row in rows:
+                row["created_at"] = datetime.fromisoformat(row["created_at"])
+            if rows and not self._insert(rows):
+                return
+            os.remove(replaying)
+        current_app.logger.info("Restored %d spilled audit row(s) from %s", len(rows), path)
+
+
+audit_log = AuditLog()
+
+
+@event.listens_for(db.session, "after_commit")
+def _hand_off(session):
+    rows = session.info.pop("audit_rows", None)
+    app = session.info.pop("audit_app", None)
+    if rows:
+        app.extensions["audit_log"].submit(rows)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard(session):
+    session.info.pop("audit_rows", None)
+    session.info.pop("audit_app", None)
@@ -0,0 +1,215 @@
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from ..schemas import TicketSchema
+
+STAFF_ROLES = ("Admin", "Support Agent")
+
+# Only the fields a dashboard needs to patch its copy of the ticket
+ticket_event_schema = TicketSchema(only=(
+    "id", "title", "status", "created_by", "assigned_to", "created_at", "updated_at",
+    "message_count", "last_message_at",
+))
+
+
+# ============================
+# BACKENDS
+# ============================
+class MemoryBackend:
+    """Ring buffer of recent events shared by every subscriber in this process.
+
+    Subscribers read by event id rather than holding a queue each, so a
+    reconnecting client can resume from `Last-Event-ID` and a slow one can
+    never block publishers.
+    """
+
+    def __init__(self, size=1000):
+        self._events = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self._ids = itertools.count(1)
+
+    def publish(self, event):
+        with self._cond:
+            self._append(next(self._ids), event)
+
+    def _append(self, event_id, event):
+        # caller holds self._cond
+        self._events.append((event_id, event))
+        self._cond.notify_all()
+
+    def last_id(self):
+        with self._cond:
+            return self._events[-1][0] if self._events else 0
+
+    def read(self, after_id, timeout):
+        """Return (events newer than `after_id`, complete) waiting up to `timeout`.
+
+        `complete` is False when events after `after_id` have already been
+        dropped from the buffer, so the caller should resynchronise.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._events and self._events[-1][0] > after_id:
+                    complete = self._events[0][0] <= after_id + 1
+                    return [(i, e) for i, e in self._events if i > after_id], complete
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return [], True
+                self._cond.wait(remaining)
+
+
+class SQLiteBackend(MemoryBackend):
+    """Share events between worker processes on one host through a SQLite file.
+
+    Publishers insert rows; one poller thread per process copies new rows
+    into the local ring buffer, so subscribers still wait on a condition
+    instead of each polling the database. Stands in for a broker such as
+    Redis pub/sub, which can be plugged in with `register_backend`.
+    """
+
+    def __init__(self, path, size=1000, poll_interval=0.5, retention=3600):
+        super().__init__(size)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._poller = None
+        self._start_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            row = conn.execute("SELECT MAX(id) FROM events").fetchone()
+        # New subscribers start from "now", not from the whole retained log
+        self._cursor = row[0] or 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def publish(self, event):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("INSERT INTO events (payload, created_at) VALUES (?, ?)", (json.dumps(event), now))
+            conn.execute("DELETE FROM events WHERE created_at < ?", (now - self.retention,))
+        finally:
+            conn.close()
+        self._ensure_started()
+
+    def read(self, after_id, timeout):
+        self._ensure_started()
+        return super().read(after_id, timeout)
+
+    def last_id(self):
+        self._ensure_started()
+        with self._cond:
+            return self._events[-1][0] if self._events else self._cursor
+
+    def _ensure_started(self):
+        if self._poller is not None:
+            return
+        with self._start_lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name="events-poller", daemon=True)
+                self._poller.start()
+
+    def _poll(self):
+        conn = self._connect()
+        while True:
+            try:
+                rows = conn.execute(
+                    "SELECT id, payload FROM events WHERE id > ? ORDER BY id", (self._cursor,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                print("Event poll error", e)
+                rows = []
+            if rows:
+                with self._cond:
+                    for event_id, payload in rows:
+                        self._append(event_id, json.loads(payload))
+                    self._cursor = rows[-1][0]
+            time.sleep(self.poll_interval)
+
+
+BACKENDS = {
+    "memory": lambda config: MemoryBackend(config.get("EVENTS_BUFFER_SIZE", 1000)),
+    "sqlite": lambda config: SQLiteBackend(
+        config.get("EVENTS_SQLITE_PATH", "events.db"),
+        size=config.get("EVENTS_BUFFER_SIZE", 1000),
+        poll_interval=config.get("EVENTS_POLL_INTERVAL", 0.5),
+        retention=config.get("EVENTS_RETENTION_SECONDS", 3600),
+    ),
+}
+
+
+def register_backend(name, factory):
+    """Make `factory(config) -> backend` selectable via `EVENTS_BACKEND`."""
+    BACKENDS[name] = factory
+
+
+# ============================
+# BUS
+# ============================
+class EventBus:
+    """Process-wide publisher/subscriber for ticket change events."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.backend = BACKENDS[app.config.get("EVENTS_BACKEND", "memory")](app.config)
+        app.extensions["events"] = self
+
+    def publish(self, kind, ticket, previous_assignee=None):
+        """Publish a ticket delta; call after the change has been committed."""
+        if self.backend is None:
+            return
+        data = ticket_event_schema.dump(ticket)
+        # Users who may see the event besides staff; a previous assignee
+        # needs to learn that the ticket has left their queue
+        audience = {data["created_by"], data["assigned_to"], previous_assignee} - {None}
+        try:
+            self.backend.publish({"type": kind, "ticket": data, "audience": sorted(audience)})
+        except Exception as e:
+            # a broken event backend must not fail the request that changed the ticket
+            print("Event publish error", e)
+
+    def subscribe(self, role, user_id, after_id=None, keepalive=15):
+        """Yield (event_id, event) visible to the user, or None on each idle `keepalive`.
+
+        Yields (None, {"type": "reset"}) when events were missed and the
+        client should refetch its lists.
+        """
+        cursor = self.backend.last_id() if after_id is None else after_id
+        if cursor > self.backend.last_id():
+            # ids restarted (memory backend after a restart); resume from now
+            cursor = self.backend.last_id()
+            yield None, {"type": "reset"}
+
+        while True:
+            events, complete = self.backend.read(cursor, keepalive)
+            if not complete:
+                yield None, {"type": "reset"}
+            if not events:
+                yield None
+                continue
+            for event_id, event in events:
+                if role in STAFF_ROLES or user_id in event["audience"]:
+                    yield event_id, event
+            cursor = events[-1][0]
+
+
+event_bus = EventBus()
+
+
+def publish_ticket_event(kind, ticket, previous_assignee=None):
+    return event_bus.publish(kind, ticket, previous_assignee)
@@ -0,0 +1,273 @@
+import atexit
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import event, exists, select, update
+
+from ..extensions import db, mail
+from ..models import Notification
+
+
+class NotificationQueue:
+    """Durable email outbox drained by a bounded pool of worker threads.
+
+    `enqueue` only adds `Notification` rows to the caller's session, so the
+    emails are committed atomically with the change that triggered them and
+    survive restarts. Committing wakes a dispatcher thread which claims due
+    rows, hands them to the pool in batches (one SMTP connection per batch)
+    and reschedules failures with exponential backoff. With `NOTIFY_WORKERS`
+    above 0 the dispatcher starts with the app, so rows left pending or
+    awaiting a retry by a previous process are delivered without waiting
+    for a new commit.
+
+    Each app gets its own `NotificationDispatcher` in
+    `app.extensions["notifications"]`, which only ever reads that app's
+    outbox and uses its mail settings.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        dispatcher = NotificationDispatcher(app)
+        app.extensions["notifications"] = dispatcher
+        if app.config.get("NOTIFY_WORKERS", 0) > 0 and _serving():
+            dispatcher.start()
+
+    # ============================
+    # PRODUCER SIDE
+    # ============================
+    def enqueue(self, recipients, subject, body):
+        """Queue one email per recipient in the current session."""
+        if isinstance(recipients, str):
+            recipients = [recipients]
+        recipients = [r for r in dict.fromkeys(recipients) if r]
+        for recipient in recipients:
+            db.session.add(Notification(recipient=recipient, subject=subject, body=body))
+        if recipients:
+            db.session.info["notifications_enqueued"] = True
+        return len(recipients)
+
+    def drain(self, app=None):
+        """Deliver every due notification of `app` (default: the current one) now."""
+        return (app or current_app).extensions["notifications"].drain()
+
+    def shutdown(self, app=None, wait=True):
+        (app or current_app).extensions["notifications"].shutdown(wait)
+
+
+class NotificationDispatcher:
+    """Dispatcher thread and worker pool delivering one app's outbox."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._dispatcher = None
+        self._pool = None
+        self._slots = None
+
+    def wake(self):
+        """Signal the dispatcher that new rows may be due."""
+        if self.app.config.get("NOTIFY_WORKERS", 0) <= 0:
+            return
+        self.start()
+        self._wake.set()
+
+    # ============================
+    # CONSUMER SIDE
+    # ============================
+    def drain(self):
+        """Deliver every due notification in the calling thread.
+
+        Used when `NOTIFY_WORKERS` is 0 (for example from the CLI or tests).
+        Returns the number of rows processed.
+        """
+        processed = 0
+        while True:
+            batches = self._claim()
+            if not batches:
+                return processed
+            for batch in batches:
+                self._deliver(batch)
+                processed += len(batch)
+
+    def shutdown(self, wait=True):
+        self._stop.set()
+        self._wake.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout=5)
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+    def start(self):
+        if self._dispatcher is not None:
+            return
+        with self._lock:
+            if self._dispatcher is not None:
+                return
+            workers = self.app.config["NOTIFY_WORKERS"]
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notify")
+            self._slots = threading.BoundedSemaphore(workers)
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="notify-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+            atexit.register(self.shutdown)
+
+    def _dispatch_loop(self):
+        # Rows left behind by a previous process are picked up on the first pass
+        interval = self.app.config.get("NOTIFY_POLL_INTERVAL", 5)
+        while not self._stop.is_set():
+            try:
+                batches = self._claim()
+            except Exception as e:
+                print(f"❌ Notification claim error: {e}")
+                batches = []
+
+            for batch in batches:
+                self._slots.acquire()
+                self._pool.submit(self._deliver_and_release, batch)
+
+            if not batches:
+                self._wake.wait(interval)
+                self._wake.clear()
+
+    def _deliver_and_release(self, batch):
+        try:
+            self._deliver(batch)
+        finally:
+            self._slots.release()
+
+    def _claim(self):
+        """Atomically mark due rows as ours and return them in batches."""
+        config = self.app.config
+        batch_size = config.get("NOTIFY_BATCH_SIZE", 50)
+        workers = max(config.get("NOTIFY_WORKERS", 0), 1)
+        stale = timedelta(seconds=config.get("NOTIFY_CLAIM_TIMEOUT", 300))
+        token = uuid.uuid4().hex
+        now = datetime.utcnow()
+
+        with self.app.app_context():
+            # An idle poll only reads: the UPDATEs and the commit run only
+            # when there are claims to reset or rows to claim
+            stale_claims = (Notification.status == "sending", Notification.claimed_at < now - stale)
+            reset = db.session.scalar(select(exists().where(*stale_claims)))
+            if reset:
+                # Rows stuck in "sending" belonged to a worker that died mid-batch
+                db.session.execute(
+                    update(Notification).where(*stale_claims).values(status="pending", claimed_by=None)
+                )
+            due_ids = db.session.scalars(
+                select(Notification.id)
+                .where(Notification.status == "pending", Notification.next_attempt_at <= now)
+                .order_by(Notification.id)
+                .limit(batch_size * workers)
+            ).all()
+            if not due_ids:
+                if reset:
+                    db.session.commit()
+                db.session.remove()
+                return []
+            db.session.execute(
+                update(Notification)
+                .where(Notification.id.in_(due_ids), Notification.status == "pending")
+                .values(status="sending", claimed_by=token, claimed_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+
+            rows = [
+                {
+                    "id": n.id,
+                    "recipient": n.recipient,
+                    "subject": n.subject,
+                    "body": n.body,
+                    "attempts": n.attempts,
+                }
+                for n in Notification.query.filter_by(claimed_by=token, status="sending")
+                .order_by(Notification.id)
+            ]
+            db.session.remove()
+
+        return [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+    def _deliver(self, batch):
+        sent, failed = [], {}
+        with self.app.app_context():
+            try:
+                with mail.connect() as conn:
+                    for row in batch:
+                        try:
+                            conn.send(Message(subject=row["subject"], recipients=[row["recipient"]], body=row["body"]))
+                            sent.append(row["id"])
+                        except Exception as e:
+                            failed[row["id"]] = str(e)
+            except Exception as e:
+                # Could not open (or cleanly close) the SMTP connection
+                for row in batch:
+                    if row["id"] not in sent:
+                        failed[row["id"]] = str(e)
+
+            self._record_results(batch, sent, failed)
+            db.session.remove()
+
+        if sent:
+            print(f"✅ Sent {len(sent)} email(s)")
+        for row_id, error in failed.items():
+            print(f"❌ Mail send error for notification {row_id}: {error}")
+
+    def _record_results(self, batch, sent, failed):
+        config = self.app.config
+        now = datetime.utcnow()
+        if sent:
+            db.session.execute(
+                update(Notification)
+                .where(Notification.id.in_(sent))
+                .values(status="sent", sent_at=now, claimed_by=None)
+            )
+        for row in batch:
+            if row["id"] not in failed:
+                continue
+            attempts = row["attempts"] + 1
+            delay = min(
+                config.get("NOTIFY_RETRY_BASE_SECONDS", 30) * 2 ** (attempts - 1),
+                config.get("NOTIFY_RETRY_MAX_SECONDS", 3600),
+            )
+            exhausted = attempts >= config.get("NOTIFY_MAX_ATTEMPTS", 5)
+            db.session.execute(
+                update(Notification)
+                .where(Notification.id == row["id"])
+                .values(
+                    status="failed" if exhausted else "pending",
+                    attempts=attempts,
+                    last_error=failed[row["id"]][:1000],
+                    next_attempt_at=now + timedelta(seconds=delay),
+                    claimed_by=None,
+                )
+            )
+        db.session.commit()
+
+
+def _serving():
+    # CLI commands such as `flask db upgrade` load the app too, possibly
+    # before the outbox exists; only `flask run` and WSGI servers deliver
+    # mail from the start (commits in other commands still wake the dispatcher)
+    ctx = click.get_current_context(silent=True)
+    return ctx is None or ctx.info_name == "run"
+
+
+notifications = NotificationQueue()
+
+
+@event.listens_for(db.session, "after_commit")
+def _wake_after_commit(session):
+    if session.info.pop("notifications_enqueued", False):
+        current_app.extensions["notifications"].wake()
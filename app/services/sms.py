@@ -1,19 +1,166 @@
-import os
-from twilio.rest import Client
+import atexit
+import queue
+import threading
+import time
 
-def send_sms(phone, message):
-    # If Twilio configured, attempt to send; otherwise log to console.
-    account = os.getenv('TWILIO_ACCOUNT_SID')
-    token = os.getenv('TWILIO_AUTH_TOKEN')
-    from_num = os.getenv('TWILIO_FROM_NUMBER')
-    if account and token and from_num and phone:
-        client = Client(account, token)
+
+# ============================
+# TRANSPORTS
+# ============================
+class ConsoleTransport:
+    """Print messages instead of sending them (useful for dev)."""
+
+    def send(self, phone, message):
+        print(f'[SMS-MOCK] to={phone} msg={message}')
+
+
+class MemoryTransport:
+    """Record messages in memory; stands in for Twilio in tests and benchmarks."""
+
+    def __init__(self):
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, phone, message):
+        with self._lock:
+            self.sent.append((phone, message))
+
+
+class TwilioTransport:
+    """Send through one long-lived Twilio client and pooled HTTP session."""
+
+    def __init__(self, account_sid, auth_token, from_number):
+        from twilio.http.http_client import TwilioHttpClient
+        from twilio.rest import Client
+
+        self.from_number = from_number
+        self.client = Client(
+            account_sid, auth_token, http_client=TwilioHttpClient(pool_connections=True)
+        )
+
+    def send(self, phone, message):
+        self.client.messages.create(body=message, from_=self.from_number, to=phone)
+
+
+def _twilio_factory(config):
+    account = config.get('TWILIO_ACCOUNT_SID')
+    token = config.get('TWILIO_AUTH_TOKEN')
+    from_num = config.get('TWILIO_FROM_NUMBER')
+    if account and token and from_num:
+        return TwilioTransport(account, token, from_num)
+    # fallback: Twilio not configured
+    return ConsoleTransport()
+
+
+TRANSPORTS = {
+    'twilio': _twilio_factory,
+    'console': lambda config: ConsoleTransport(),
+    'memory': lambda config: MemoryTransport(),
+}
+
+
+def register_transport(name, factory):
+    """Make `factory(config) -> transport` selectable via `SMS_TRANSPORT`."""
+    TRANSPORTS[name] = factory
+
+
+# ============================
+# GATEWAY
+# ============================
+class SmsGateway:
+    """Process-wide SMS sender configured once from the app config.
+
+    Messages are queued and drained by a single background thread that
+    paces sends to `SMS_RATE_PER_SECOND`, so request handlers never wait on
+    Twilio. With `SMS_ASYNC` disabled messages are sent inline.
+    """
+
+    def __init__(self, app=None):
+        self.transport = None
+        self.async_send = False
+        self.rate = 0
+        self._queue = None
+        self._worker = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        name = config.get('SMS_TRANSPORT', 'twilio')
+        if name not in TRANSPORTS:
+            raise ValueError(f"unknown SMS_TRANSPORT {name!r}; expected one of: {', '.join(sorted(TRANSPORTS))}")
+        self.transport = TRANSPORTS[name](config)
+        self.async_send = config.get('SMS_ASYNC', True)
+        self.rate = config.get('SMS_RATE_PER_SECOND', 1)
+        self._queue = queue.Queue(maxsize=config.get('SMS_QUEUE_SIZE', 10000))
+        app.extensions['sms'] = self
+
+    def send(self, phone, message):
+        if not phone:
+            # nothing to deliver to; keep the old console trace for dev
+            print(f'[SMS-MOCK] to={phone} msg={message}')
+            return True
+
+        if not self.async_send:
+            return self._deliver(phone, message)
+
+        self._ensure_started()
         try:
-            client.messages.create(body=message, from_=from_num, to=phone)
+            self._queue.put_nowait((phone, message))
+        except queue.Full:
+            print('SMS queue full, dropping message to', phone)
+            return False
+        return True
+
+    def send_bulk(self, messages):
+        """Queue an iterable of (phone, message) pairs."""
+        return sum(1 for phone, message in messages if self.send(phone, message))
+
+    def flush(self, timeout=None):
+        """Block until every queued message has been handed to the transport."""
+        if self._worker is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return
+            time.sleep(0.01)
+
+    def _ensure_started(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='sms-sender', daemon=True)
+                self._worker.start()
+                atexit.register(self.flush, timeout=5)
+
+    def _run(self):
+        interval = 1.0 / self.rate if self.rate else 0
+        next_slot = time.monotonic()
+        while True:
+            phone, message = self._queue.get()
+            try:
+                wait = next_slot - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                next_slot = max(next_slot, time.monotonic()) + interval
+                self._deliver(phone, message)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, phone, message):
+        try:
+            self.transport.send(phone, message)
             return True
         except Exception as e:
             print('Twilio error', e)
             return False
-    # fallback: print to console (useful for dev)
-    print(f'[SMS-MOCK] to={phone} msg={message}')
-    return True
+
+
+sms_gateway = SmsGateway()
+
+
+def send_sms(phone, message):
+    return sms_gateway.send(phone, message)
@@ -0,0 +1,238 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, insert, inspect, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from .extensions import db
+from .models import Ticket, TicketStat
+
+RESOLVED_STATUSES = ("resolved", "closed")
+TICKET_STATUSES = ("open", "in_progress", *RESOLVED_STATUSES)
+
+# Rollup dimensions; every ticket contributes one count to each that applies
+STATUS = "status"                  # key: status
+ASSIGNEE_STATUS = "assignee_status"  # key: "<assignee id>:<status>"
+CREATED_DAY = "created_day"        # key: YYYY-MM-DD
+RESOLUTION = "resolution"          # key: "all" or assignee id; total: seconds to resolve
+
+
+def contributions(status, assigned_to, created_at, resolved_at):
+    """Return the {(dimension, key): (count, total)} one ticket adds to the rollup."""
+    rows = {(STATUS, status or "unknown"): (1, 0)}
+    if created_at is not None:
+        rows[(CREATED_DAY, created_at.strftime("%Y-%m-%d"))] = (1, 0)
+    if assigned_to is not None:
+        rows[(ASSIGNEE_STATUS, f"{assigned_to}:{status}")] = (1, 0)
+    if status in RESOLVED_STATUSES and resolved_at is not None and created_at is not None:
+        seconds = max(0, int((resolved_at - created_at).total_seconds()))
+        rows[(RESOLUTION, "all")] = (1, seconds)
+        if assigned_to is not None:
+            rows[(RESOLUTION, str(assigned_to))] = (1, seconds)
+    return rows
+
+
+def _upsert(connection, table):
+    """Dialect INSERT that adds to an existing (dimension, key) row, or None."""
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        module = sqlite if dialect == "sqlite" else postgresql
+        stmt = module.insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.dimension, table.c.key],
+            set_={"count": table.c.count + stmt.excluded.count, "total": table.c.total + stmt.excluded.total},
+        )
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(
+            count=table.c.count + stmt.inserted.count, total=table.c.total + stmt.inserted.total
+        )
+    return None
+
+
+def apply_deltas(connection, deltas):
+    """Add {(dimension, key): (count, total)} to the rollup on `connection`.
+
+    One upsert, so concurrent writers creating the same row cannot collide.
+    """
+    table = TicketStat.__table__
+    rows = [
+        {"dimension": dimension, "key": key, "count": count, "total": total}
+        for (dimension, key), (count, total) in sorted(deltas.items())
+        if count or total
+    ]
+    if not rows:
+        return
+    stmt = _upsert(connection, table)
+    if stmt is not None:
+        connection.execute(stmt, rows)
+        return
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(table.c.dimension == row["dimension"], table.c.key == row["key"])
+            .values(count=table.c.count + row["count"], total=table.c.total + row["total"])
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**row))
+
+
+def _merge(deltas, rows, sign):
+    for dim_key, (count, total) in rows.items():
+        c, t = deltas.get(dim_key, (0, 0))
+        deltas[dim_key] = (c + sign * count, t + sign * total)
+
+
+# ============================
+# INCREMENTAL MAINTENANCE
+# ============================
+_TRACKED = ("status", "assigned_to", "created_at", "resolved_at")
+
+
+# active_history (also set on the assigned_to / created_at / resolved_at
+# columns) loads the previous value even when an expired attribute is
+# overwritten, so the flush hook can always subtract the old contribution
+@event.listens_for(Ticket.status, "set", active_history=True)
+def _stamp_resolved(ticket, value, oldvalue, initiator):
+    if value in RESOLVED_STATUSES and oldvalue not in RESOLVED_STATUSES:
+        ticket.resolved_at = datetime.utcnow()
+    elif value not in RESOLVED_STATUSES:
+        ticket.resolved_at = None
+
+
+
+def _old_values(ticket):
+    state = inspect(ticket)
+    values = []
+    for attr in _TRACKED:
+        history = state.attrs[attr].history
+        old = history.deleted or history.unchanged
+        values.append(old[0] if old else None)
+    return values
+
+
+@event.listens_for(db.session, "after_flush")
+def _update_rollup(session, flush_context):
+    """Apply the flushed tickets' before/after difference in the same transaction."""
+    deltas = {}
+    for ticket in session.new:
+        if isinstance(ticket, Ticket):
+            _merge(deltas, contributions(*(getattr(ticket, a) for a in _TRACKED)), 1)
+    for ticket in session.dirty:
+        if isinstance(ticket, Ticket):
+            state = inspect(ticket)
+            if not any(state.attrs[a].history.has_changes() for a in _TRACKED):
+                continue
+            _merge(deltas, contributions(*_old_values(ticket)), -1)
+            _merge(deltas, contributions(*(getattr(ticket, a) for a in _TRACKED)), 1)
+    for ticket in session.deleted:
+        if isinstance(ticket, Ticket):
+            _merge(deltas, contributions(*_old_values(ticket)), -1)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def apply_ticket_changes(connection, changes):
+    """Update the rollup for tickets written through Core, bypassing the flush hook.
+
+    `changes` holds one (old, new) pair per ticket write, each a
+    (status, assigned_to, created_at, resolved_at) tuple or None for an
+    insert / delete.
+    """
+    deltas = {}
+    for old, new in changes:
+        if old is not None:
+            _merge(deltas, contributions(*old), -1)
+        if new is not None:
+            _merge(deltas, contributions(*new), 1)
+    if deltas:
+        apply_deltas(connection, deltas)
+
+
+# ============================
+# REBUILD
+# ============================
+def rebuild(connection, chunk_size=5000):
+    """Recompute the whole rollup from `tickets`; returns the ticket count.
+
+    For data written through Core (seeding, migrations), which bypasses the
+    flush hook above.
+    """
+    totals = {}
+    seen = 0
+    last_id = 0
+    columns = select(Ticket.id, Ticket.status, Ticket.assigned_to, Ticket.created_at, Ticket.resolved_at)
+    while True:
+        rows = connection.execute(
+            columns.where(Ticket.id > last_id).order_by(Ticket.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            _merge(totals, contributions(*row[1:]), 1)
+        last_id = rows[-1][0]
+        seen += len(rows)
+
+    connection.execute(delete(TicketStat.__table__))
+    if totals:
+        connection.execute(insert(TicketStat.__table__), [
+            {"dimension": d, "key": k, "count": c, "total": t} for (d, k), (c, t) in totals.items()
+        ])
+    return seen
+
+
+# ============================
+# READING
+# ============================
+def _mean(count, total):
+    return round(total / count, 1) if count else None
+
+
+def summary(days=30, today=None):
+    """Assemble the dashboard numbers from the rollup (no ticket scan)."""
+    from .caching import user_info
+
+    today = today or datetime.utcnow().date()
+    first_day = (today - timedelta(days=days - 1)).isoformat()
+    rows = db.session.execute(
+        select(TicketStat.dimension, TicketStat.key, TicketStat.count, TicketStat.total).where(
+            TicketStat.count != 0,
+            (TicketStat.dimension != CREATED_DAY) | (TicketStat.key >= first_day),
+        )
+    ).all()
+
+    by_status, daily = Counter(), Counter()
+    engineers = {}
+    resolution = {}
+    for dimension, key, count, total in rows:
+        if dimension == STATUS:
+            by_status[key] = count
+        elif dimension == CREATED_DAY:
+            daily[key] = count
+        elif dimension == ASSIGNEE_STATUS:
+            assignee, status = key.split(":", 1)
+            engineers.setdefault(int(assignee), Counter())[status] = count
+        elif dimension == RESOLUTION:
+            resolution[key] = (count, total)
+
+    engineer_rows = []
+    for assignee_id, counts in sorted(engineers.items()):
+        info = user_info(assignee_id)
+        resolved = resolution.get(str(assignee_id), (0, 0))
+        engineer_rows.append({
+            "id": assignee_id,
+            "username": info.username if info else None,
+            "by_status": dict(counts),
+            "open": sum(c for s, c in counts.items() if s not in RESOLVED_STATUSES),
+            "resolved": sum(c for s, c in counts.items() if s in RESOLVED_STATUSES),
+            "mean_resolution_seconds": _mean(*resolved),
+        })
+
+    day_list = [(today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+    return {
+        "total": sum(by_status.values()),
+        "by_status": dict(by_status),
+        "mean_resolution_seconds": _mean(*resolution.get("all", (0, 0))),
+        "engineers": engineer_rows,
+        "daily_created": [{"date": day, "count": daily.get(day, 0)} for day in day_list],
+    }
@@ -1,10 +1,19 @@
 from flask import Blueprint, jsonify, request
-from ..models import Ticket, User, Audit
+from ..models import Ticket, User
 from ..extensions import db
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..middleware.decorators import role_required
-from ..schemas import TicketSchema
+from ..schemas import TicketSchema, ticket_list_schema
+from ..caching import user_info
+from ..conditional import TICKET_COLLECTIONS, conditional
+from ..response_cache import response_cache
+from ..routing import read_only
+from ..pagination import PaginationError, get_limit, keyset_paginate, paginated_response
+from ..search import search_ticket_ids
+from ..serializers import serialize
+from ..services.audit import audit_log
 from ..services.email import send_email
+from ..services.events import publish_ticket_event
 from ..services.sms import send_sms
 
 support_bp = Blueprint("support", __name__)
@@ -17,10 +26,51 @@ ticket_schema = TicketSchema()
 @support_bp.route("/open", methods=["GET"])
 @jwt_required()
 @role_required("Admin", "Support Agent")
+@read_only
+@conditional(TICKET_COLLECTIONS)
+@response_cache.cached(lambda role, user_id: ("tickets:status:open", "users"))
 def open_tickets():
     """List all open tickets visible to admins and support staff."""
-    tickets = Ticket.query.filter_by(status="open").order_by(Ticket.created_at.desc()).all()
-    return jsonify(ticket_schema.dump(tickets, many=True)), 200
+    schema, load_options = ticket_list_schema()
+    tickets, next_cursor = keyset_paginate(
+        Ticket.query.options(*load_options).filter_by(status="open"), Ticket
+    )
+    return paginated_response(serialize(schema, tickets), next_cursor)
+
+
+# ============================
+# Full-text search over tickets and messages
+# ============================
+@support_bp.route("/search", methods=["GET"])
+@jwt_required()
+@role_required("Admin", "Support Agent")
+@read_only
+@conditional(TICKET_COLLECTIONS)
+def search_tickets():
+    """Rank tickets whose title, description or messages match `?q=`."""
+    terms = request.args.get("q", "").strip()
+    if not terms:
+        return jsonify({"msg": "q is required"}), 400
+
+    limit = get_limit()
+    # The cursor is the offset of the next page
+    try:
+        offset = int(request.args.get("cursor", 0))
+    except ValueError:
+        raise PaginationError("invalid cursor")
+    if offset < 0:
+        raise PaginationError("invalid cursor")
+
+    # Fetch one extra hit to learn whether another page exists
+    hits = search_ticket_ids(terms, limit + 1, offset)
+    next_cursor = str(offset + limit) if len(hits) > limit else None
+    hits = hits[:limit]
+
+    schema, load_options = ticket_list_schema()
+    ids = [ticket_id for ticket_id, _ in hits]
+    tickets = {t.id: t for t in Ticket.query.options(*load_options).filter(Ticket.id.in_(ids))}
+    ranked = [tickets[i] for i in ids if i in tickets]
+    return paginated_response(serialize(schema, ranked), next_cursor)
 
 
 # ============================
@@ -38,32 +88,39 @@ def assign_ticket(ticket_id):
         return jsonify({"msg": "assignee_id is required"}), 400
 
     ticket = Ticket.query.get_or_404(ticket_id)
-    assignee = User.query.get(int(assignee_id))
+    assignee = user_info(assignee_id)
 
     # Validate assignee is an Engineer
-    if not assignee or assignee.role.name != "Engineer":
+    if not assignee or assignee.role != "Engineer":
         return jsonify({"msg": "assignee must be an Engineer"}), 400
 
+    previous_assignee = ticket.assigned_to
+    previous_status = ticket.status
     ticket.assigned_to = assignee.id
     ticket.status = "in_progress"
     db.session.add(ticket)
 
     # Add audit log
-    audit = Audit(
-        action="assign",
-        user_id=int(get_jwt_identity()),
+    audit_log.record(
+        "assign",
+        int(get_jwt_identity()),
+        "ticket",
+        ticket.id,
+        old_values={"assigned_to": previous_assignee, "status": previous_status},
+        new_values={"assigned_to": assignee.id, "status": ticket.status},
         details=f"Ticket {ticket.id} assigned to user {assignee.id}",
     )
-    db.session.add(audit)
-    db.session.commit()
 
-    # Notify assignee (best-effort)
+    # Notify assignee (queued in the outbox, delivered after commit)
     if assignee.email:
         send_email(
             assignee.email,
             "Ticket Assigned",
             f"You have been assigned ticket: {ticket.title}",
         )
+    db.session.commit()
+    publish_ticket_event("ticket.assigned", ticket, previous_assignee)
+
     send_sms(None, f"You have been assigned ticket: {ticket.title}")
 
     return jsonify(ticket_schema.dump(ticket)), 200
@@ -84,22 +141,25 @@ def resolve_ticket(ticket_id):
     if ticket.assigned_to != current_user_id:
         return jsonify({"msg": "Only the assigned engineer can resolve this ticket"}), 403
 
+    previous_status = ticket.status
     ticket.status = "resolved"
     db.session.add(ticket)
 
     # Audit log
-    audit = Audit(
-        action="resolve",
-        user_id=current_user_id,
+    audit_log.record(
+        "resolve",
+        current_user_id,
+        "ticket",
+        ticket.id,
+        old_values={"status": previous_status},
+        new_values={"status": ticket.status},
         details=f"Ticket {ticket.id} marked as resolved",
     )
-    db.session.add(audit)
-    db.session.commit()
 
     # Notify creator + admin + support
     recipients = set()
     if ticket.created_by:
-        creator = User.query.get(ticket.created_by)
+        creator = user_info(ticket.created_by)
         if creator and creator.email:
             recipients.add(creator.email)
 
@@ -109,11 +169,14 @@ def resolve_ticket(ticket_id):
         if u.email:
             recipients.add(u.email)
 
-    for email in recipients:
-        send_email(
-            email,
-            f"Ticket Resolved: {ticket.title}",
-            f"The ticket '{ticket.title}' has been resolved by {User.query.get(current_user_id).username}."
-        )
+    # One outbox row per recipient, committed with the status change
+    resolver = user_info(current_user_id)
+    send_email(
+        sorted(recipients),
+        f"Ticket Resolved: {ticket.title}",
+        f"The ticket '{ticket.title}' has been resolved by {resolver.username}."
+    )
+    db.session.commit()
+    publish_ticket_event("ticket.resolved", ticket)
 
     return jsonify(ticket_schema.dump(ticket)), 200
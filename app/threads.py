@@ -0,0 +1,75 @@
+from sqlalchemy import event, func, or_, select, update
+
+from .extensions import db
+from .models import Ticket, TicketMessage
+
+tickets = Ticket.__table__
+messages = TicketMessage.__table__
+
+# Ticket columns summarising its thread
+SUMMARY = ("message_count", "last_message_id", "last_message_at", "last_message_by")
+
+
+# ============================
+# THREAD SUMMARY
+# ============================
+def _added(connection, ticket_id, count, last):
+    # The count is incremented in SQL so concurrent posts are not lost
+    connection.execute(
+        update(tickets).where(tickets.c.id == ticket_id)
+        .values(message_count=tickets.c.message_count + count)
+    )
+    connection.execute(
+        update(tickets)
+        .where(tickets.c.id == ticket_id,
+               or_(tickets.c.last_message_id.is_(None), tickets.c.last_message_id < last.id))
+        .values(last_message_id=last.id, last_message_at=last.created_at, last_message_by=last.sender_id)
+    )
+
+
+def recount(connection, ticket_ids):
+    """Recompute the summary of `ticket_ids` from their messages."""
+    for ticket_id in ticket_ids:
+        last = connection.execute(
+            select(messages.c.id, messages.c.created_at, messages.c.sender_id)
+            .where(messages.c.ticket_id == ticket_id)
+            .order_by(messages.c.id.desc()).limit(1)
+        ).first()
+        connection.execute(
+            update(tickets).where(tickets.c.id == ticket_id).values(
+                message_count=select(func.count()).where(messages.c.ticket_id == ticket_id).scalar_subquery(),
+                last_message_id=last.id if last else None,
+                last_message_at=last.created_at if last else None,
+                last_message_by=last.sender_id if last else None,
+            )
+        )
+
+
+@event.listens_for(db.session, "after_flush")
+def _update_summaries(session, flush_context):
+    """Keep message_count / last_message_* in step with every flushed message."""
+    added, removed = {}, set()
+    for obj in session.new:
+        if isinstance(obj, TicketMessage) and obj.ticket_id is not None:
+            count, last = added.get(obj.ticket_id, (0, obj))
+            added[obj.ticket_id] = (count + 1, obj if obj.id > last.id else last)
+    for obj in session.deleted:
+        if isinstance(obj, TicketMessage) and obj.ticket_id is not None:
+            removed.add(obj.ticket_id)
+    if not (added or removed):
+        return
+    connection = session.connection()
+    for ticket_id, (count, last) in sorted(added.items()):
+        if ticket_id not in removed:
+            _added(connection, ticket_id, count, last)
+    recount(connection, sorted(removed))
+    session.info.setdefault("stale_thread_summaries", set()).update(added, removed)
+
+
+@event.listens_for(db.session, "after_flush_postexec")
+def _expire_summaries(session, flush_context):
+    # The rows were updated in SQL; reload the columns on next access
+    for ticket_id in session.info.pop("stale_thread_summaries", ()):
+        ticket = session.identity_map.get(session.identity_key(Ticket, ticket_id))
+        if ticket is not None:
+            session.expire(ticket, SUMMARY)
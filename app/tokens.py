@@ -0,0 +1,217 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .caching import role_by_id
+from .extensions import db, jwt
+from .models import TokenRevocation, User
+
+# Each sync re-reads rows this far back, so a revocation whose transaction
+# committed after a later-stamped one is not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _epoch(value):
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class TokenDenylist:
+    """In-memory mirror of `token_revocations`, consulted for every JWT.
+
+    A check is a few dict lookups. Every `TOKEN_DENYLIST_SYNC_SECONDS` one
+    request reads the rows created since the previous sync, so revocations
+    made by other workers apply within that interval and this worker's own
+    apply as soon as they commit. Entries are dropped once the tokens they
+    cover have expired, which keeps the structure as small as the number of
+    recent revocations.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.sync_seconds = 5
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.clear()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.sync_seconds = app.config.get("TOKEN_DENYLIST_SYNC_SECONDS", 5)
+        self.clear()
+        jwt.token_in_blocklist_loader(self._blocklist_loader)
+        app.extensions["token_denylist"] = self
+
+    def clear(self):
+        with self._lock:
+            self._jtis = {}      # jti -> expires (epoch seconds)
+            self._versions = {}  # user id -> (lowest valid `ver`, expires)
+            self._deleted = {}   # user id -> (deleted at, expires)
+            self._synced_through = None
+            self._next_sync = 0.0
+
+    # ============================
+    # CHECK
+    # ============================
+    def is_revoked(self, payload):
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        if payload.get("jti") in self._jtis:
+            return True
+        try:
+            user_id = int(payload.get("sub"))
+        except (TypeError, ValueError):
+            return False
+        entry = self._versions.get(user_id)
+        if entry and payload.get("ver", 0) < entry[0]:
+            return True
+        entry = self._deleted.get(user_id)
+        return bool(entry and payload.get("iat", 0) < entry[0])
+
+    def _blocklist_loader(self, jwt_header, jwt_payload):
+        return self.is_revoked(jwt_payload)
+
+    # ============================
+    # SYNC
+    # ============================
+    def sync(self):
+        """Load revocations created since the last sync and drop expired ones."""
+        # Until the first load every request waits for it; afterwards one
+        # request syncs while the others keep using the current entries
+        if not self._sync_lock.acquire(blocking=self._synced_through is None):
+            return
+        try:
+            if self._synced_through is not None and time.monotonic() < self._next_sync:
+                return
+            started = datetime.utcnow()
+            query = select(
+                TokenRevocation.user_id, TokenRevocation.jti, TokenRevocation.min_version,
+                TokenRevocation.created_at, TokenRevocation.expires_at,
+            ).where(TokenRevocation.expires_at > started)
+            if self._synced_through is not None:
+                query = query.where(TokenRevocation.created_at >= self._synced_through - SYNC_OVERLAP)
+            try:
+                with db.engine.connect() as connection:
+                    rows = connection.execute(query).all()
+            except SQLAlchemyError as e:
+                current_app.logger.warning("Token denylist sync failed: %s", e)
+                self._next_sync = time.monotonic() + self.sync_seconds
+                return
+            self.apply(rows)
+            self._prune(_epoch(started))
+            self._synced_through = started
+            self._next_sync = time.monotonic() + self.sync_seconds
+        finally:
+            self._sync_lock.release()
+
+    def apply(self, rows):
+        """Merge (user_id, jti, min_version, created_at, expires_at) rows."""
+        with self._lock:
+            for user_id, jti, min_version, created_at, expires_at in rows:
+                expires = _epoch(expires_at)
+                if jti:
+                    self._jtis[jti] = expires
+                    continue
+                table, value = (
+                    (self._versions, min_version) if min_version is not None
+                    else (self._deleted, _epoch(created_at))
+                )
+                current = table.get(user_id)
+                if current:
+                    value, expires = max(value, current[0]), max(expires, current[1])
+                table[user_id] = (value, expires)
+
+    def _prune(self, now):
+        with self._lock:
+            for table in (self._jtis, self._versions, self._deleted):
+                for key in [k for k, v in table.items() if (v if isinstance(v, float) else v[1]) <= now]:
+                    del table[key]
+
+    def stats(self):
+        return {"jtis": len(self._jtis), "users": len(self._versions), "deleted_users": len(self._deleted)}
+
+
+token_denylist = TokenDenylist()
+
+
+# ============================
+# ISSUING
+# ============================
+def issue_tokens(user, refresh=True):
+    """Access (and refresh) token for `user` with its `role` and `ver` claims."""
+    role = role_by_id(user.role_id)
+    version = user.token_version or 0
+    tokens = {
+        "access_token": create_access_token(
+            identity=str(user.id), additional_claims={"role": role.name if role else None, "ver": version}
+        )
+    }
+    if refresh:
+        tokens["refresh_token"] = create_refresh_token(identity=str(user.id), additional_claims={"ver": version})
+    return tokens
+
+
+# ============================
+# REVOKING
+# ============================
+def _longest_lifetime():
+    config = current_app.config
+    return max(config["JWT_ACCESS_TOKEN_EXPIRES"], config["JWT_REFRESH_TOKEN_EXPIRES"])
+
+
+def revoke_user_tokens(user, session=None):
+    """Invalidate every token issued to `user` so far (commits with the session)."""
+    now = datetime.utcnow()
+    user.token_version = (user.token_version or 0) + 1
+    (session or db.session).add(TokenRevocation(
+        user_id=user.id, min_version=user.token_version,
+        created_at=now, expires_at=now + _longest_lifetime(),
+    ))
+
+
+def revoke_token(payload):
+    """Deny one token by its `jti` until it expires, and purge expired entries."""
+    now = datetime.utcnow()
+    db.session.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= now))
+    db.session.add(TokenRevocation(
+        user_id=int(payload["sub"]), jti=payload["jti"],
+        created_at=now, expires_at=datetime.utcfromtimestamp(payload["exp"]),
+    ))
+
+
+@event.listens_for(db.session, "before_flush")
+def _revoke_changed_users(session, flush_context, instances):
+    # Tokens carry the role name, so a role change must retire them
+    for obj in list(session.dirty):
+        if isinstance(obj, User) and inspect(obj).attrs.role_id.history.has_changes():
+            revoke_user_tokens(obj, session)
+    for obj in list(session.deleted):
+        if isinstance(obj, User):
+            now = datetime.utcnow()
+            session.add(TokenRevocation(user_id=obj.id, created_at=now, expires_at=now + _longest_lifetime()))
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_revocations(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, TokenRevocation):
+            session.info.setdefault("token_revocations", []).append(
+                (obj.user_id, obj.jti, obj.min_version, obj.created_at, obj.expires_at)
+            )
+
+
+@event.listens_for(db.session, "after_commit")
+def _apply_committed(session):
+    rows = session.info.pop("token_revocations", None)
+    if rows:
+        token_denylist.apply(rows)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop("token_revocations", None)
@@ -0,0 +1,153 @@
+# benchmarks/bench_concurrency.py
+"""Measure write throughput with several worker processes on one SQLite file.
+
+    python benchmarks/bench_concurrency.py --workers 8 --seconds 10
+    python benchmarks/bench_concurrency.py --users 500 --tickets 5000 --output concurrency.json
+
+Each worker process runs its own app, like a gunicorn worker, and loops
+over ticket writes (create, update, post message) for --seconds. The same
+seeded database is run twice: once with SQLite defaults (rollback journal,
+no PRAGMAs) and once with the engine tuning from app/database.py (WAL,
+synchronous=NORMAL, busy timeout, cache and mmap). Failed requests, which
+are usually "database is locked", are counted per error type.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from harness import build_app, login, seed, summarize, username_for
+
+from app.extensions import db
+from app.models import Ticket
+
+# SQLite's own behaviour: rollback journal, full sync, driver timeout only
+DEFAULTS = {
+    "DB_SQLITE_JOURNAL_MODE": "delete",
+    "DB_SQLITE_SYNCHRONOUS": "full",
+    "DB_SQLITE_BUSY_TIMEOUT_MS": 0,
+    "DB_SQLITE_CACHE_SIZE_KB": 0,
+    "DB_SQLITE_MMAP_SIZE": 0,
+}
+RUNS = {"defaults": DEFAULTS, "tuned": {}}
+
+
+def write_requests(ticket_ids, rng):
+    """Endless mix of the writes agents and customers make."""
+    while True:
+        tid = rng.choice(ticket_ids)
+        yield "User", "POST", "/customers/tickets", {"json": {"title": "bench", "description": "concurrency"}}
+        yield "Admin", "PATCH", f"/admin/tickets/{tid}", {"json": {"title": f"bench {rng.random():.6f}"}}
+        yield "Admin", "POST", f"/customers/tickets/{tid}/messages", {"json": {"message": "bench reply"}}
+
+
+def worker(uri, overrides, credentials, ticket_ids, start_at, seconds, n, results):
+    app = build_app(uri, **overrides)
+    client = app.test_client()
+    headers = {role: login(client, username, password) for role, (username, password) in credentials.items()}
+    rng = random.Random(n)
+
+    latencies, statuses, errors = [], [], {}
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.time() + seconds
+    for role, method, url, kwargs in write_requests(ticket_ids, rng):
+        if time.time() >= deadline:
+            break
+        t0 = time.perf_counter()
+        try:
+            resp = client.open(url, method=method, headers=headers[role], **kwargs)
+            statuses.append(resp.status_code)
+        except Exception as e:  # TESTING propagates errors such as "database is locked"
+            db.session.remove()
+            statuses.append(500)
+            key = f"{type(e).__name__}: {str(e).splitlines()[0][:80]}"
+            errors[key] = errors.get(key, 0) + 1
+        latencies.append((time.perf_counter() - t0) * 1000)
+    results.put((latencies, statuses, errors))
+
+
+def run(template, name, overrides, credentials, ticket_ids, workers, seconds):
+    path = os.path.join(tempfile.mkdtemp(prefix=f"crm-{name}-"), "bench.db")
+    shutil.copy(template, path)
+    uri = f"sqlite:///{path}"
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    start_at = time.time() + 5  # let every worker import and log in first
+    procs = [
+        ctx.Process(target=worker, args=(uri, overrides, credentials, ticket_ids, start_at, seconds, n, results))
+        for n in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    latencies, statuses, errors = [], [], {}
+    for _ in procs:
+        lat, st, err = results.get()
+        latencies += lat
+        statuses += st
+        for key, count in err.items():
+            errors[key] = errors.get(key, 0) + count
+    for p in procs:
+        p.join()
+
+    report = summarize(name, latencies, 0, statuses, 0, seconds)
+    report["ok_per_second"] = round(sum(1 for s in statuses if s < 400) / seconds, 1)
+    report["errors"] = errors
+    del report["queries_per_request"], report["bytes_per_response"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    # Seed once in rollback-journal mode so the file can simply be copied
+    template = os.path.join(tempfile.mkdtemp(prefix="crm-concurrency-"), "template.db")
+    app = build_app(f"sqlite:///{template}", **DEFAULTS)
+    print(f"Seeding {args.users:,} users / {args.tickets:,} tickets...", file=sys.stderr)
+    summary = seed(app, args.users, args.tickets, seed=args.seed)
+    credentials = {
+        role: (username_for(role, summary["user_ids"][role][0]), summary["passwords"][role])
+        for role in ("Admin", "User")
+    }
+    with app.app_context():
+        ticket_ids = [tid for (tid,) in db.session.query(Ticket.id).limit(1000)]
+        db.engine.dispose()
+
+    report = {"meta": {"dataset": {k: summary[k] for k in ("users", "tickets")},
+                       "workers": args.workers, "seconds": args.seconds}}
+    header = f"{'run':<10} {'requests':>9} {'ok/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>9} {'errors':>7}"
+    print(header, file=sys.stderr)
+    print("-" * len(header), file=sys.stderr)
+    for name, overrides in RUNS.items():
+        r = run(template, name, overrides, credentials, ticket_ids, args.workers, args.seconds)
+        report[name] = r
+        print(
+            f"{name:<10} {r['requests']:>9} {r['ok_per_second']:>8.1f} {r['p50_ms']:>8.2f} "
+            f"{r['p95_ms']:>8.2f} {r['p99_ms']:>9.2f} {sum(r['errors'].values()):>7}",
+            file=sys.stderr,
+        )
+        for error, count in r["errors"].items():
+            print(f"{'':<10} {count:>9}  {error}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
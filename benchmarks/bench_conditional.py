@@ -0,0 +1,118 @@
+# benchmarks/bench_conditional.py
+"""Compare repeated dashboard loads with and without ETag revalidation.
+
+    python benchmarks/bench_conditional.py --users 2000 --tickets 50000 --loads 100
+    python benchmarks/bench_conditional.py --write-every 10 --output conditional.json
+
+Each "load" fetches the endpoints an agent dashboard polls. The plain run
+sends no validators; the conditional run replays the last ETag per URL in
+If-None-Match, as a browser does. With --write-every N one ticket is
+updated every N loads so part of the conditional requests miss.
+"""
+import argparse
+import json
+import sys
+import time
+
+from harness import QueryCounter, build_app, login, seed, summarize, username_for
+
+from app.extensions import db
+from app.models import Ticket
+
+DASHBOARD = {
+    "Admin": ["/admin/tickets", "/admin/users"],
+    "Support Agent": ["/support/open"],
+    "Engineer": ["/engineer/my-assigned"],
+    "User": ["/customers/tickets"],
+}
+
+
+def touch_ticket(app, ticket_id, n):
+    with app.app_context():
+        db.session.get(Ticket, ticket_id).title = f"bench touch {n}"
+        db.session.commit()
+
+
+def run(app, client, headers, loads, write_every, ticket_id, conditional):
+    counter = QueryCounter(app)
+    etags = {}
+    samples = {}
+    try:
+        for n in range(loads):
+            if write_every and n and n % write_every == 0:
+                touch_ticket(app, ticket_id, n)
+            for role, urls in DASHBOARD.items():
+                for url in urls:
+                    request_headers = dict(headers[role])
+                    if conditional and url in etags:
+                        request_headers["If-None-Match"] = etags[url]
+                    counter.count = 0
+                    t0 = time.perf_counter()
+                    resp = client.get(url, headers=request_headers)
+                    body = resp.get_data()
+                    elapsed = (time.perf_counter() - t0) * 1000
+                    if resp.headers.get("ETag"):
+                        etags[url] = resp.headers["ETag"]
+
+                    s = samples.setdefault(url, {"lat": [], "queries": 0, "statuses": [], "bytes": 0, "time": 0.0})
+                    s["lat"].append(elapsed)
+                    s["queries"] += counter.count
+                    s["statuses"].append(resp.status_code)
+                    s["bytes"] += len(body)
+                    s["time"] += elapsed / 1000
+    finally:
+        counter.close()
+    return [
+        summarize(url, s["lat"], s["queries"], s["statuses"], s["bytes"], s["time"])
+        for url, s in samples.items()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--loads", type=int, default=50, help="dashboard loads per run")
+    parser.add_argument("--write-every", type=int, default=0, help="update a ticket every N loads")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-uri")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    app = build_app(args.database_uri)
+    print(f"Seeding {args.users:,} users / {args.tickets:,} tickets...", file=sys.stderr)
+    summary = seed(app, args.users, args.tickets, seed=args.seed)
+    client = app.test_client()
+    headers = {
+        role: login(client, username_for(role, ids[0]), summary["passwords"][role])
+        for role, ids in summary["user_ids"].items()
+    }
+    with app.app_context():
+        ticket_id = db.session.query(Ticket.id).order_by(Ticket.id.desc()).limit(1).scalar()
+
+    report = {"meta": {"dataset": {k: summary[k] for k in ("users", "tickets")},
+                       "loads": args.loads, "write_every": args.write_every}}
+    header = f"{'run':<12} {'endpoint':<24} {'p50 ms':>8} {'mean ms':>8} {'queries':>8} {'bytes':>9} {'304s':>5}"
+    print(header, file=sys.stderr)
+    print("-" * len(header), file=sys.stderr)
+    for name, conditional in (("plain", False), ("conditional", True)):
+        results = run(app, client, headers, args.loads, args.write_every, ticket_id, conditional)
+        report[name] = results
+        for r in results:
+            print(
+                f"{name:<12} {r['endpoint']:<24} {r['p50_ms']:>8.2f} {r['mean_ms']:>8.2f} "
+                f"{r['queries_per_request']:>8.2f} {r['bytes_per_response']:>9} "
+                f"{r['status_codes'].get('304', 0):>5}",
+                file=sys.stderr,
+            )
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_password_hash.py
+"""Time hash + verify for candidate PASSWORD_HASH_METHOD values.
+
+    python benchmarks/bench_password_hash.py --rounds 20
+    python benchmarks/bench_password_hash.py --method pbkdf2:sha256:600000 --method argon2
+
+Also measures login-style verification through the process pool with
+PASSWORD_VERIFY_WORKERS workers running concurrently.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.passwords import PasswordHasher, hash_password, verify_password  # noqa: E402
+
+DEFAULT_METHODS = ["scrypt:32768:8:1", "scrypt:16384:8:1", "pbkdf2:sha256:600000", "argon2"]
+
+
+def _time(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_method(method, rounds):
+    pwhash = hash_password("correct horse", method=method)
+    return {
+        "method": method,
+        "hash_ms": _time(lambda: hash_password("correct horse", method=method), rounds),
+        "verify_ms": _time(lambda: verify_password(pwhash, "correct horse"), rounds),
+    }
+
+
+def bench_pool(method, workers, logins):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    pwhash = hash_password("correct horse", method=method)
+    results = {}
+    for label, executor in (
+        ("threads (GIL-bound)", ThreadPoolExecutor(max_workers=workers)),
+        # Spawned like the app's pool; the warm-up below starts the processes
+        (f"process pool x{workers}", ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )),
+    ):
+        with executor:
+            list(executor.map(verify_password, [pwhash] * workers, ["correct horse"] * workers))
+            start = time.perf_counter()
+            list(executor.map(verify_password, [pwhash] * logins, ["correct horse"] * logins))
+            results[label] = logins / (time.perf_counter() - start)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--method", action="append", help="method to test (repeatable)")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args()
+
+    methods = args.method or DEFAULT_METHODS
+    print(f"{'method':<24} {'hash ms':>9} {'verify ms':>10}")
+    for method in methods:
+        if method == "argon2" and PasswordHasher is None:
+            print(f"{method:<24} {'skipped (argon2-cffi not installed)':>20}")
+            continue
+        r = bench_method(method, args.rounds)
+        print(f"{r['method']:<24} {r['hash_ms']:>9.1f} {r['verify_ms']:>10.1f}")
+
+    print(f"\nConcurrent verification of {args.logins} logins ({methods[0]}):")
+    for label, rate in bench_pool(methods[0], args.workers, args.logins).items():
+        print(f"  {label:<24} {rate:8.1f} logins/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_ratelimit.py
+"""Measure the rate limiter's own cost and what it saves under a login flood.
+
+    python benchmarks/bench_ratelimit.py --checks 100000
+    python benchmarks/bench_ratelimit.py --flood 300 --output ratelimit.json
+
+Three parts:
+- store: microseconds per limit check for each store and algorithm, over
+  --keys distinct keys (memory is bounded to --keys / 2 to include eviction);
+- overhead: latency of allowed /auth/login requests with the limiter off and
+  on (limits set too high to trigger), using a cheap password hash so the
+  limiter's share is visible;
+- flood: --flood wrong-password logins for one username with the production
+  hash (PASSWORD_HASH_METHOD), limiter off vs on. Reports CPU seconds spent,
+  SQL queries run and how many requests were turned away with 429.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from harness import QueryCounter, build_app, seed, summarize, timed_requests, username_for
+
+from app.config import Config
+from app.middleware.ratelimit import ALGORITHMS, BACKENDS
+
+UNLIMITED = {
+    "RATELIMIT_LOGIN_PER_IP": "1000000/minute",
+    "RATELIMIT_LOGIN_PER_USERNAME": "1000000/minute",
+}
+
+
+def bench_stores(checks, keys):
+    results = []
+    for backend in BACKENDS:
+        config = {
+            "RATELIMIT_MEMORY_SIZE": keys // 2,
+            "RATELIMIT_SQLITE_PATH": os.path.join(tempfile.mkdtemp(prefix="crm-ratelimit-"), "ratelimit.db"),
+        }
+        store = BACKENDS[backend](config)
+        for name, algorithm in ALGORITHMS.items():
+            rng = random.Random(42)
+            names = [f"{name}:auth.login:10.0.{i // 256}.{i % 256}" for i in range(keys)]
+            n = checks if backend == "memory" else max(1, checks // 20)
+            rejected = 0
+            started = time.perf_counter()
+            for _ in range(n):
+                allowed, _ = store.hit(rng.choice(names), algorithm, 30, 60.0, time.time())
+                rejected += not allowed
+            elapsed = time.perf_counter() - started
+            results.append({
+                "store": backend, "algorithm": name, "checks": n,
+                "us_per_check": round(elapsed / n * 1e6, 2), "rejected": rejected,
+                "keys_held": store.size(),
+            })
+    return results
+
+
+def bench_overhead(requests, users):
+    results = []
+    for enabled in (False, True):
+        app = build_app(RATELIMIT_ENABLED=enabled, **UNLIMITED)
+        summary = seed(app, users, 0)
+        username = username_for("User", summary["user_ids"]["User"][0])
+        body = {"username": username, "password": summary["passwords"]["User"]}
+        client = app.test_client()
+        counter = QueryCounter(app)
+        try:
+            run = timed_requests(client, counter, [("POST", "/auth/login", {"json": body})] * requests)
+        finally:
+            counter.close()
+        results.append(summarize(f"login (limiter {'on' if enabled else 'off'})", *run))
+    return results
+
+
+def bench_flood(attempts, users):
+    results = []
+    for enabled in (False, True):
+        # The production hash, so each admitted attempt costs what it would live
+        app = build_app(RATELIMIT_ENABLED=enabled, PASSWORD_HASH_METHOD=Config.PASSWORD_HASH_METHOD)
+        summary = seed(app, users, 0)
+        body = {"username": username_for("User", summary["user_ids"]["User"][0]), "password": "wrong"}
+        client = app.test_client()
+        counter = QueryCounter(app)
+        cpu = time.process_time()
+        try:
+            run = timed_requests(client, counter, [("POST", "/auth/login", {"json": body})] * attempts)
+        finally:
+            counter.close()
+        report = summarize(f"flood (limiter {'on' if enabled else 'off'})", *run)
+        report["cpu_seconds"] = round(time.process_time() - cpu, 3)
+        results.append(report)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=100000, help="limit checks per memory-store run")
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=500, help="allowed logins per overhead run")
+    parser.add_argument("--flood", type=int, default=200, help="wrong-password logins per flood run")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {"stores": bench_stores(args.checks, args.keys)}
+    print(f"{'store':<8} {'algorithm':<15} {'checks':>8} {'us/check':>9} {'keys':>7}", file=sys.stderr)
+    for r in report["stores"]:
+        print(f"{r['store']:<8} {r['algorithm']:<15} {r['checks']:>8} {r['us_per_check']:>9.2f} {r['keys_held']:>7}",
+              file=sys.stderr)
+
+    report["overhead"] = bench_overhead(args.requests, args.users)
+    report["flood"] = bench_flood(args.flood, args.users)
+    print(f"\n{'run':<22} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'cpu s':>7}  statuses", file=sys.stderr)
+    for r in report["overhead"] + report["flood"]:
+        print(f"{r['endpoint']:<22} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} {r['queries_per_request']:>8} "
+              f"{r.get('cpu_seconds', ''):>7}  {r['status_codes']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
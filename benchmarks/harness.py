@@ -0,0 +1,122 @@
+# benchmarks/harness.py
+"""Shared helpers for the HTTP benchmarks: app factory, seeding, timing."""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.seeding import generate_dataset  # noqa: E402
+
+
+def build_app(database_uri=None, **overrides):
+    """Create an app on a throwaway SQLite file unless a URI is given."""
+    if database_uri is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="crm-bench-"), "bench.db")
+        database_uri = f"sqlite:///{path}"
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        TESTING = True
+        NOTIFY_WORKERS = 0
+        SMS_TRANSPORT = "memory"
+        SMS_ASYNC = False
+        # Benchmarks measure the app, not password hashing
+        PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+        # Every benchmark request comes from the same client address
+        RATELIMIT_ENABLED = False
+
+    for key, value in overrides.items():
+        setattr(BenchConfig, key, value)
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        # Only the primary gets the schema; a replica bind is read-only
+        db.create_all(bind_key=None)
+    return app
+
+
+def seed(app, users, tickets, messages_per_ticket=2, seed=42, quiet=True):
+    echo = (lambda *_: None) if quiet else print
+    with app.app_context():
+        return generate_dataset(
+            users=users, tickets=tickets, messages_per_ticket=messages_per_ticket,
+            seed=seed, reset=True, echo=echo,
+        )
+
+
+def username_for(role, user_id):
+    return f"{role.split()[0].lower()}{user_id}"
+
+
+def login(client, username, password):
+    resp = client.post("/auth/login", json={"username": username, "password": password})
+    if resp.status_code != 200:
+        raise RuntimeError(f"login failed for {username}: {resp.status_code} {resp.get_data(as_text=True)}")
+    return {"Authorization": f"Bearer {resp.get_json()['access_token']}"}
+
+
+class QueryCounter:
+    """Count SQL statements issued through the app's engine(s)."""
+
+    def __init__(self, app):
+        self.count = 0
+        with app.app_context():
+            self.engines = list(db.engines.values())
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def close(self):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(name, latencies_ms, queries, statuses, response_bytes, elapsed):
+    n = len(latencies_ms)
+    return {
+        "endpoint": name,
+        "requests": n,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "throughput_rps": round(n / elapsed, 1) if elapsed else None,
+        "queries_per_request": round(queries / n, 2),
+        "bytes_per_response": round(response_bytes / n),
+        "status_codes": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+    }
+
+
+def timed_requests(client, counter, requests):
+    """Issue `requests` (an iterable of (method, url, kwargs)) and time each."""
+    latencies, statuses = [], []
+    queries = response_bytes = 0
+    started = time.perf_counter()
+    for method, url, kwargs in requests:
+        counter.count = 0
+        t0 = time.perf_counter()
+        resp = client.open(url, method=method, **kwargs)
+        body = resp.get_data()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        queries += counter.count
+        statuses.append(resp.status_code)
+        response_bytes += len(body)
+    return latencies, queries, statuses, response_bytes, time.perf_counter() - started
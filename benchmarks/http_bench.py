@@ -0,0 +1,246 @@
+# benchmarks/http_bench.py
+"""Drive every blueprint endpoint against a seeded dataset and report latency.
+
+    python benchmarks/http_bench.py --users 2000 --tickets 100000 --requests 200 \
+        --output bench.json
+    python benchmarks/http_bench.py --only 'admin.*' --only support.open_tickets
+
+For each endpoint the JSON report holds p50/p95/p99/mean latency, sequential
+throughput, SQL queries per request and response size, so two runs can be
+diffed between releases. A human-readable table is printed to stderr.
+"""
+import argparse
+import fnmatch
+import itertools
+import json
+import platform
+import sys
+from datetime import datetime
+
+from harness import (
+    QueryCounter, build_app, login, seed, summarize, timed_requests, username_for,
+)
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Ticket, User
+
+_serial = itertools.count()
+
+
+def _uid():
+    return f"{datetime.utcnow():%H%M%S}{next(_serial)}"
+
+
+# ============================
+# FIXTURES
+# ============================
+def make_users(ctx, n):
+    with ctx["app"].app_context():
+        ids = []
+        for _ in range(n):
+            name = f"bench{_uid()}"
+            ids.append(db.session.execute(insert(User).values(
+                username=name, email=f"{name}@example.com",
+                password_hash="!", role_id=ctx["role_ids"]["User"],
+            )).inserted_primary_key[0])
+        db.session.commit()
+        return ids
+
+
+def make_tickets(ctx, n, status="open", assigned_to=None):
+    with ctx["app"].app_context():
+        ids = []
+        for _ in range(n):
+            ids.append(db.session.execute(insert(Ticket).values(
+                title=f"bench {_uid()}", description="benchmark fixture", status=status,
+                created_by=ctx["users"]["User"], assigned_to=assigned_to,
+            )).inserted_primary_key[0])
+        db.session.commit()
+        return ids
+
+
+# ============================
+# SCENARIOS
+# ============================
+# Each builder returns (role whose token is used, list of (method, url, kwargs))
+def _repeat(method, url, n, **kwargs):
+    return [(method, url, kwargs)] * n
+
+
+SCENARIOS = {
+    "auth.register": lambda ctx, n: (None, [
+        ("POST", "/auth/register", {"json": {
+            "username": f"reg{u}", "email": f"reg{u}@example.com", "password": "pw"}})
+        for u in (_uid() for _ in range(n))
+    ]),
+    "auth.login": lambda ctx, n: (None, _repeat(
+        "POST", "/auth/login", n, json={"username": ctx["usernames"]["User"], "password": ctx["passwords"]["User"]})),
+
+    "admin.list_users": lambda ctx, n: ("Admin", _repeat("GET", "/admin/users", n)),
+    "admin.get_user": lambda ctx, n: ("Admin", _repeat("GET", f"/admin/users/{ctx['users']['User']}", n)),
+    "admin.create_user": lambda ctx, n: ("Admin", [
+        ("POST", "/admin/users", {"json": {
+            "username": f"adm{u}", "email": f"adm{u}@example.com", "password": "pw",
+            "role_id": ctx["role_ids"]["User"]}})
+        for u in (_uid() for _ in range(n))
+    ]),
+    "admin.update_user": lambda ctx, n: ("Admin", [
+        ("PATCH", f"/admin/users/{uid}", {"json": {"email": f"upd{_uid()}@example.com"}})
+        for uid in make_users(ctx, n)
+    ]),
+    "admin.delete_user": lambda ctx, n: ("Admin", [
+        ("DELETE", f"/admin/users/{uid}", {}) for uid in make_users(ctx, n)
+    ]),
+    "admin.list_all_tickets": lambda ctx, n: ("Admin", _repeat("GET", "/admin/tickets", n)),
+    "admin.get_ticket": lambda ctx, n: ("Admin", _repeat("GET", f"/admin/tickets/{ctx['ticket_id']}", n)),
+    "admin.create_ticket_admin": lambda ctx, n: ("Admin", _repeat(
+        "POST", "/admin/tickets", n, json={"title": "bench", "description": "created by benchmark"})),
+    "admin.bulk_create_tickets": lambda ctx, n: ("Admin", _repeat(
+        "POST", "/admin/tickets/bulk/create", n,
+        json={"items": [{"title": "bench", "description": "created by benchmark"}] * 100})),
+    "admin.bulk_assign_tickets": lambda ctx, n: ("Admin", [
+        ("POST", "/admin/tickets/bulk/assign", {"json": {"items": [
+            {"ticket_id": tid, "assignee_id": ctx["users"]["Engineer"]} for tid in make_tickets(ctx, 100)
+        ]}})
+        for _ in range(n)
+    ]),
+    "admin.update_ticket": lambda ctx, n: ("Admin", [
+        ("PATCH", f"/admin/tickets/{tid}", {"json": {"status": "closed"}})
+        for tid in make_tickets(ctx, n)
+    ]),
+    "admin.delete_ticket": lambda ctx, n: ("Admin", [
+        ("DELETE", f"/admin/tickets/{tid}", {}) for tid in make_tickets(ctx, n)
+    ]),
+
+    "admin.ticket_stats": lambda ctx, n: ("Admin", _repeat("GET", "/admin/stats", n)),
+    "admin.list_audits": lambda ctx, n: ("Admin", _repeat(
+        "GET", f"/admin/audits?entity_type=ticket&entity_id={ctx['ticket_id']}", n)),
+
+    "customer.create_ticket": lambda ctx, n: ("User", _repeat(
+        "POST", "/customers/tickets", n, json={"title": "bench", "description": "created by benchmark"})),
+    "customer.list_tickets": lambda ctx, n: ("User", _repeat("GET", "/customers/tickets", n)),
+    "customer.list_messages": lambda ctx, n: ("Admin", _repeat(
+        "GET", f"/customers/tickets/{ctx['ticket_id']}/messages", n)),
+    "customer.post_message": lambda ctx, n: ("Admin", _repeat(
+        "POST", f"/customers/tickets/{ctx['ticket_id']}/messages", n, json={"message": "benchmark reply"})),
+
+    "support.open_tickets": lambda ctx, n: ("Support Agent", _repeat("GET", "/support/open", n)),
+    "support.search_tickets": lambda ctx, n: ("Support Agent", _repeat("GET", "/support/search?q=refund", n)),
+    "support.assign_ticket": lambda ctx, n: ("Admin", [
+        ("POST", f"/support/assign/{tid}", {"json": {"assignee_id": ctx["users"]["Engineer"]}})
+        for tid in make_tickets(ctx, n)
+    ]),
+    "support.resolve_ticket": lambda ctx, n: ("Engineer", [
+        ("POST", f"/support/resolve/{tid}", {})
+        for tid in make_tickets(ctx, n, "in_progress", ctx["users"]["Engineer"])
+    ]),
+
+    "engineer.my_assigned": lambda ctx, n: ("Engineer", _repeat("GET", "/engineer/my-assigned", n)),
+    "engineer.resolve_ticket": lambda ctx, n: ("Engineer", [
+        ("POST", f"/engineer/tickets/{tid}/resolve", {})
+        for tid in make_tickets(ctx, n, "in_progress", ctx["users"]["Engineer"])
+    ]),
+}
+
+
+def build_context(app, summary):
+    from app.models import Role
+
+    with app.app_context():
+        role_ids = {r.name: r.id for r in Role.query.all()}
+        ticket_id = db.session.query(Ticket.id).order_by(Ticket.id.desc()).limit(1).scalar()
+
+    # The first generated user of each role carries the heaviest ticket load
+    users = {role: ids[0] for role, ids in summary["user_ids"].items()}
+    usernames = {role: username_for(role, uid) for role, uid in users.items()}
+    client = app.test_client()
+    return {
+        "app": app,
+        "client": client,
+        "role_ids": role_ids,
+        "users": users,
+        "usernames": usernames,
+        "passwords": summary["passwords"],
+        "ticket_id": ticket_id,
+        "headers": {
+            role: login(client, usernames[role], summary["passwords"][role]) for role in users
+        },
+    }
+
+
+def run(ctx, names, requests, warmup):
+    counter = QueryCounter(ctx["app"])
+    results = []
+    try:
+        for name in names:
+            role, plan = SCENARIOS[name](ctx, requests + warmup)
+            headers = ctx["headers"][role] if role else {}
+            plan = [(m, u, {**kw, "headers": headers}) for m, u, kw in plan]
+            timed_requests(ctx["client"], counter, plan[:warmup])
+            results.append(summarize(name, *timed_requests(ctx["client"], counter, plan[warmup:])))
+    finally:
+        counter.close()
+    return results
+
+
+def print_table(results, stream=sys.stderr):
+    header = f"{'endpoint':<28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>8} {'bytes':>9}"
+    print(header, file=stream)
+    print("-" * len(header), file=stream)
+    for r in results:
+        print(
+            f"{r['endpoint']:<28} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+            f"{r['throughput_rps']:>8.1f} {r['queries_per_request']:>8.2f} {r['bytes_per_response']:>9}",
+            file=stream,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--messages-per-ticket", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=100, help="timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-uri", help="benchmark against this database instead of a temp SQLite file")
+    parser.add_argument("--only", action="append", help="endpoint name or glob (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    names = [n for n in SCENARIOS if not args.only or any(fnmatch.fnmatch(n, p) for p in args.only)]
+    if not names:
+        parser.error("no endpoint matches --only")
+
+    app = build_app(args.database_uri)
+    print(f"Seeding {args.users:,} users / {args.tickets:,} tickets...", file=sys.stderr)
+    summary = seed(app, args.users, args.tickets, args.messages_per_ticket, args.seed)
+    ctx = build_context(app, summary)
+
+    results = run(ctx, names, args.requests, args.warmup)
+    print_table(results)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "python": platform.python_version(),
+            "database": app.config["SQLALCHEMY_DATABASE_URI"].split("://", 1)[0],
+            "dataset": {k: summary[k] for k in ("users", "tickets", "messages", "audits")},
+            "requests_per_endpoint": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Add full-text search index over tickets and messages
+
+Revision ID: e3d9a5c1b7f2
+Revises: c7b25e90f3a4
+Create Date: 2026-10-18 11:37:52.440193
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3d9a5c1b7f2'
+down_revision = 'c7b25e90f3a4'
+branch_labels = None
+depends_on = None
+
+# DDL as of this revision; kept here so the migration does not change with
+# app/search.py
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "title, body, ticket_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')",
+]
+
+POSTGRES_DDL = [
+    "CREATE TABLE IF NOT EXISTS search_index ("
+    "id BIGINT PRIMARY KEY, ticket_id INTEGER NOT NULL, document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING GIN (document)",
+    "CREATE INDEX IF NOT EXISTS ix_search_index_ticket_id ON search_index (ticket_id)",
+]
+
+
+def upgrade():
+    # FTS5 virtual table on SQLite, tsvector + GIN on Postgres. The index
+    # starts empty; run `flask search-reindex` to backfill existing rows.
+    dialect = op.get_bind().dialect.name
+    ddl = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(dialect)
+    if ddl is None:
+        raise RuntimeError(f"full-text search is not supported on {dialect}")
+    for statement in ddl:
+        op.execute(statement)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -1,6 +1,9 @@
 # seed.py
 from app import create_app, db
 from app.models import Role, User, Ticket, TicketMessage, Audit
+from app.passwords import hash_password
+from app.search import clear_index
+from app.stats import rebuild
 
 def seed_data():
     app = create_app()
@@ -13,6 +16,10 @@ def seed_data():
         db.session.query(Ticket).delete()
         db.session.query(User).delete()
         db.session.query(Role).delete()
+        # Bulk deletes skip the flush hooks, so reset the statistics rollup
+        # and the search index too; the rows added below are indexed on flush
+        rebuild(db.session.connection())
+        clear_index(db.session.connection())
         db.session.commit()
 
         # ===========================
@@ -42,8 +49,10 @@ def seed_data():
 
         passwords = ["admin123", "support123", "support123", "engineer123", "engineer123", "user123", "user123"]
 
+        # Hash each distinct password once; salts are per-hash, not per-user
+        hashes = {pwd: hash_password(pwd) for pwd in set(passwords)}
         for user, pwd in zip(users, passwords):
-            user.set_password(pwd)
+            user.password_hash = hashes[pwd]
 
         db.session.add_all(users)
         db.session.commit()
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+# The benchmarks' harness builds apps on throwaway SQLite files; reuse it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from harness import build_app, login, seed, username_for  # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Factory for apps on a SQLite file under the test's tmp_path."""
+    def factory(name="app.db", **overrides):
+        return build_app(f"sqlite:///{tmp_path / name}", **overrides)
+    return factory
+
+
+class Seeded:
+    """A seeded app with a test client, one user id and auth headers per role."""
+
+    def __init__(self, app, summary):
+        self.app = app
+        self.client = app.test_client()
+        self.passwords = summary["passwords"]
+        self.users = {role: ids[0] for role, ids in summary["user_ids"].items()}
+        self.usernames = {role: username_for(role, uid) for role, uid in self.users.items()}
+        self.headers = {
+            role: login(self.client, self.usernames[role], self.passwords[role]) for role in self.users
+        }
+
+
+@pytest.fixture
+def seeded_app(make_app):
+    """Factory for a `Seeded` app: `seeded_app(users=40, tickets=20, **config)`."""
+    def factory(name="app.db", users=40, tickets=20, **overrides):
+        app = make_app(name, **overrides)
+        return Seeded(app, seed(app, users=users, tickets=tickets))
+    return factory
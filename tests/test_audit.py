@@ -0,0 +1,82 @@
+import json
+
+from sqlalchemy import func, select, text
+
+from app.extensions import db
+from app.models import Audit
+from app.services.audit import audit_log
+
+
+def _count(app):
+    with app.app_context():
+        return db.session.scalar(select(func.count()).select_from(Audit))
+
+
+def _record(app, count, commit=True):
+    with app.app_context():
+        for i in range(count):
+            audit_log.record("test", 1, "ticket", i, new_values={"n": i})
+        if commit:
+            db.session.commit()
+        else:
+            db.session.rollback()
+
+
+def test_rows_are_written_to_the_recording_apps_database(seeded_app):
+    first = seeded_app("a.db")
+    second = seeded_app("b.db")
+    before = _count(first.app), _count(second.app)
+
+    resp = first.client.post("/admin/tickets", json={"title": "Audited"}, headers=first.headers["Admin"])
+    assert resp.status_code == 201, resp.get_json()
+    audit_log.flush(5, app=first.app)
+    audit_log.flush(5, app=second.app)
+
+    assert (_count(first.app), _count(second.app)) == (before[0] + 1, before[1])
+
+
+def test_rolled_back_rows_are_dropped(make_app):
+    app = make_app()
+    _record(app, 3, commit=False)
+    audit_log.flush(5, app=app)
+    assert _count(app) == 0
+
+    # A later commit on the same session does not resurrect them
+    with app.app_context():
+        db.session.commit()
+    audit_log.flush(5, app=app)
+    assert _count(app) == 0
+
+
+def test_flush_drains_the_queue(make_app):
+    # A long interval and a large batch keep the rows queued until flushed
+    app = make_app(AUDIT_FLUSH_INTERVAL=0.5, AUDIT_BATCH_SIZE=1000)
+    _record(app, 50)
+    audit_log.flush(5, app=app)
+    assert _count(app) == 50
+
+
+def test_failed_batches_are_spilled_then_replayed(make_app, tmp_path):
+    spill = tmp_path / "spill.ndjson"
+    app = make_app(AUDIT_SPILL_PATH=str(spill), AUDIT_WRITE_RETRIES=1, AUDIT_RETRY_BACKOFF=0.01)
+    with app.app_context():
+        db.session.execute(text("ALTER TABLE audits RENAME TO audits_offline"))
+        db.session.commit()
+
+    _record(app, 3)
+    audit_log.flush(5, app=app)
+    spilled = [json.loads(line) for line in spill.read_text().splitlines()]
+    assert [row["entity_id"] for row in spilled] == [0, 1, 2]
+
+    with app.app_context():
+        db.session.execute(text("ALTER TABLE audits_offline RENAME TO audits"))
+        db.session.commit()
+    # The next successful write brings the spilled rows back
+    _record(app, 1)
+    audit_log.flush(5, app=app)
+
+    with app.app_context():
+        rows = db.session.execute(select(Audit.entity_id, Audit.new_values).order_by(Audit.id)).all()
+    # The new row is inserted first, then the three spilled ones
+    assert [tuple(row) for row in rows] == [(0, {"n": 0}), (0, {"n": 0}), (1, {"n": 1}), (2, {"n": 2})]
+    assert not spill.exists()
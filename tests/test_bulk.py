@@ -0,0 +1,127 @@
+import pytest
+from sqlalchemy import event, select
+
+from app.extensions import db
+from app.models import Role, Ticket, TicketStat, User
+from app.stats import rebuild
+
+
+@pytest.fixture
+def seeded(seeded_app):
+    return seeded_app(RESPONSE_CACHE_BACKEND="memory")
+
+
+def _post(seeded, operation, items):
+    resp = seeded.client.post(
+        f"/admin/tickets/bulk/{operation}", json={"items": items}, headers=seeded.headers["Admin"]
+    )
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def _engineers(seeded, count):
+    with seeded.app.app_context():
+        return db.session.scalars(
+            select(User.id).join(Role).where(Role.name == "Engineer").order_by(User.id).limit(count)
+        ).all()
+
+
+def _rollup():
+    rows = db.session.execute(select(TicketStat.dimension, TicketStat.key, TicketStat.count, TicketStat.total))
+    return {(d, k): (c, t) for d, k, c, t in rows if c or t}
+
+
+def test_create_reports_each_item(seeded):
+    engineer = _engineers(seeded, 1)[0]
+    body = _post(seeded, "create", [
+        {"title": "First"},
+        {"description": "no title"},
+        {"title": "Bad status", "status": "lost"},
+        {"title": "Unknown assignee", "assigned_to": 999999},
+        {"title": "Second", "assigned_to": engineer, "status": "in_progress"},
+    ])
+
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    results = body["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert [r["ok"] for r in results] == [True, False, False, False, True]
+    assert results[1]["error"] == "title is required"
+    assert results[2]["error"].startswith("status must be one of")
+    assert results[3]["error"] == "assigned_to user not found"
+    with seeded.app.app_context():
+        created = {t.id: (t.title, t.assigned_to, t.status) for t in Ticket.query.filter(
+            Ticket.id.in_([results[0]["ticket_id"], results[4]["ticket_id"]])
+        )}
+    assert created == {
+        results[0]["ticket_id"]: ("First", None, "open"),
+        results[4]["ticket_id"]: ("Second", engineer, "in_progress"),
+    }
+
+
+def test_malformed_body_is_rejected(seeded):
+    resp = seeded.client.post("/admin/tickets/bulk/create", json={"items": []}, headers=seeded.headers["Admin"])
+    assert resp.status_code == 400
+
+
+def test_side_effects_match_single_writes(seeded):
+    client, headers = seeded.client, seeded.headers
+    engineer = _engineers(seeded, 1)[0]
+    assert client.get("/support/open", headers=headers["Support Agent"]).headers["X-Cache"] == "MISS"
+    assert client.get("/support/open", headers=headers["Support Agent"]).headers["X-Cache"] == "HIT"
+
+    created = _post(seeded, "create", [{"title": "Quokka badge reader"}, {"title": "Quokka door lock"}])
+    ids = [r["ticket_id"] for r in created["results"]]
+
+    # The response cache was invalidated and the new tickets are listed
+    resp = client.get("/support/open", headers=headers["Support Agent"])
+    assert resp.headers["X-Cache"] == "MISS"
+    assert set(ids) <= {t["id"] for t in resp.get_json()}
+    # The search index has their documents
+    resp = client.get("/support/search", query_string={"q": "quokka"}, headers=headers["Support Agent"])
+    assert sorted(hit["id"] for hit in resp.get_json()) == sorted(ids)
+
+    _post(seeded, "assign", [{"ticket_id": i, "assignee_id": engineer} for i in ids])
+    _post(seeded, "close", [{"ticket_id": ids[0]}])
+    # The rollup was maintained like the flush hook would have
+    with seeded.app.app_context():
+        incremental = _rollup()
+        rebuild(db.session.connection())
+        assert incremental == _rollup()
+        db.session.rollback()
+        statuses = dict(db.session.execute(select(Ticket.id, Ticket.status).where(Ticket.id.in_(ids))).all())
+    assert statuses == {ids[0]: "closed", ids[1]: "in_progress"}
+
+
+def _selects(seeded, operation, items):
+    """SELECT statements issued by one bulk request."""
+    with seeded.app.app_context():
+        engine = db.engine
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _post(seeded, operation, items)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def test_ticket_and_user_lookups_do_not_grow_with_the_batch(seeded):
+    engineers = _engineers(seeded, 2)
+    created = _post(seeded, "create", [{"title": f"Batch {i}"} for i in range(40)])
+    ids = [r["ticket_id"] for r in created["results"]]
+
+    # Warm the per-process user cache the auth decorators read
+    _selects(seeded, "assign", [{"ticket_id": ids[0], "assignee_id": engineers[0]}])
+    small = _selects(seeded, "assign", [{"ticket_id": ids[1], "assignee_id": engineers[1]}])
+    large = _selects(seeded, "assign", [
+        {"ticket_id": i, "assignee_id": engineers[n % 2]} for n, i in enumerate(ids[2:])
+    ])
+    assert len(large) == len(small)
+    close_small = _selects(seeded, "close", [{"ticket_id": ids[0]}])
+    close_large = _selects(seeded, "close", [{"ticket_id": i} for i in ids[1:]])
+    assert len(close_large) == len(close_small)
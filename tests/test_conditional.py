@@ -0,0 +1,93 @@
+from datetime import timezone
+
+from sqlalchemy import event
+
+from app.conditional import current_versions
+from app.extensions import db
+from app.models import Ticket
+
+
+def _get(seeded, url, etag=None, role="Support Agent"):
+    headers = dict(seeded.headers[role])
+    if etag:
+        headers["If-None-Match"] = etag
+    return seeded.client.get(url, headers=headers)
+
+
+def _http_date(value):
+    return value.replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def _version(app, name):
+    with app.app_context():
+        return current_versions([name])[name]
+
+
+def test_unchanged_collection_short_circuits(seeded_app):
+    seeded = seeded_app()
+    first = _get(seeded, "/support/open")
+    assert first.status_code == 200 and first.headers["ETag"].startswith('W/"')
+
+    with seeded.app.app_context():
+        engine = db.engine
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = _get(seeded, "/support/open", first.headers["ETag"])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert resp.status_code == 304 and resp.get_data() == b""
+    assert resp.headers["ETag"] == first.headers["ETag"]
+    # Only the version counters were read: no ticket was loaded
+    assert statements and all("collection_versions" in s for s in statements)
+
+
+def test_write_changes_the_etag(seeded_app):
+    seeded = seeded_app()
+    etag = _get(seeded, "/support/open").headers["ETag"]
+
+    resp = seeded.client.post("/admin/tickets", json={"title": "Fresh"}, headers=seeded.headers["Admin"])
+    assert resp.status_code == 201
+
+    resp = _get(seeded, "/support/open", etag)
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert "Fresh" in {t["title"] for t in resp.get_json()}
+
+
+def test_last_modified_is_the_newest_change(seeded_app):
+    seeded = seeded_app()
+    resp = seeded.client.post("/admin/tickets", json={"title": "Dated"}, headers=seeded.headers["Admin"])
+    ticket_id = resp.get_json()["ticket"]["id"]
+
+    # Lists: the newest of their collections, here the ticket just written
+    resp = _get(seeded, "/support/open")
+    assert resp.last_modified == _http_date(_version(seeded.app, "tickets")[1])
+
+    # Single tickets: the users collection or the row's own updated_at
+    resp = _get(seeded, f"/admin/tickets/{ticket_id}", role="Admin")
+    with seeded.app.app_context():
+        ticket_updated_at = db.session.get(Ticket, ticket_id).updated_at
+    newest = max(ticket_updated_at, _version(seeded.app, "users")[1])
+    assert resp.last_modified == _http_date(newest)
+    assert _get(seeded, f"/admin/tickets/{ticket_id}", resp.headers["ETag"], role="Admin").status_code == 304
+
+
+def test_versions_are_bumped_after_commit_only(seeded_app):
+    seeded = seeded_app()
+    app, creator = seeded.app, seeded.users["User"]
+    before = _version(app, "tickets")[0]
+    with app.app_context():
+        db.session.add(Ticket(title="Pending", description="", status="open", created_by=creator))
+        db.session.flush()
+        # The writer's transaction does not touch the counter row
+        assert current_versions(["tickets"])["tickets"][0] == before
+        db.session.rollback()
+    assert _version(app, "tickets")[0] == before
+
+    with app.app_context():
+        db.session.add(Ticket(title="Committed", description="", status="open", created_by=creator))
+        db.session.commit()
+    assert _version(app, "tickets")[0] == before + 1
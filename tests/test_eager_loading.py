@@ -0,0 +1,55 @@
+import pytest
+
+from app.extensions import db
+from app.models import Ticket
+from app.schemas import eager_load_options, ticket_summaries_schema, tickets_with_messages_schema
+from harness import QueryCounter, build_app, seed
+
+TICKETS = 1000
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    app = build_app(f"sqlite:///{tmp_path_factory.mktemp('eager') / 'app.db'}")
+    seed(app, users=50, tickets=TICKETS, messages_per_ticket=2)
+    return app
+
+
+def _dump_queries(app, schema, limit):
+    """(rows dumped, SQL statements issued) for loading and dumping `limit` tickets."""
+    with app.app_context():
+        db.session.remove()
+        counter = QueryCounter(app)
+        try:
+            tickets = Ticket.query.options(*eager_load_options(schema)).order_by(Ticket.id).limit(limit).all()
+            dumped = schema.dump(tickets)
+        finally:
+            counter.close()
+            db.session.remove()
+    return len(dumped), counter.count
+
+
+def test_summaries_dump_in_one_query(app):
+    # creator and assignee are joined into the ticket SELECT
+    assert _dump_queries(app, ticket_summaries_schema, TICKETS) == (TICKETS, 1)
+
+
+def test_threads_dump_in_constant_queries(app):
+    # One SELECT for the tickets plus one per 500 tickets for their messages
+    # (selectinload's IN batch), with each sender joined in
+    assert _dump_queries(app, tickets_with_messages_schema, TICKETS) == (TICKETS, 3)
+    assert _dump_queries(app, tickets_with_messages_schema, 10) == (10, 2)
+
+
+def test_dump_without_options_is_n_plus_one(app):
+    # Guards the assertions above: the same dump without loader options
+    # lazy-loads per row, so the counter does see those queries
+    with app.app_context():
+        db.session.remove()
+        counter = QueryCounter(app)
+        try:
+            tickets_with_messages_schema.dump(Ticket.query.order_by(Ticket.id).limit(50).all())
+        finally:
+            counter.close()
+            db.session.remove()
+    assert counter.count > 50
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Role, User
+from app.services.events import event_bus
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def seeded(request, seeded_app, tmp_path):
+    return seeded_app(
+        EVENTS_BACKEND=request.param, EVENTS_SQLITE_PATH=str(tmp_path / "events.db"), EVENTS_POLL_INTERVAL=0.02
+    )
+
+
+def _second(seeded, role):
+    """Another user of `role` than the one the fixture logged in."""
+    with seeded.app.app_context():
+        return db.session.scalar(
+            select(User.id).join(Role).where(Role.name == role, User.id != seeded.users[role]).limit(1)
+        )
+
+
+def _wait_for(backend, last_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while backend.last_id() < last_id and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert backend.last_id() >= last_id, "events were not published"
+
+
+def _seen(role, user_id, after_id):
+    """(type, ticket id) of every event `user_id` receives after `after_id`."""
+    seen = []
+    for item in event_bus.subscribe(role, user_id, after_id, keepalive=0.1):
+        if item is None:
+            return seen
+        seen.append((item[1]["type"], item[1]["ticket"]["id"]))
+
+
+def test_events_reach_only_their_audience(seeded):
+    client, headers, users = seeded.client, seeded.headers, seeded.users
+    other_engineer = _second(seeded, "Engineer")
+    start = event_bus.backend.last_id()
+
+    resp = client.post("/customers/tickets", json={"title": "Laptop will not boot"}, headers=headers["User"])
+    assert resp.status_code == 201, resp.get_json()
+    ticket_id = resp.get_json()["id"]
+    for url, body, role in (
+        (f"/support/assign/{ticket_id}", {"assignee_id": users["Engineer"]}, "Admin"),
+        (f"/engineer/tickets/{ticket_id}/resolve", None, "Engineer"),
+        (f"/support/assign/{ticket_id}", {"assignee_id": other_engineer}, "Admin"),
+    ):
+        resp = client.post(url, json=body, headers=headers[role])
+        assert resp.status_code == 200, resp.get_json()
+    _wait_for(event_bus.backend, start + 4)
+
+    everything = [
+        ("ticket.created", ticket_id), ("ticket.assigned", ticket_id),
+        ("ticket.resolved", ticket_id), ("ticket.assigned", ticket_id),
+    ]
+    # Staff and the creator see every change
+    assert _seen("Admin", users["Admin"], start) == everything
+    assert _seen("Support Agent", users["Support Agent"], start) == everything
+    assert _seen("User", users["User"], start) == everything
+    # The first engineer sees the ticket arrive, resolve and leave their queue
+    assert _seen("Engineer", users["Engineer"], start) == everything[1:]
+    # The new assignee only from the reassignment on
+    assert _seen("Engineer", other_engineer, start) == everything[3:]
+    # Unrelated customers see nothing
+    assert _seen("User", _second(seeded, "User"), start) == []
@@ -0,0 +1,38 @@
+import gzip
+import json
+
+import pytest
+
+
+@pytest.fixture
+def seeded(seeded_app):
+    return seeded_app(EXPORT_BUFFER_BYTES=64 * 1024)
+
+
+def _chunks(seeded, query=""):
+    resp = seeded.client.get(f"/admin/export/tickets{query}", headers=seeded.headers["Admin"], buffered=False)
+    assert resp.status_code == 200
+    chunks = list(resp.iter_encoded())
+    resp.close()
+    return chunks
+
+
+def test_first_ndjson_line_is_sent_on_its_own(seeded):
+    chunks = _chunks(seeded)
+    # The first row goes out alone, the rest fill one buffer
+    assert chunks[0].count(b"\n") == 1
+    assert len(chunks) == 2
+    tickets = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert len(tickets) == 20
+    assert [t["id"] for t in tickets] == sorted(t["id"] for t in tickets)
+
+
+def test_csv_header_is_sent_on_its_own(seeded):
+    chunks = _chunks(seeded, "?format=csv")
+    assert chunks[0].startswith(b"id,title,") and chunks[0].count(b"\n") == 1
+    assert b"".join(chunks).count(b"\n") == 21
+
+
+def test_gzipped_export_round_trips(seeded):
+    body = gzip.decompress(b"".join(_chunks(seeded, "?gzip=1")))
+    assert len(body.splitlines()) == 20
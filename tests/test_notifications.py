@@ -0,0 +1,173 @@
+import socketserver
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Notification
+from app.services.notifications import notifications
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Minimal local SMTP server that accepts every message and keeps it."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.received = threading.Condition()
+
+    def wait_for(self, count, timeout=5):
+        with self.received:
+            return self.received.wait_for(lambda: len(self.messages) >= count, timeout)
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        sink = self.server
+        sink.connections += 1
+        recipients, lines, in_data = [], [], False
+        self.wfile.write(b"220 sink ready\r\n")
+        for raw in self.rfile:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if in_data:
+                if line != ".":
+                    lines.append(line)
+                    continue
+                with sink.received:
+                    sink.messages.append({"to": recipients, "data": "\n".join(lines)})
+                    sink.received.notify_all()
+                recipients, lines, in_data = [], [], False
+                self.wfile.write(b"250 queued\r\n")
+                continue
+            command = line[:4].upper()
+            if command == "RCPT":
+                recipients.append(line.split(":", 1)[1].strip(" <>"))
+            if command == "DATA":
+                in_data = True
+                self.wfile.write(b"354 end with .\r\n")
+            elif command == "QUIT":
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+@pytest.fixture
+def smtp_sink():
+    sink = SMTPSink()
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    yield sink
+    sink.shutdown()
+    sink.server_close()
+
+
+@pytest.fixture
+def mail_config(smtp_sink):
+    return {
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": smtp_sink.server_address[1],
+        "MAIL_USE_TLS": False,
+        "MAIL_USERNAME": None,
+        "MAIL_PASSWORD": None,
+        "MAIL_DEFAULT_SENDER": "crm@example.com",
+        "MAIL_SUPPRESS_SEND": False,
+    }
+
+
+@pytest.fixture
+def serving_app(make_app):
+    """`make_app` whose dispatchers are stopped at teardown."""
+    apps = []
+
+    def factory(*args, **overrides):
+        app = make_app(*args, **overrides)
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        notifications.shutdown(app)
+
+
+def _queue(app, *recipients):
+    with app.app_context():
+        notifications.enqueue(list(recipients), "Ticket updated", "Ticket #1 was updated")
+        db.session.commit()
+
+
+def _statuses(app):
+    with app.app_context():
+        return sorted(n.status for n in Notification.query)
+
+
+def test_drain_delivers_over_smtp(make_app, mail_config, smtp_sink):
+    app = make_app(**mail_config)
+    _queue(app, "a@example.com", "b@example.com")
+
+    with app.app_context():
+        assert notifications.drain() == 2
+
+    assert sorted(m["to"][0] for m in smtp_sink.messages) == ["a@example.com", "b@example.com"]
+    assert "Subject: Ticket updated" in smtp_sink.messages[0]["data"]
+    # One batch, one SMTP connection
+    assert smtp_sink.connections == 1
+    assert _statuses(app) == ["sent", "sent"]
+
+
+def _wait_for_statuses(app, expected, timeout=5):
+    deadline = time.monotonic() + timeout
+    while _statuses(app) != expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return _statuses(app)
+
+
+def test_dispatcher_drains_existing_rows_on_start(make_app, mail_config, smtp_sink, serving_app):
+    # Rows committed while no dispatcher was running
+    _queue(make_app(**mail_config), "waiting@example.com")
+
+    app = serving_app(NOTIFY_WORKERS=1, NOTIFY_POLL_INTERVAL=60, **mail_config)
+
+    assert smtp_sink.wait_for(1), "pending row was not delivered at start-up"
+    assert smtp_sink.messages[0]["to"] == ["waiting@example.com"]
+    assert _wait_for_statuses(app, ["sent"]) == ["sent"]
+
+
+def test_dispatcher_only_sends_its_own_apps_rows(mail_config, smtp_sink, serving_app):
+    serving = serving_app("serving.db", NOTIFY_WORKERS=1, NOTIFY_POLL_INTERVAL=0.05, **mail_config)
+    # Created later, so a shared dispatcher would have switched to its outbox
+    other = serving_app("other.db", **mail_config)
+    _queue(other, "other@example.com")
+    _queue(serving, "serving@example.com")
+
+    assert smtp_sink.wait_for(1)
+    assert _wait_for_statuses(serving, ["sent"]) == ["sent"]
+    time.sleep(0.2)
+    assert [m["to"] for m in smtp_sink.messages] == [["serving@example.com"]]
+    assert _statuses(other) == ["pending"]
+
+
+def test_idle_poll_does_not_write(make_app, mail_config):
+    app = make_app(**mail_config)
+    statements, commits = [], []
+    with app.app_context():
+        engine = db.engine
+    listeners = [
+        ("before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement)),
+        ("commit", lambda conn: commits.append(conn)),
+    ]
+    for name, fn in listeners:
+        event.listen(engine, name, fn)
+    try:
+        assert app.extensions["notifications"]._claim() == []
+    finally:
+        for name, fn in listeners:
+            event.remove(engine, name, fn)
+
+    assert statements and all(s.lstrip().upper().startswith("SELECT") for s in statements)
+    assert commits == []
@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+from app import passwords
+from app.passwords import PasswordVerifyTimeout, hash_password, verify_password_offloaded
+
+
+@pytest.fixture
+def busy_pool():
+    """Keep the single verification process busy for a while."""
+    sleeper = passwords._get_pool(1).submit(time.sleep, 1)
+    yield
+    sleeper.result()
+
+
+def test_offloaded_verification(make_app):
+    app = make_app(PASSWORD_VERIFY_WORKERS=1, PASSWORD_VERIFY_TIMEOUT=60)
+    with app.app_context():
+        pwhash = hash_password("correct horse")
+        assert verify_password_offloaded(pwhash, "correct horse") is True
+        assert verify_password_offloaded(pwhash, "wrong horse") is False
+
+
+def test_busy_pool_times_out(make_app, busy_pool):
+    app = make_app(PASSWORD_VERIFY_WORKERS=1, PASSWORD_VERIFY_TIMEOUT=0.05)
+    with app.app_context():
+        with pytest.raises(PasswordVerifyTimeout):
+            verify_password_offloaded(hash_password("correct horse"), "correct horse")
+
+
+def test_login_answers_503_on_timeout(seeded_app, busy_pool):
+    seeded = seeded_app()
+    seeded.app.config.update(PASSWORD_VERIFY_WORKERS=1, PASSWORD_VERIFY_TIMEOUT=0.05)
+    resp = seeded.client.post(
+        "/auth/login", json={"username": seeded.usernames["User"], "password": seeded.passwords["User"]}
+    )
+    assert resp.status_code == 503
+    assert resp.get_json() == {"msg": "Login is busy, try again later"}
@@ -0,0 +1,105 @@
+import pytest
+
+from app.middleware.ratelimit import MemoryStore, parse_limit, sliding_window, token_bucket
+
+
+def _hits(algorithm, times, limit, period, state=None):
+    """Apply one hit at each time; (final state, [(allowed, retry_after), ...])."""
+    results = []
+    for now in times:
+        state, allowed, retry_after = algorithm(state, now, limit, period)
+        results.append((allowed, retry_after))
+    return state, results
+
+
+def test_parse_limit():
+    assert parse_limit("20/minute") == (20, 60.0)
+    assert parse_limit(" 5 / 15minutes ") == (5, 900.0)
+    assert parse_limit("") is None
+    for value in ("lots", "0/minute", "5/fortnight"):
+        with pytest.raises(ValueError):
+            parse_limit(value)
+
+
+def test_token_bucket_allows_a_burst_then_refills():
+    state, results = _hits(token_bucket, [100.0] * 4, limit=3, period=60)
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    # One token comes back every period / limit seconds
+    assert results[-1][1] == pytest.approx(20.0)
+
+    state, [(allowed, _)] = _hits(token_bucket, [119.0], 3, 60, state)
+    assert not allowed
+    state, [(allowed, _)] = _hits(token_bucket, [120.0], 3, 60, state)
+    assert allowed
+    # Idle time never refills beyond the burst size
+    _, results = _hits(token_bucket, [10000.0] * 4, 3, 60, state)
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+
+
+def test_sliding_window_limits_any_period():
+    # Three hits late in one window keep weighing on the start of the next
+    state, results = _hits(sliding_window, [50.0, 55.0, 59.0], limit=3, period=60)
+    assert all(allowed for allowed, _ in results)
+    _, [(allowed, retry_after)] = _hits(sliding_window, [61.0], 3, 60, state)
+    assert not allowed and retry_after > 0
+
+    # Two full windows later the history is gone
+    _, results = _hits(sliding_window, [200.0] * 4, 3, 60, state)
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+
+
+@pytest.mark.parametrize("times", [
+    [50.0, 55.0, 59.0, 61.0],          # rejected on the previous window's weight
+    [60.0, 61.0, 62.0, 63.0],          # current window full
+    [30.0, 70.0, 71.0, 72.0, 73.0],    # both windows contribute
+])
+def test_sliding_window_retry_after_is_exact(times):
+    limit, period = 3, 60
+    state, results = _hits(sliding_window, times, limit, period)
+    allowed, retry_after = results[-1]
+    assert not allowed
+    now = times[-1]
+
+    # Rejected hits are not counted, so retrying too early changes nothing
+    _, [(allowed, _)] = _hits(sliding_window, [now + retry_after - 0.01], limit, period, state)
+    assert not allowed
+    _, [(allowed, _)] = _hits(sliding_window, [now + retry_after + 1e-6], limit, period, state)
+    assert allowed
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryStore(maxsize=2)
+    for key in ("a", "b"):
+        assert store.hit(key, token_bucket, 1, 60, 0.0) == (True, 0.0)
+    # Touching "a" makes "b" the eviction candidate
+    assert store.hit("a", token_bucket, 1, 60, 0.0)[0] is False
+    store.hit("c", token_bucket, 1, 60, 0.0)
+    assert store.size() == 2
+
+    # "a" and "c" kept their state, "b" starts afresh
+    assert store.hit("a", token_bucket, 1, 60, 0.0)[0] is False
+    assert store.hit("b", token_bucket, 1, 60, 0.0)[0] is True
+    assert store.size() == 2
+
+
+def test_malformed_rule_fails_at_startup(make_app):
+    with pytest.raises(ValueError, match="RATELIMIT_LOGIN_PER_IP"):
+        make_app(RATELIMIT_LOGIN_PER_IP="lots")
+
+
+def _login(client, username, password, address):
+    return client.post(
+        "/auth/login", json={"username": username, "password": password},
+        environ_base={"REMOTE_ADDR": address},
+    )
+
+
+def test_failed_logins_do_not_lock_out_other_addresses(seeded_app):
+    seeded = seeded_app(RATELIMIT_ENABLED=True, RATELIMIT_LOGIN_PER_USERNAME="2/minute", RATELIMIT_LOGIN_PER_IP="")
+    username, password = seeded.usernames["User"], seeded.passwords["User"]
+
+    statuses = [_login(seeded.client, username, "wrong", "203.0.113.9").status_code for _ in range(3)]
+    assert statuses == [401, 401, 429]
+    assert _login(seeded.client, username, password, "198.51.100.7").status_code == 200
+    # The failing address stays limited for this account
+    assert _login(seeded.client, username, password, "203.0.113.9").status_code == 429
@@ -0,0 +1,106 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from app.extensions import db
+from app.routing import STICKY_COOKIE, _sticky_users
+from harness import login, seed, username_for
+
+
+def _replicate(app, primary, replica):
+    """Bring the replica file up to date with the primary, like replication catching up."""
+    with app.app_context():
+        db.session.remove()
+        # Closing the last connection checkpoints the primary's WAL into its file
+        for engine in db.engines.values():
+            engine.dispose()
+    for suffix in ("-wal", "-shm"):
+        replica.with_name(replica.name + suffix).unlink(missing_ok=True)
+    shutil.copyfile(primary, replica)
+
+
+def _titles(path):
+    with sqlite3.connect(path) as conn:
+        return {title for (title,) in conn.execute("SELECT title FROM tickets")}
+
+
+@pytest.fixture
+def replicated(make_app, tmp_path):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    seeded = make_app(primary.name)
+    summary = seed(seeded, users=40, tickets=20)
+    _replicate(seeded, primary, replica)
+
+    app = make_app(
+        primary.name,
+        DATABASE_REPLICA_URI=f"sqlite:///{replica}",
+        RESPONSE_CACHE_BACKEND="memory",
+        REPLICA_STICKY_SECONDS=30,
+    )
+    users = {role: ids[0] for role, ids in summary["user_ids"].items()}
+    client = app.test_client()
+    headers = {
+        role: login(client, username_for(role, uid), summary["passwords"][role]) for role, uid in users.items()
+    }
+    _sticky_users.clear()
+    yield {"app": app, "primary": primary, "replica": replica, "headers": headers}
+    _sticky_users.clear()
+
+
+def _create_ticket(client, headers, title, role="User"):
+    resp = client.post("/customers/tickets", json={"title": title}, headers=headers[role])
+    assert resp.status_code == 201, resp.get_json()
+    return resp
+
+
+def _listed(resp):
+    assert resp.status_code == 200, resp.get_json()
+    return {ticket["title"] for ticket in resp.get_json()}
+
+
+def test_writes_go_to_the_primary(replicated):
+    client = replicated["app"].test_client()
+    resp = _create_ticket(client, replicated["headers"], "Printer on fire")
+
+    assert STICKY_COOKIE in resp.headers.get("Set-Cookie", "")
+    assert "Printer on fire" in _titles(replicated["primary"])
+    assert "Printer on fire" not in _titles(replicated["replica"])
+
+
+def test_sticky_cookie_reads_own_writes(replicated):
+    app, headers = replicated["app"], replicated["headers"]
+    writer = app.test_client()
+    ticket_id = _create_ticket(writer, headers, "Invoice missing", role="Admin").get_json()["id"]
+    # Only the cookie may route the next read to the primary
+    _sticky_users.clear()
+
+    resp = writer.get(f"/admin/tickets/{ticket_id}", headers=headers["Admin"])
+    assert resp.status_code == 200
+    assert resp.get_json()["ticket"]["title"] == "Invoice missing"
+    # The same user without the cookie reads the lagging replica
+    assert app.test_client().get(f"/admin/tickets/{ticket_id}", headers=headers["Admin"]).status_code == 404
+
+
+def test_lagging_replica_reads_are_not_cached(replicated):
+    app, headers = replicated["app"], replicated["headers"]
+    _create_ticket(app.test_client(), headers, "VPN down")
+
+    # Another client reads the open queue from the replica, which lacks the
+    # new ticket; the response must not be stored under the new generation
+    reader = app.test_client()
+    for _ in range(2):
+        resp = reader.get("/support/open", headers=headers["Support Agent"])
+        assert resp.headers["X-Cache"] == "MISS"
+        assert "VPN down" not in _listed(resp)
+
+    _replicate(app, replicated["primary"], replicated["replica"])
+    resp = reader.get("/support/open", headers=headers["Support Agent"])
+    assert "VPN down" in _listed(resp)
+
+    # Once the lag window has passed replica reads are cached again
+    app.config["REPLICA_STICKY_SECONDS"] = 0
+    assert reader.get("/support/open", headers=headers["Support Agent"]).headers["X-Cache"] == "MISS"
+    resp = reader.get("/support/open", headers=headers["Support Agent"])
+    assert resp.headers["X-Cache"] == "HIT"
+    assert "VPN down" in _listed(resp)
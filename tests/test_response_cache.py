@@ -0,0 +1,121 @@
+import re
+
+import pytest
+
+from app.response_cache import response_cache
+
+# endpoint -> (URL, role reading it)
+LISTINGS = {
+    "support.open_tickets": ("/support/open", "Support Agent"),
+    "engineer.my_assigned": ("/engineer/my-assigned", "Engineer"),
+    "customer.list_tickets": ("/customers/tickets", "User"),
+}
+
+
+@pytest.fixture
+def cached(seeded_app):
+    """Seeded app with the memory cache and three tickets:
+
+    "open" by the customer, "assigned" to the engineer, and "unrelated"
+    (closed, by an admin), which none of the listings shows.
+    """
+    seeded = seeded_app(RESPONSE_CACHE_BACKEND="memory", INSTRUMENTATION_ENABLED=True)
+    seeded.tickets = {
+        "open": _create(seeded, "customer", "User"),
+        "assigned": _create(seeded, "assigned", "User"),
+        "unrelated": _create(seeded, "unrelated", "Admin", status="closed"),
+    }
+    resp = seeded.client.post(
+        f"/support/assign/{seeded.tickets['assigned']}", json={"assignee_id": seeded.users["Engineer"]},
+        headers=seeded.headers["Admin"],
+    )
+    assert resp.status_code == 200, resp.get_json()
+    return seeded
+
+
+def _create(seeded, title, role, **fields):
+    url = "/customers/tickets" if role == "User" else "/admin/tickets"
+    resp = seeded.client.post(url, json={"title": title, **fields}, headers=seeded.headers[role])
+    assert resp.status_code == 201, resp.get_json()
+    body = resp.get_json()
+    return body["ticket"]["id"] if "ticket" in body else body["id"]
+
+
+def _get(seeded, endpoint):
+    url, role = LISTINGS[endpoint]
+    resp = seeded.client.get(url, headers=seeded.headers[role])
+    assert resp.status_code == 200, resp.get_json()
+    return resp
+
+
+def _warm(seeded, endpoint):
+    first = _get(seeded, endpoint)
+    second = _get(seeded, endpoint)
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.get_data() == first.get_data()
+    return second
+
+
+def _rename(seeded, ticket_id, title):
+    resp = seeded.client.patch(f"/admin/tickets/{ticket_id}", json={"title": title}, headers=seeded.headers["Admin"])
+    assert resp.status_code == 200, resp.get_json()
+
+
+def _message(seeded, ticket_id):
+    resp = seeded.client.post(
+        f"/customers/tickets/{ticket_id}/messages", json={"message": "Any news?"}, headers=seeded.headers["Admin"]
+    )
+    assert resp.status_code == 201, resp.get_json()
+
+
+def _listed_ticket(endpoint):
+    return "assigned" if endpoint == "engineer.my_assigned" else "open"
+
+
+@pytest.mark.parametrize("endpoint", LISTINGS)
+def test_ticket_write_invalidates_the_listing(cached, endpoint):
+    _warm(cached, endpoint)
+    _rename(cached, cached.tickets[_listed_ticket(endpoint)], "Renamed")
+
+    resp = _get(cached, endpoint)
+    assert resp.headers["X-Cache"] == "MISS"
+    assert "Renamed" in {t["title"] for t in resp.get_json()}
+    assert _get(cached, endpoint).headers["X-Cache"] == "HIT"
+
+
+@pytest.mark.parametrize("endpoint", LISTINGS)
+def test_message_write_invalidates_the_listing(cached, endpoint):
+    ticket_id = cached.tickets[_listed_ticket(endpoint)]
+    before = {t["id"]: t for t in _warm(cached, endpoint).get_json()}[ticket_id]
+    _message(cached, ticket_id)
+
+    resp = _get(cached, endpoint)
+    assert resp.headers["X-Cache"] == "MISS"
+    after = {t["id"]: t for t in resp.get_json()}[ticket_id]
+    assert after["message_count"] == before["message_count"] + 1
+
+
+@pytest.mark.parametrize("endpoint", LISTINGS)
+def test_unrelated_writes_keep_the_entry(cached, endpoint):
+    _warm(cached, endpoint)
+    _rename(cached, cached.tickets["unrelated"], "Still unrelated")
+    _message(cached, cached.tickets["unrelated"])
+    assert _get(cached, endpoint).headers["X-Cache"] == "HIT"
+
+
+def _hit_ratio(seeded, endpoint):
+    metrics = seeded.client.get("/metrics").get_data(as_text=True)
+    match = re.search(rf'^crm_response_cache_hit_ratio{{endpoint="{re.escape(endpoint)}"}} (\S+)$', metrics, re.M)
+    assert match, metrics
+    return float(match.group(1))
+
+
+@pytest.mark.parametrize("endpoint", LISTINGS)
+def test_hit_ratio_metric(cached, endpoint):
+    before = response_cache.stats().get(endpoint, {"hits": 0, "misses": 0})
+    _warm(cached, endpoint)
+    _get(cached, endpoint)
+
+    after = response_cache.stats()[endpoint]
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (2, 1)
+    assert _hit_ratio(cached, endpoint) == pytest.approx(after["hits"] / (after["hits"] + after["misses"]))
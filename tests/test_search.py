@@ -0,0 +1,29 @@
+from app.extensions import db
+from app.models import Ticket
+from app.seeding import generate_dataset
+
+
+def _search(seeded, terms):
+    resp = seeded.client.get("/support/search", query_string={"q": terms}, headers=seeded.headers["Support Agent"])
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def test_seeded_tickets_are_searchable(seeded_app):
+    seeded = seeded_app()
+    with seeded.app.app_context():
+        ticket = db.session.scalars(db.select(Ticket).order_by(Ticket.id)).first()
+        title = ticket.title
+    assert ticket.id in {hit["id"] for hit in _search(seeded, title)}
+
+
+def test_reseeding_drops_documents_of_deleted_tickets(seeded_app):
+    seeded = seeded_app()
+    resp = seeded.client.post("/admin/tickets", json={"title": "zebra printer jam"}, headers=seeded.headers["Admin"])
+    assert resp.status_code == 201
+    assert [hit["title"] for hit in _search(seeded, "zebra")] == ["zebra printer jam"]
+
+    # Seeded ids restart at 1, so a stale document would now match a new ticket
+    with seeded.app.app_context():
+        generate_dataset(users=40, tickets=20, reset=True, echo=lambda *_: None)
+    assert _search(seeded, "zebra") == []
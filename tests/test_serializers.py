@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import pytest
+from flask import jsonify
+
+from app import serializers
+from app.admin.routes import audits_schema, users_schema
+from app.customer.routes import messages_schema
+from app.extensions import db
+from app.models import Audit, Ticket, TicketMessage, User
+from app.schemas import eager_load_options, ticket_summaries_schema, tickets_with_messages_schema
+from app.serializers import compile_serializer, json_response, serialize
+from harness import build_app, seed
+
+# Text the stdlib encoder escapes: non-ASCII, astral characters, JSON's
+# own escapes and the other control characters
+AWKWARD = 'Caf\u00e9 \u2615 na\u00efve \U0001f600 \u2028\u2029 "quoted" back\\slash \t\n\r\b\f \x00\x07\x1b\x1f\x7f\x80'
+
+# Every schema the blueprints pass through `serialize`, with its rows
+SCHEMAS = {
+    "ticket_summaries": (ticket_summaries_schema, Ticket),
+    "tickets_with_messages": (tickets_with_messages_schema, Ticket),
+    "messages": (messages_schema, TicketMessage),
+    "users": (users_schema, User),
+    "audits": (audits_schema, Audit),
+}
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    app = build_app(
+        f"sqlite:///{tmp_path_factory.mktemp('serializers') / 'app.db'}", FAST_SERIALIZATION_BLUEPRINTS=("*",)
+    )
+    seed(app, users=40, tickets=30)
+    with app.app_context():
+        user = User(username=f"\u00fcn\u00ef {AWKWARD}", email="\u00fcn\u00ef@example.com", role_id=1, password_hash="x")
+        db.session.add(user)
+        db.session.flush()
+        ticket = Ticket(title=AWKWARD, description=AWKWARD, status="open", created_by=user.id)
+        db.session.add(ticket)
+        db.session.flush()
+        db.session.add(TicketMessage(ticket_id=ticket.id, sender_id=user.id, message=AWKWARD))
+        db.session.add(Audit(
+            action="update_ticket", user_id=user.id, entity_type="ticket", entity_id=ticket.id,
+            old_values={"title": AWKWARD, "count": 2 ** 70, "ratio": 0.1, "big": 1e16, "none": None},
+            new_values={"title": "plain", "tags": ["a", "b"], "nested": {"z": 1, "a": [True, False]}},
+            details=AWKWARD, created_at=datetime(2026, 1, 2, 3, 4, 5, 678901),
+        ))
+        # ASCII-only, so it reaches the fast encoder: floats orjson spells
+        # differently must still fall back
+        db.session.add(Audit(
+            action="bulk_update", user_id=user.id, details="ascii only", created_at=datetime(2026, 1, 2),
+            new_values={"floats": [0.1, 1.5, 1e15, 1e16, 1.5e300, 1e-4, 1e-5, -2.5e-7, 123.000012]},
+        ))
+        db.session.commit()
+    return app
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson" and serializers.orjson is None:
+        pytest.skip("orjson is not installed")
+    if request.param == "stdlib":
+        monkeypatch.setattr(serializers, "orjson", None)
+    return request.param
+
+
+def _rows(schema, model):
+    return model.query.options(*eager_load_options(schema)).order_by(model.id).all()
+
+
+@pytest.mark.parametrize("name", SCHEMAS)
+def test_compiled_serializer_matches_dump(app, name):
+    schema, model = SCHEMAS[name]
+    with app.app_context():
+        rows = _rows(schema, model)
+        assert compile_serializer(schema)(rows) == schema.dump(rows)
+        assert compile_serializer(schema.__class__())(rows[-1]) == schema.__class__().dump(rows[-1])
+
+
+@pytest.mark.parametrize("name", SCHEMAS)
+def test_json_response_matches_jsonify(app, encoder, name):
+    schema, model = SCHEMAS[name]
+    with app.test_request_context("/"):
+        rows = _rows(schema, model)
+        expected = jsonify(schema.dump(rows))
+        for payload in (serialize(schema, rows), {name: serialize(schema, rows)}):
+            response, status = json_response(payload)
+            reference = expected if isinstance(payload, list) else jsonify({name: schema.dump(rows)})
+            assert status == 200
+            assert response.get_data() == reference.get_data()
+            assert response.mimetype == reference.mimetype
+        # One awkward row sends a whole list to the stdlib, so ASCII rows
+        # are also encoded alone to exercise the fast encoder
+        for row in rows:
+            response, _ = json_response(serialize(schema, [row]))
+            assert response.get_data() == jsonify(schema.dump([row])).get_data()
+
+
+def test_fast_encoder_used_for_ascii_payloads(app):
+    if serializers.orjson is None:
+        pytest.skip("orjson is not installed")
+    schema, model = SCHEMAS["ticket_summaries"]
+    with app.test_request_context("/"):
+        ascii_rows = [t for t in _rows(schema, model) if t.title.isascii()]
+        payload = serialize(schema, ascii_rows)
+        # Without a fallback the parity test above would only cover the stdlib
+        assert serializers._fast_dumps(payload) is not None
+        assert serializers._fast_dumps({"text": AWKWARD}) is None
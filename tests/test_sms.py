@@ -0,0 +1,23 @@
+import pytest
+
+from app.services import sms
+from app.services.sms import register_transport
+
+
+def test_unknown_transport_lists_the_registered_ones(make_app):
+    with pytest.raises(ValueError, match=r"unknown SMS_TRANSPORT 'carrier-pigeon'.*console, memory, twilio"):
+        make_app(SMS_TRANSPORT="carrier-pigeon")
+
+
+def test_registered_transport_is_used(make_app, monkeypatch):
+    monkeypatch.setattr(sms, "TRANSPORTS", dict(sms.TRANSPORTS))
+    sent = []
+
+    class ListTransport:
+        def send(self, phone, message):
+            sent.append((phone, message))
+
+    register_transport("list", lambda config: ListTransport())
+    app = make_app(SMS_TRANSPORT="list")
+    app.extensions["sms"].send("+15550100", "Ticket resolved")
+    assert sent == [("+15550100", "Ticket resolved")]
@@ -0,0 +1,113 @@
+import logging
+
+import pytest
+from sqlalchemy import select, text, update
+
+from app.extensions import db
+from app.models import Role, User
+from app.tokens import token_denylist
+from harness import login
+
+
+@pytest.fixture
+def seeded(seeded_app):
+    return seeded_app()
+
+
+def _role_id(app, name):
+    with app.app_context():
+        return db.session.scalar(select(Role.id).where(Role.name == name))
+
+
+def _new_user(seeded, name="tokens-user", password="initial-pass"):
+    """Create a User-role account and log it in: (id, access headers, refresh token)."""
+    resp = seeded.client.post("/admin/users", json={
+        "username": name, "email": f"{name}@example.com", "password": password,
+        "role_id": _role_id(seeded.app, "User"),
+    }, headers=seeded.headers["Admin"])
+    assert resp.status_code == 201, resp.get_json()
+    user_id = resp.get_json()["user"]["id"]
+    resp = seeded.client.post("/auth/login", json={"username": name, "password": password})
+    assert resp.status_code == 200, resp.get_json()
+    tokens = resp.get_json()
+    return user_id, {"Authorization": f"Bearer {tokens['access_token']}"}, tokens["refresh_token"]
+
+
+def _accepted(seeded, headers):
+    resp = seeded.client.get("/customers/tickets", headers=headers)
+    assert resp.status_code in (200, 401), resp.get_json()
+    return resp.status_code == 200
+
+
+def _refresh(seeded, refresh_token):
+    return seeded.client.post("/auth/refresh", headers={"Authorization": f"Bearer {refresh_token}"})
+
+
+def _admin(seeded, method, user_id, **body):
+    resp = seeded.client.open(
+        f"/admin/users/{user_id}", method=method, json=body or None, headers=seeded.headers["Admin"]
+    )
+    assert resp.status_code == 200, resp.get_json()
+
+
+def test_role_change_revokes_tokens(seeded):
+    user_id, headers, refresh_token = _new_user(seeded)
+    assert _accepted(seeded, headers)
+
+    _admin(seeded, "PATCH", user_id, role_id=_role_id(seeded.app, "Engineer"))
+    assert not _accepted(seeded, headers)
+    assert _refresh(seeded, refresh_token).status_code == 401
+    # A new login carries the new role
+    engineer = login(seeded.client, "tokens-user", "initial-pass")
+    assert seeded.client.get("/engineer/my-assigned", headers=engineer).status_code == 200
+
+
+def test_password_change_revokes_tokens(seeded):
+    user_id, headers, refresh_token = _new_user(seeded)
+
+    _admin(seeded, "PATCH", user_id, password="changed-pass")
+    assert not _accepted(seeded, headers)
+    assert _refresh(seeded, refresh_token).status_code == 401
+    assert _accepted(seeded, login(seeded.client, "tokens-user", "changed-pass"))
+
+
+def test_user_delete_revokes_tokens(seeded):
+    user_id, headers, refresh_token = _new_user(seeded)
+
+    _admin(seeded, "DELETE", user_id)
+    assert not _accepted(seeded, headers)
+    assert _refresh(seeded, refresh_token).status_code == 401
+
+
+def test_logout_revokes_access_and_refresh_tokens(seeded):
+    _, headers, refresh_token = _new_user(seeded)
+    other_session = login(seeded.client, "tokens-user", "initial-pass")
+
+    resp = seeded.client.post("/auth/logout", json={"refresh_token": refresh_token}, headers=headers)
+    assert resp.status_code == 200, resp.get_json()
+    assert not _accepted(seeded, headers)
+    assert _refresh(seeded, refresh_token).status_code == 401
+    # Only the presented tokens are denied, not the user's other sessions
+    assert _accepted(seeded, other_session)
+
+
+def test_refresh_rejects_a_stale_version(seeded):
+    user_id, _, refresh_token = _new_user(seeded)
+    # A version bump whose revocation row this worker has not synced yet
+    with seeded.app.app_context():
+        db.session.execute(update(User).where(User.id == user_id).values(token_version=User.token_version + 1))
+        db.session.commit()
+
+    resp = _refresh(seeded, refresh_token)
+    assert resp.status_code == 401
+    assert resp.get_json()["msg"] == "Token has been revoked"
+
+
+def test_failed_sync_is_logged(seeded, caplog):
+    with seeded.app.app_context():
+        db.session.execute(text("ALTER TABLE token_revocations RENAME TO token_revocations_offline"))
+        db.session.commit()
+    token_denylist._next_sync = 0.0
+    with caplog.at_level(logging.WARNING, logger=seeded.app.logger.name):
+        seeded.client.get("/customers/tickets", headers=seeded.headers["User"])
+    assert "Token denylist sync failed" in caplog.text